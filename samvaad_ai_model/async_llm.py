@@ -0,0 +1,184 @@
+import asyncio
+import random
+import time
+from typing import Dict, List, Optional
+from metrics import LatencyHistogram
+
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+
+def is_retryable(exc):
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+
+    for attr in ('code', 'status_code', 'status'):
+        status = getattr(exc, attr, None)
+        if isinstance(status, int):
+            return status in RETRYABLE_STATUS
+    return False
+
+
+class TokenBucket:
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens=1.0):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+
+
+class AsyncLLMEvaluator:
+
+    def __init__(self, evaluator, max_concurrency=8, timeout=30.0, max_retries=3,
+                 backoff_base=0.5, backoff_max=8.0, hedge=False, hedge_quantile=95,
+                 hedge_min_samples=20, rate_limit=None, burst=None):
+        self.evaluator = evaluator
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.rate_limiter = TokenBucket(rate_limit, burst) if rate_limit else None
+        self.latency = LatencyHistogram()
+        self.counters = {'requests': 0, 'attempts': 0, 'retries': 0, 'hedges': 0,
+                         'hedge_wins': 0, 'hedges_skipped': 0, 'timeouts': 0, 'errors': 0}
+
+    async def _call_model(self, prompt):
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+
+        self.counters['attempts'] += 1
+        client = self.evaluator.client
+        start = time.monotonic()
+
+        if hasattr(client, 'aio'):
+            call = client.aio.models.generate_content(model=self.evaluator.model_name, contents=prompt)
+        else:
+            # A thread cannot be cancelled: after a timeout, or when a hedge
+            # loses, the blocking request keeps running to completion and its
+            # result is discarded. Its semaphore slot is released regardless.
+            call = asyncio.to_thread(client.models.generate_content, model=self.evaluator.model_name, contents=prompt)
+
+        response = await asyncio.wait_for(call, self.timeout)
+        self.latency.observe(time.monotonic() - start)
+        return response
+
+    def _hedge_delay(self):
+        if not self.hedge or self.latency.count < self.hedge_min_samples:
+            return None
+        return self.latency.percentile(self.hedge_quantile)
+
+    async def _hedged_call(self, prompt):
+        delay = self._hedge_delay()
+        primary = asyncio.create_task(self._call_model(prompt))
+        if delay is None:
+            return await primary
+
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+
+        # The first request is past the latency quantile: race a duplicate,
+        # but only in a free concurrency slot, so hedges never push the number
+        # of in-flight calls above max_concurrency.
+        if self.semaphore.locked():
+            self.counters['hedges_skipped'] += 1
+            return await primary
+
+        await self.semaphore.acquire()
+        self.counters['hedges'] += 1
+        backup = asyncio.create_task(self._call_model(prompt))
+        # A done callback also fires when the task is cancelled before it starts.
+        backup.add_done_callback(lambda _: self.semaphore.release())
+        tasks = {primary, backup}
+
+        try:
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            self.counters['hedge_wins'] += 1
+                        return task.result()
+            return primary.result()
+        finally:
+            for task in (primary, backup):
+                if not task.done():
+                    task.cancel()
+
+    async def generate(self, prompt):
+        self.counters['requests'] += 1
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self.semaphore:
+                    return await self._hedged_call(prompt)
+            except Exception as e:
+                if isinstance(e, (asyncio.TimeoutError, TimeoutError)):
+                    self.counters['timeouts'] += 1
+                if attempt == self.max_retries or not is_retryable(e):
+                    self.counters['errors'] += 1
+                    raise
+
+            self.counters['retries'] += 1
+            backoff = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+            await asyncio.sleep(random.uniform(0, backoff))
+
+    async def evaluate_answer(
+        self,
+        candidate_answer: str,
+        question: str,
+        reference_answer: str,
+        evaluation_rubric: Optional[str] = None
+    ) -> Dict:
+        evaluator = self.evaluator
+        if not evaluator.available or not candidate_answer or not candidate_answer.strip():
+            return evaluator.evaluate_answer(candidate_answer, question, reference_answer, evaluation_rubric)
+
+        key = None
+        if evaluator.cache is not None:
+            key = evaluator.cache_key(candidate_answer, question, reference_answer, evaluation_rubric)
+            cached = evaluator.cache.get(key)
+            if cached is not None:
+                return cached
+
+        try:
+            prompt = evaluator._build_prompt(candidate_answer, question, reference_answer, evaluation_rubric)
+            response = await self.generate(prompt)
+            result = evaluator._parse_response(response.text)
+            evaluator._store(key, result)
+            return result
+        except Exception as e:
+            message = str(e) or type(e).__name__
+            return {
+                'is_correct': None,
+                'score': 0.0,
+                'reasoning': message,
+                'error': message
+            }
+
+    async def evaluate_many(self, items: List[Dict], evaluation_rubric: Optional[str] = None) -> List[Dict]:
+        return await asyncio.gather(*[
+            self.evaluate_answer(item['candidate_answer'], item['question'], item['reference_answer'], evaluation_rubric)
+            for item in items
+        ])
+
+    def metrics(self):
+        return {**self.counters, 'latency': self.latency.snapshot()}
\ No newline at end of file
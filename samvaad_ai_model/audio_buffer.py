@@ -0,0 +1,46 @@
+import numpy as np
+from audioconfig import SAMPLE_RATE
+
+
+class AudioBuffer:
+
+    def __init__(self, data, sample_rate=SAMPLE_RATE):
+        # No copy when the input is already contiguous float32.
+        self.data = np.ascontiguousarray(data, dtype=np.float32).reshape(-1)
+        self.sample_rate = sample_rate
+        self._pcm16 = None
+
+    @classmethod
+    def wrap(cls, audio, sample_rate=SAMPLE_RATE):
+        if isinstance(audio, cls):
+            return audio
+        return cls(audio, sample_rate)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None or np.dtype(dtype) == self.data.dtype:
+            return self.data.copy() if copy else self.data
+        return self.data.astype(dtype)
+
+    @property
+    def duration(self):
+        return len(self.data) / self.sample_rate
+
+    @property
+    def pcm16(self):
+        # Peak-normalized exactly like the old WAV conversion, computed once
+        # and shared by every consumer of this answer.
+        if self._pcm16 is None:
+            peak = float(np.max(np.abs(self.data))) if len(self.data) else 0.0
+            scaled = self.data / peak if peak > 0 else self.data.copy()
+            np.multiply(scaled, 32767, out=scaled)
+            self._pcm16 = scaled.astype(np.int16)
+        return self._pcm16
+
+    def pcm_bytes(self):
+        return memoryview(self.pcm16).cast('B')
+
+    def slice(self, start, stop):
+        return AudioBuffer(self.data[start:stop], self.sample_rate)
\ No newline at end of file
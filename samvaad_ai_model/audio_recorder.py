@@ -1,18 +1,78 @@
-import sounddevice as sd
+import math
 import numpy as np
+from audio_source import MicrophoneSource
+from feature_engine import ConfidenceFeatureEngine
+from audioconfig import CHUNK_DURATION
 
 
 class AudioRecorder:
 
-    def __init__(self, sample_rate=16000):
+    def __init__(self, sample_rate=16000, source=None, silence_timeout=3.0, min_duration=1.0,
+                 frame_duration=CHUNK_DURATION):
         self.sample_rate = sample_rate
+        self.source = source
+        self.silence_timeout = silence_timeout
+        self.min_duration = min_duration
+        self.frame_size = int(sample_rate * frame_duration)
+        self.last_audio = None
+        self.stopped_early = False
 
-    def record(self, max_duration=15):
-        audio = sd.rec(
-            int(max_duration * self.sample_rate),
-            samplerate=self.sample_rate,
-            channels=1,
-            dtype="float32",
-            blocking=True
-        )
-        return audio.flatten()
\ No newline at end of file
+    def _get_source(self):
+        if self.source is None:
+            self.source = MicrophoneSource(self.sample_rate)
+        return self.source
+
+    def stream(self, max_duration=15, feature_engine=None):
+        max_samples = int(max_duration * self.sample_rate)
+        min_samples = int(self.min_duration * self.sample_rate)
+        silence_frames = None
+        if self.silence_timeout:
+            silence_frames = math.ceil(self.silence_timeout * self.sample_rate / self.frame_size)
+
+        # Frames are views into one preallocated recording buffer, so the
+        # full answer is available afterwards without concatenating.
+        audio = np.empty(max_samples, dtype=np.float32)
+        vad = feature_engine if feature_engine is not None else ConfidenceFeatureEngine(self.sample_rate, clock="sample")
+
+        filled = 0
+        heard_speech = False
+        silent_run = 0
+        self.stopped_early = False
+
+        try:
+            with self._get_source() as source:
+                while filled < max_samples:
+                    n = min(self.frame_size, max_samples - filled)
+                    got = source.read_into(audio[filled:filled + n])
+                    if got <= 0:
+                        break
+
+                    frame = audio[filled:filled + got]
+                    filled += got
+
+                    if got == self.frame_size:
+                        vad.process_chunk(frame)
+                        if vad.noise_floor is not None:
+                            if vad.is_voiced(vad.energy_buffer[-1]):
+                                heard_speech = True
+                                silent_run = 0
+                            else:
+                                silent_run += 1
+
+                    yield frame
+
+                    if got < n:
+                        break
+
+                    if (silence_frames and heard_speech and silent_run >= silence_frames
+                            and filled >= min_samples):
+                        self.stopped_early = True
+                        break
+        finally:
+            self.last_audio = audio[:filled]
+
+    def record(self, max_duration=15, feature_engine=None, on_frame=None):
+        for frame in self.stream(max_duration, feature_engine=feature_engine):
+            if on_frame is not None:
+                on_frame(frame)
+        return self.last_audio
\ No newline at end of file
@@ -0,0 +1,159 @@
+import time
+import wave
+import numpy as np
+from ring_buffer import AudioRingBuffer
+from audioconfig import SAMPLE_RATE
+
+
+def read_wav(path):
+    with wave.open(path if hasattr(path, 'read') else str(path), 'rb') as wf:
+        sample_rate = wf.getframerate()
+        channels = wf.getnchannels()
+        width = wf.getsampwidth()
+        frames = wf.readframes(wf.getnframes())
+
+    if width == 2:
+        audio = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+    elif width == 4:
+        audio = np.frombuffer(frames, dtype=np.int32).astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"Unsupported sample width: {width}")
+
+    if channels > 1:
+        audio = audio.reshape(-1, channels)[:, 0].copy()
+
+    return audio, sample_rate
+
+
+class AudioSource:
+
+    sample_rate = SAMPLE_RATE
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def read_into(self, out):
+        raise NotImplementedError
+
+    def chunks(self, chunk_size):
+        # The same buffer is reused for every chunk.
+        chunk = np.zeros(chunk_size, dtype=np.float32)
+        while True:
+            n = self.read_into(chunk)
+            if n < chunk_size:
+                return
+            yield chunk
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+class MicrophoneSource(AudioSource):
+
+    def __init__(self, sample_rate=SAMPLE_RATE, block_size=None, buffer_seconds=10.0, device=None):
+        self.sample_rate = sample_rate
+        self.block_size = block_size or int(sample_rate * 0.1)
+        self.device = device
+        self.ring = AudioRingBuffer(int(sample_rate * buffer_seconds))
+        self._stream = None
+
+    def _callback(self, indata, frames, time_info, status):
+        self.ring.write(indata[:, 0])
+
+    def start(self):
+        import sounddevice as sd
+
+        self.ring.reset()
+        self._stream = sd.InputStream(
+            samplerate=self.sample_rate,
+            channels=1,
+            dtype="float32",
+            blocksize=self.block_size,
+            device=self.device,
+            callback=self._callback
+        )
+        self._stream.start()
+
+    def stop(self):
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream.close()
+            self._stream = None
+        self.ring.close()
+
+    def read_into(self, out):
+        return self.ring.read_into(out)
+
+
+class ArrayAudioSource(AudioSource):
+
+    def __init__(self, audio, sample_rate=SAMPLE_RATE, realtime=False):
+        self.audio = np.asarray(audio, dtype=np.float32).reshape(-1)
+        self.sample_rate = sample_rate
+        self.realtime = realtime
+        self.position = 0
+        self._started_at = None
+
+    def start(self):
+        self.position = 0
+        self._started_at = time.monotonic()
+
+    def read_into(self, out):
+        n = min(len(out), len(self.audio) - self.position)
+        if n <= 0:
+            return 0
+
+        if self.realtime:
+            if self._started_at is None:
+                self._started_at = time.monotonic()
+            due = self._started_at + (self.position + n) / self.sample_rate
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+        np.copyto(out[:n], self.audio[self.position:self.position + n])
+        self.position += n
+        return n
+
+
+class FileAudioSource(ArrayAudioSource):
+
+    def __init__(self, path, realtime=False):
+        if str(path).endswith('.npy'):
+            audio, sample_rate = np.load(path), SAMPLE_RATE
+        else:
+            audio, sample_rate = read_wav(path)
+        super().__init__(audio, sample_rate=sample_rate, realtime=realtime)
+
+
+class GeneratorAudioSource(AudioSource):
+
+    def __init__(self, blocks, sample_rate=SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self._blocks = iter(blocks)
+        self._block = None
+        self._offset = 0
+
+    def read_into(self, out):
+        filled = 0
+        while filled < len(out):
+            if self._block is None or self._offset >= len(self._block):
+                block = next(self._blocks, None)
+                if block is None:
+                    break
+                self._block = np.asarray(block, dtype=np.float32).reshape(-1)
+                self._offset = 0
+
+            n = min(len(out) - filled, len(self._block) - self._offset)
+            np.copyto(out[filled:filled + n], self._block[self._offset:self._offset + n])
+            filled += n
+            self._offset += n
+
+        return filled
\ No newline at end of file
@@ -0,0 +1,88 @@
+import argparse
+import time
+import tracemalloc
+import numpy as np
+import speech_recognition as sr
+from audio_buffer import AudioBuffer
+from audioconfig import SAMPLE_RATE
+from confidence_engine import ConfidenceEngine
+from scoring_profiles import SCORING_PROFILES
+from stt_backends import numpy_to_wav_bytes
+from synthetic_audio import tone_bursts
+
+
+def captured_answer(duration, sample_rate=SAMPLE_RATE, seed=0):
+    # sounddevice hands recordings over as (frames, channels).
+    return tone_bursts(duration, rng=np.random.default_rng(seed), sample_rate=sample_rate).reshape(-1, 1)
+
+
+def measure(stages, recording):
+    report = []
+    value = recording
+    tracemalloc.start()
+    for name, stage in stages:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        value = stage(value)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] - before
+        report.append((name, peak, elapsed))
+    tracemalloc.stop()
+    return report
+
+
+def legacy_stages(engine, sample_rate):
+    def to_audio_data(audio):
+        with sr.AudioFile(numpy_to_wav_bytes(audio, sample_rate)) as source:
+            return sr.Recognizer().record(source)
+
+    state = {}
+    return [
+        ("flatten", lambda rec: rec.flatten()),
+        ("score", lambda audio: state.setdefault('audio', audio) if engine.score_audio(audio) else audio),
+        ("stt input (wav)", lambda audio: to_audio_data(state['audio'])),
+    ]
+
+
+def buffer_stages(engine, sample_rate):
+    state = {}
+    return [
+        ("wrap", lambda rec: AudioBuffer(rec.reshape(-1), sample_rate)),
+        ("score", lambda audio: state.setdefault('audio', audio) if engine.score_audio(audio) else audio),
+        ("stt input (pcm)", lambda audio: sr.AudioData(state['audio'].pcm_bytes(), sample_rate, 2)),
+    ]
+
+
+def print_report(title, report, answer_bytes):
+    print(f"\n{title}")
+    print(f"{'stage':<20}{'peak KiB':>10}{'copies':>8}{'ms':>9}")
+    for name, peak, elapsed in report:
+        print(f"{name:<20}{peak / 1024:>10.0f}{peak / answer_bytes:>8.1f}{elapsed * 1e3:>9.2f}")
+    total_peak = max(peak for _, peak, _ in report)
+    total_copies = sum(peak for _, peak, _ in report) / answer_bytes
+    print(f"{'max stage peak':<20}{total_peak / 1024:>10.0f}{total_copies:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Peak memory and answer-sized copies per stage of the capture -> scorer -> STT path. "
+                    "'copies' is the stage's peak allocation in units of the float32 answer size."
+    )
+    parser.add_argument("--duration", type=float, default=15.0)
+    args = parser.parse_args()
+
+    engine = ConfidenceEngine("confidence_model.pkl", "balanced", SCORING_PROFILES, SAMPLE_RATE)
+    recording = captured_answer(args.duration)
+    answer_bytes = recording.nbytes
+
+    legacy = measure(legacy_stages(engine, SAMPLE_RATE), recording)
+    shared = measure(buffer_stages(engine, SAMPLE_RATE), recording)
+
+    print(f"Answer: {args.duration:.0f}s, {answer_bytes / 1024:.0f} KiB float32")
+    print_report("Before (flatten + WAV round-trip)", legacy, answer_bytes)
+    print_report("After (AudioBuffer)", shared, answer_bytes)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
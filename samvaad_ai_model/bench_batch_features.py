@@ -0,0 +1,71 @@
+import argparse
+import time
+import numpy as np
+from audioconfig import SAMPLE_RATE, CHUNK_DURATION
+from feature_engine import BatchFeatureEngine, ConfidenceFeatureEngine
+from synthetic_audio import tone_bursts
+
+
+def synthetic_streams(n_streams, n_chunks, chunk_size, seed=0):
+    rng = np.random.default_rng(seed)
+    duration = n_chunks * chunk_size / SAMPLE_RATE
+    streams = np.stack([
+        tone_bursts(duration, rate=rng.uniform(0.2, 0.5), phase=rng.uniform(0, 6), f0=rng.uniform(100, 220), rng=rng)
+        for _ in range(n_streams)
+    ])
+    return streams.reshape(n_streams, n_chunks, chunk_size)
+
+
+def run_scalar(streams, score_every):
+    engines = [ConfidenceFeatureEngine(SAMPLE_RATE, clock="sample") for _ in range(len(streams))]
+    start = time.perf_counter()
+    for tick in range(streams.shape[1]):
+        for engine, stream in zip(engines, streams):
+            engine.process_chunk(stream[tick])
+            if (tick + 1) % score_every == 0 and engine.features_ready():
+                engine.extract_features()
+    return time.perf_counter() - start, engines
+
+
+def run_batch(streams, score_every):
+    engine = BatchFeatureEngine(len(streams), SAMPLE_RATE)
+    start = time.perf_counter()
+    for tick in range(streams.shape[1]):
+        engine.process_block(streams[:, tick])
+        if (tick + 1) % score_every == 0:
+            engine.features_ready()
+            engine.extract_features()
+    return time.perf_counter() - start, engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scalar vs batch feature engine over N live streams")
+    parser.add_argument("--streams", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--seconds", type=float, default=20.0, help="audio per stream")
+    parser.add_argument("--every", type=int, default=2, help="extract features every N chunks")
+    args = parser.parse_args()
+
+    chunk_size = int(SAMPLE_RATE * CHUNK_DURATION)
+    n_chunks = int(args.seconds / CHUNK_DURATION)
+
+    for n_streams in args.streams:
+        streams = synthetic_streams(n_streams, n_chunks, chunk_size)
+        scalar_time, engines = run_scalar(streams, args.every)
+        batch_time, batch = run_batch(streams, args.every)
+
+        _, expected = zip(*[e.extract_features() for e in engines])
+        _, raw = batch.extract_features()
+        ready = batch.features_ready()
+        identical = np.array_equal(np.array(expected)[ready], raw[ready])
+
+        chunks = n_streams * n_chunks
+        # Each live stream produces 1 / CHUNK_DURATION chunks per second.
+        realtime = 1 / CHUNK_DURATION
+        print(f"{n_streams:>5} streams  scalar {chunks / scalar_time:>8.0f} chunks/s "
+              f"({chunks / scalar_time / realtime:>6.0f} streams/core)  "
+              f"batch {chunks / batch_time:>8.0f} chunks/s ({chunks / batch_time / realtime:>6.0f} streams/core)  "
+              f"x{scalar_time / batch_time:.1f}  identical={identical}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
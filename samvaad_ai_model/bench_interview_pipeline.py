@@ -0,0 +1,93 @@
+import argparse
+import contextlib
+import io
+import time
+import numpy as np
+from interview_manager import InterviewManager
+from audioconfig import SAMPLE_RATE
+from synthetic_audio import tone_bursts
+
+
+class DelayedRecorder:
+
+    def __init__(self, latency=1.0, sample_rate=SAMPLE_RATE, seed=0):
+        self.latency = latency
+        self.sample_rate = sample_rate
+        self.rng = np.random.default_rng(seed)
+
+    def record(self, max_duration=15):
+        time.sleep(self.latency)
+        return tone_bursts(max_duration, rng=self.rng, sample_rate=self.sample_rate)
+
+
+class DelayedSTT:
+
+    def __init__(self, latency=1.5):
+        self.latency = latency
+
+    def is_available(self):
+        return True
+
+    def transcribe(self, audio):
+        time.sleep(self.latency)
+        return {'text': 'I have five years of experience building backend services', 'confidence': 0.9, 'error': None}
+
+
+class DelayedLLM:
+
+    def __init__(self, latency=2.0):
+        self.latency = latency
+
+    def is_available(self):
+        return True
+
+    def evaluate_answer(self, candidate_answer, question, reference_answer, evaluation_rubric=None):
+        time.sleep(self.latency)
+        return {'is_correct': 'partially', 'score': 60.0, 'strengths': [], 'gaps': [], 'reasoning': 'stub', 'error': None}
+
+
+def run_interview(questions, pipelined, record_latency, stt_latency, llm_latency, max_duration):
+    interview = InterviewManager(
+        recorder=DelayedRecorder(record_latency),
+        stt=DelayedSTT(stt_latency),
+        llm_evaluator=DelayedLLM(llm_latency)
+    )
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        interview.start_interview("Benchmark")
+        for q_num in range(1, questions + 1):
+            interview.ask_question(q_num, f"Question {q_num}", max_duration=max_duration,
+                                   wait_for_ready=False, pipelined=pipelined)
+        interview.wait_for_evaluations()
+    elapsed = time.perf_counter() - start
+
+    interview.close()
+    return elapsed, interview.answers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Interview wall time with stub STT/LLM backends")
+    parser.add_argument("--questions", type=int, default=5)
+    parser.add_argument("--record-latency", type=float, default=1.0)
+    parser.add_argument("--stt-latency", type=float, default=1.5)
+    parser.add_argument("--llm-latency", type=float, default=2.0)
+    parser.add_argument("--max-duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    timings = {}
+    for pipelined in (False, True):
+        elapsed, answers = run_interview(
+            args.questions, pipelined, args.record_latency,
+            args.stt_latency, args.llm_latency, args.max_duration
+        )
+        assert all(a['evaluation']['score'] == 60.0 for a in answers)
+        timings[pipelined] = elapsed
+
+    print(f"Sequential: {timings[False]:.2f}s")
+    print(f"Pipelined:  {timings[True]:.2f}s")
+    print(f"Speedup:    {timings[False] / timings[True]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,67 @@
+import argparse
+import asyncio
+import json
+import time
+from async_llm import AsyncLLMEvaluator
+from llm_evaluator import LLMEvaluator
+from llm_stub import StubGeminiClient
+
+
+def build_items(n_answers):
+    with open('reference_answers.json', 'r') as f:
+        references = list(json.load(f)['reference_answers'].values())
+
+    return [
+        {
+            'question': references[i % len(references)]['question'],
+            'reference_answer': references[i % len(references)]['reference_answer'],
+            'candidate_answer': f"Answer {i} about my skills, experience and a project I led."
+        }
+        for i in range(n_answers)
+    ]
+
+
+async def run(items, args, hedge):
+    client = StubGeminiClient(
+        latency=args.latency, latency_jitter=args.jitter, slow_fraction=args.slow_fraction,
+        slow_latency=args.slow_latency, error_rate=args.error_rate, seed=args.seed
+    )
+    evaluator = AsyncLLMEvaluator(
+        LLMEvaluator(client=client), max_concurrency=args.concurrency, timeout=args.timeout,
+        hedge=hedge, rate_limit=args.rate_limit, backoff_base=0.05
+    )
+
+    start = time.perf_counter()
+    results = await evaluator.evaluate_many(items)
+    elapsed = time.perf_counter() - start
+
+    metrics = evaluator.metrics()
+    metrics['elapsed'] = elapsed
+    metrics['failed'] = sum(r['error'] is not None for r in results)
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Async LLM evaluation against a stub client with injected delays and errors")
+    parser.add_argument("--answers", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--slow-fraction", type=float, default=0.05)
+    parser.add_argument("--slow-latency", type=float, default=1.0)
+    parser.add_argument("--error-rate", type=float, default=0.1)
+    parser.add_argument("--timeout", type=float, default=5.0)
+    parser.add_argument("--rate-limit", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    items = build_items(args.answers)
+    report = {
+        'plain': asyncio.run(run(items, args, hedge=False)),
+        'hedged': asyncio.run(run(items, args, hedge=True))
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,108 @@
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from audioconfig import SAMPLE_RATE
+from stt_backends import numpy_to_wav_bytes
+from synthetic_audio import tone_bursts
+
+
+def synthetic_wavs(n_clips, duration, sample_rate=SAMPLE_RATE, seed=0):
+    rng = np.random.default_rng(seed)
+    clips = []
+    for _ in range(n_clips):
+        audio = tone_bursts(duration, rng.uniform(0.2, 0.5), rng.uniform(100, 220), rng, sample_rate)
+        clips.append(numpy_to_wav_bytes(audio, sample_rate).getvalue())
+    return clips
+
+
+def post(url, body, content_type):
+    request = urllib.request.Request(url, data=body, method='POST', headers={'Content-Type': content_type})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        status = e.code
+    except OSError:
+        status = 'connection error'
+    return status, time.perf_counter() - start
+
+
+def run_load(base_url, clips, requests, concurrency):
+    statuses = {}
+    latencies = []
+    lock = threading.Lock()
+
+    def one(i):
+        status, elapsed = post(f"{base_url}/score", clips[i % len(clips)], 'audio/wav')
+        with lock:
+            statuses[status] = statuses.get(status, 0) + 1
+            if status == 200:
+                latencies.append(elapsed)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        'requests': requests,
+        'concurrency': concurrency,
+        'elapsed': elapsed,
+        'statuses': statuses,
+        'ok_per_second': statuses.get(200, 0) / elapsed,
+        'p50': float(np.percentile(latencies, 50)) if latencies else None,
+        'p99': float(np.percentile(latencies, 99)) if latencies else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the scoring service with synthetic audio")
+    parser.add_argument("--url", help="running service (an in-process one is started if omitted)")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-queue", type=int, default=16)
+    args = parser.parse_args()
+
+    service = server = None
+    base_url = args.url
+    if base_url is None:
+        from llm_evaluator import LLMEvaluator
+        from llm_stub import StubGeminiClient
+        from scoring_service import ScoringService, make_server
+
+        service = ScoringService(workers=args.workers, max_queue=args.max_queue,
+                                 llm_evaluator=LLMEvaluator(client=StubGeminiClient())).start()
+        server = make_server(service, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    clips = synthetic_wavs(8, args.duration)
+    post(f"{base_url}/score", clips[0], 'audio/wav')
+
+    print(f"{'conc':>5}{'ok/s':>9}{'p50 ms':>9}{'p99 ms':>9}  statuses")
+    for concurrency in args.concurrency:
+        row = run_load(base_url, clips, args.requests, concurrency)
+        p50 = f"{row['p50'] * 1e3:.0f}" if row['p50'] is not None else "-"
+        p99 = f"{row['p99'] * 1e3:.0f}" if row['p99'] is not None else "-"
+        print(f"{concurrency:>5}{row['ok_per_second']:>9.1f}{p50:>9}{p99:>9}  {row['statuses']}")
+
+    with urllib.request.urlopen(f"{base_url}/metrics") as response:
+        print(json.dumps(json.load(response)['routes'], indent=2))
+
+    if server is not None:
+        server.shutdown()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,137 @@
+import argparse
+import contextlib
+import gc
+import io
+import time
+import tracemalloc
+import numpy as np
+from audioconfig import SAMPLE_RATE
+from feature_defs import FEATURE_NAMES
+from llm_evaluator import LLMEvaluator
+from llm_stub import StubGeminiClient
+from session_manager import SessionManager, SharedModels
+from synthetic_audio import tone_bursts
+
+ANSWER = "I studied computer science and my work experience is mostly building backend services"
+
+
+def synthetic_score(rng):
+    return {
+        'confidence': float(rng.uniform(40, 95)),
+        'ml_confidence': float(rng.uniform(40, 95)),
+        'audio_duration': float(rng.uniform(5, 15)),
+        'features': {name: float(np.float32(rng.uniform(0, 5))) for name in FEATURE_NAMES}
+    }
+
+
+def synthetic_evaluation(rng):
+    return {'is_correct': 'partially', 'score': float(rng.uniform(20, 90)), 'strengths': [], 'gaps': [],
+            'reasoning': 'stub', 'error': None}
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return after - before, kept
+
+
+def dict_sessions(n_sessions, n_answers, seed=0):
+    # The previous per-interview layout: one dict of answer dicts each.
+    rng = np.random.default_rng(seed)
+    interviews = {}
+    for s in range(n_sessions):
+        answers = {}
+        for q in range(1, n_answers + 1):
+            score = synthetic_score(rng)
+            answers[str(q)] = {
+                'question_number': q, 'question_text': f"Question {q}", 'transcript': ANSWER,
+                'timestamp': time.time(), 'confidence_score': score['confidence'],
+                'ml_confidence': score['ml_confidence'], 'speech_duration': score['audio_duration'],
+                'speech_detected': True, 'speech_features': score['features'],
+                'evaluation': synthetic_evaluation(rng),
+                'transcript_features': {'filler_rate': 0.05, 'keyword_coverage': 0.4}
+            }
+        interviews[f"session-{s}"] = {'answers': answers, 'created': time.time(), 'updated': time.time()}
+    return interviews
+
+
+def managed_sessions(shared, n_sessions, n_answers, seed=0):
+    rng = np.random.default_rng(seed)
+    manager = SessionManager(shared, max_sessions=n_sessions)
+    for s in range(n_sessions):
+        session_id = f"session-{s}"
+        for q in range(1, n_answers + 1):
+            manager.record(session_id, q, question_text=f"Question {q}", transcript=ANSWER,
+                           score=synthetic_score(rng), evaluation=synthetic_evaluation(rng),
+                           transcript_features={'filler_rate': 0.05, 'keyword_coverage': 0.4})
+    return manager
+
+
+def interview_manager_footprint():
+    from interview_manager import InterviewManager
+    from speech_to_text import SpeechToTextConverter
+    from stt_backends import FakeSTTBackend
+
+    def build():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return InterviewManager(
+                stt=SpeechToTextConverter(SAMPLE_RATE, backend=FakeSTTBackend()),
+                llm_evaluator=LLMEvaluator(client=StubGeminiClient())
+            )
+
+    size, manager = measure(build)
+    manager.close()
+    return size
+
+
+def throughput(shared, n_sessions, n_answers, duration, seed=0):
+    rng = np.random.default_rng(seed)
+    clips = [tone_bursts(duration, rng.uniform(0.2, 0.5), rng.uniform(100, 220), rng) for _ in range(8)]
+    manager = SessionManager(shared, max_sessions=n_sessions)
+    ids = [manager.create(f"Candidate {s}").session_id for s in range(n_sessions)]
+
+    start = time.perf_counter()
+    submitted = 0
+    for q in range(1, n_answers + 1):
+        for session_id in ids:
+            manager.submit(session_id, q, f"Question {q}", audio=clips[submitted % len(clips)], transcript=ANSWER)
+            submitted += 1
+    elapsed = time.perf_counter() - start
+    return submitted / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory per session and sessions per core for SessionManager")
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--answers", type=int, default=8, help="answers per session")
+    parser.add_argument("--answer-seconds", type=float, default=10.0)
+    parser.add_argument("--answer-interval", type=float, default=60.0,
+                        help="seconds between one candidate's answers, for the sessions-per-core estimate")
+    parser.add_argument("--throughput-sessions", type=int, default=50)
+    args = parser.parse_args()
+
+    # The first build also pays for lazy imports; measure a second one.
+    SharedModels(llm_evaluator=LLMEvaluator(client=StubGeminiClient()))
+    shared_size, shared = measure(lambda: SharedModels(llm_evaluator=LLMEvaluator(client=StubGeminiClient())))
+    dict_size, _ = measure(lambda: dict_sessions(args.sessions, args.answers))
+    managed_size, _ = measure(lambda: managed_sessions(shared, args.sessions, args.answers))
+    manager_size = interview_manager_footprint()
+
+    print(f"{args.sessions} sessions x {args.answers} answers")
+    print(f"shared models (once per process): {shared_size / 1e6:.1f} MB")
+    print(f"InterviewManager per candidate:   {manager_size / 1e6:.2f} MB")
+    print(f"dict-of-dicts per session:        {dict_size / args.sessions / 1024:.1f} KB")
+    print(f"InterviewSession per session:     {managed_size / args.sessions / 1024:.1f} KB")
+
+    rate = throughput(shared, args.throughput_sessions, 2, args.answer_seconds)
+    print(f"answers scored per second per core ({args.answer_seconds:.0f} s clips, stub LLM): {rate:.1f}")
+    print(f"sessions per core at one answer every {args.answer_interval:.0f} s: {rate * args.answer_interval:.0f}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
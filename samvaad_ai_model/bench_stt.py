@@ -0,0 +1,97 @@
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from audio_source import read_wav
+from audioconfig import SAMPLE_RATE
+from speech_to_text import SpeechToTextConverter
+from stt_backends import make_stt_backend
+from synthetic_audio import tone_bursts
+
+
+def synthetic_clips(n_clips, duration, sample_rate=SAMPLE_RATE, seed=0):
+    rng = np.random.default_rng(seed)
+    clips = [tone_bursts(duration, rng.uniform(0.2, 0.5), rng.uniform(100, 220), rng, sample_rate)
+             for _ in range(n_clips)]
+    return clips, sample_rate
+
+
+def load_clips(paths):
+    clips = []
+    sample_rate = None
+    for path in paths:
+        audio, rate = read_wav(path)
+        if sample_rate is not None and rate != sample_rate:
+            raise ValueError(f"{path}: sample rate {rate} differs from {sample_rate}")
+        sample_rate = rate
+        clips.append(audio)
+    return clips, sample_rate
+
+
+def run_backend(name, clips, sample_rate, args):
+    build_start = time.perf_counter()
+    backend = make_stt_backend(name, workers=args.workers)
+    build_time = time.perf_counter() - build_start
+
+    stt = SpeechToTextConverter(sample_rate=sample_rate, backend=backend, segmented=args.segmented)
+    if not stt.is_available():
+        stt.close()
+        return {'backend': name, 'available': False}
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(stt.transcribe, clips))
+    elapsed = time.perf_counter() - start
+
+    metrics = stt.metrics()
+    stt.close()
+
+    audio_seconds = sum(len(c) for c in clips) / sample_rate
+    metrics.update({
+        'available': True,
+        'load_seconds': build_time,
+        'elapsed': elapsed,
+        'clips_per_second': len(clips) / elapsed,
+        'audio_seconds_per_second': audio_seconds / elapsed,
+        'failed': sum(1 for r in results if r['error']),
+        'transcripts': [r['text'] for r in results]
+    })
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare speech-to-text backends on the same recordings")
+    parser.add_argument("files", nargs="*", help="WAV recordings (synthetic clips if omitted)")
+    parser.add_argument("--backends", nargs="+", default=["fake", "local"])
+    parser.add_argument("--workers", type=int, default=0, help="warm worker processes per backend (0 = in-process)")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--segmented", action="store_true")
+    parser.add_argument("--clips", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--json", help="write full results to this file")
+    args = parser.parse_args()
+
+    if args.files:
+        clips, sample_rate = load_clips(args.files)
+    else:
+        clips, sample_rate = synthetic_clips(args.clips, args.duration)
+
+    report = [run_backend(name, clips, sample_rate, args) for name in args.backends]
+
+    print(f"{'backend':<16}{'load s':>8}{'wall s':>8}{'clips/s':>9}{'p50 s':>8}{'p95 s':>8}{'RTF':>7}{'failed':>8}")
+    for row in report:
+        if not row['available']:
+            print(f"{row['backend']:<16}  unavailable")
+            continue
+        latency = row['latency']
+        print(f"{row['backend']:<16}{row['load_seconds']:>8.2f}{row['elapsed']:>8.2f}{row['clips_per_second']:>9.2f}"
+              f"{latency['p50']:>8.2f}{latency['p95']:>8.2f}{row['realtime_factor']:>7.2f}{row['failed']:>8d}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,98 @@
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+import numpy as np
+from websockets.asyncio.client import connect
+from audioconfig import SAMPLE_RATE
+from synthetic_audio import tone_bursts
+
+
+async def client(url, audio, frame_size, realtime, latencies, stats):
+    sent_at = {}
+    async with connect(url, max_size=2 ** 20, compression=None) as websocket:
+        async def reader():
+            async for message in websocket:
+                score = json.loads(message)
+                if score['last_frame'] in sent_at:
+                    latencies.append(time.perf_counter() - sent_at[score['last_frame']])
+                stats['scores'] += 1
+                if score['type'] == 'final':
+                    stats['dropped'] += score['frames_dropped']
+                    return
+
+        reading = asyncio.create_task(reader())
+        start = time.perf_counter()
+        for seq, offset in enumerate(range(0, len(audio) - frame_size + 1, frame_size), 1):
+            if realtime:
+                delay = start + offset / SAMPLE_RATE - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            sent_at[seq] = time.perf_counter()
+            await websocket.send(audio[offset:offset + frame_size].tobytes())
+        await websocket.send(json.dumps({'type': 'end'}))
+        await reading
+
+
+async def run(args, url):
+    rng = np.random.default_rng(0)
+    audio = tone_bursts(args.duration, rng.uniform(0.2, 0.5), rng.uniform(100, 220), rng).astype('<f4')
+    frame_size = int(args.frame_ms * SAMPLE_RATE / 1000)
+    latencies = []
+    stats = {'scores': 0, 'dropped': 0, 'failed': 0}
+
+    async def guarded(i):
+        # Stagger connects so the listen backlog is not the bottleneck.
+        await asyncio.sleep(i * args.ramp / max(1, args.connections))
+        try:
+            await client(url, audio, frame_size, not args.flood, latencies, stats)
+        except Exception:
+            stats['failed'] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(guarded(i) for i in range(args.connections)))
+    elapsed = time.perf_counter() - start
+    return latencies, stats, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the WebSocket scoring endpoint (frame in -> score out latency)")
+    parser.add_argument("--url", help="running endpoint (a server subprocess is started if omitted)")
+    parser.add_argument("--connections", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of audio per connection")
+    parser.add_argument("--frame-ms", type=int, default=100)
+    parser.add_argument("--every", type=int, default=2)
+    parser.add_argument("--ramp", type=float, default=2.0, help="seconds over which connections are opened")
+    parser.add_argument("--flood", action="store_true", help="send as fast as possible instead of in real time")
+    args = parser.parse_args()
+
+    server = None
+    url = args.url
+    if url is None:
+        port = 8766
+        server = subprocess.Popen([sys.executable, "stream_service.py", "--port", str(port),
+                                   "--every", str(args.every)],
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        time.sleep(3.0)
+        url = f"ws://127.0.0.1:{port}/stream"
+
+    try:
+        latencies, stats, elapsed = asyncio.run(run(args, url))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    frames = args.connections * int(args.duration * 1000 / args.frame_ms)
+    print(f"connections: {args.connections}  failed: {stats['failed']}  wall: {elapsed:.1f}s")
+    print(f"frames sent: {frames}  dropped: {stats['dropped']}  scores: {stats['scores']}")
+    if latencies:
+        ms = np.array(latencies) * 1e3
+        print(f"frame->score latency ms  p50 {np.percentile(ms, 50):.1f}  p95 {np.percentile(ms, 95):.1f}  "
+              f"p99 {np.percentile(ms, 99):.1f}  max {ms.max():.1f}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,71 @@
+import numpy as np
+
+
+class CompiledForest:
+
+    def __init__(self, roots, children, feature, threshold, value, max_depth, n_features):
+        self.roots = roots
+        self.children = children
+        self.feature = feature
+        self.threshold = threshold
+        self.value = value
+        self.max_depth = max_depth
+        self.n_features = n_features
+
+    @classmethod
+    def from_sklearn(cls, model):
+        trees = [estimator.tree_ for estimator in model.estimators_]
+        if any(tree.n_outputs != 1 for tree in trees):
+            raise ValueError("Only single-output forests can be compiled")
+
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+        left, right, feature, threshold, value = [], [], [], [], []
+
+        for offset, tree in zip(offsets, trees):
+            nodes = np.arange(tree.node_count)
+            is_leaf = tree.children_left < 0
+
+            # Leaves point at themselves so every row can take max_depth steps.
+            left.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+            right.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(tree.threshold)
+            value.append(tree.value[:, 0, 0])
+
+        # children[2 * node] is the left child, children[2 * node + 1] the right one.
+        children = np.stack([np.concatenate(left), np.concatenate(right)], axis=1)
+
+        return cls(
+            roots=offsets[:-1].astype(np.intp),
+            children=children.ravel().astype(np.intp),
+            feature=np.concatenate(feature).astype(np.intp),
+            threshold=np.concatenate(threshold).astype(np.float64),
+            value=np.concatenate(value).astype(np.float64),
+            max_depth=max(tree.max_depth for tree in trees),
+            n_features=model.n_features_in_
+        )
+
+    def predict(self, X):
+        # One vectorized step per tree level for all trees and rows at once.
+        # The cost is set by max_depth NumPy calls, not by the row count: on
+        # the shipped 50-tree, depth-20 model a single row takes ~0.2 ms and
+        # 100 rows ~1.3 ms on one core. That is 5-10x faster than sklearn for
+        # small batches, but not microsecond-level.
+        # sklearn compares float32 inputs against float64 thresholds.
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        flat = X.ravel()
+        row_offsets = (np.arange(len(X)) * X.shape[1])[:, None]
+        nodes = np.tile(self.roots, (len(X), 1))
+
+        for _ in range(self.max_depth):
+            go_right = ~(flat[row_offsets + self.feature[nodes]] <= self.threshold[nodes])
+            nodes = self.children[2 * nodes + go_right]
+
+        # cumsum adds trees in order, matching sklearn's accumulation.
+        return np.cumsum(self.value[nodes], axis=1)[:, -1] / len(self.roots)
+
+    def max_abs_error(self, model, X):
+        return float(np.max(np.abs(self.predict(X) - model.predict(X))))
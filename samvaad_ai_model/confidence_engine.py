@@ -1,27 +1,35 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 import numpy as np
 from feature_engine import ConfidenceFeatureEngine
-from custom_scorer import CustomConfidenceScorer
+from custom_scorer import CustomConfidenceScorer, ProfileScoreMatrix
 from ml_scorer import ConfidenceMLScorer
-from audioconfig import SAMPLE_RATE, CHUNK_DURATION
+from audioconfig import SAMPLE_RATE
 from feature_defs import FEATURE_NAMES
 
 
-def chunk_audio(audio, chunk_size=None):
-    if chunk_size is None:
-        chunk_size = int(SAMPLE_RATE * CHUNK_DURATION)
+_worker_engine = None
 
-    for i in range(0, len(audio) - chunk_size, chunk_size):
-        chunk = audio[i:i + chunk_size]
-        if len(chunk) == chunk_size:
-            yield chunk
+
+def _init_batch_worker(model_path, profile_name, profiles_dict, sample_rate):
+    global _worker_engine
+    _worker_engine = ConfidenceEngine(model_path, profile_name, profiles_dict, sample_rate)
+
+
+def _score_in_worker(index, audio, profile_name=None):
+    if profile_name is not None and profile_name != _worker_engine.profile_name:
+        _worker_engine.switch_profile(profile_name)
+    return index, _worker_engine.score_audio(audio)
 
 
 class ConfidenceEngine:
 
-    def __init__(self, model_path, profile_name, profiles_dict, sample_rate=SAMPLE_RATE):
-        self.feature_engine = ConfidenceFeatureEngine(sample_rate)
-        self.ml_scorer = ConfidenceMLScorer(model_path)
+    def __init__(self, model_path, profile_name, profiles_dict, sample_rate=SAMPLE_RATE, ml_scorer=None):
+        self.feature_engine = ConfidenceFeatureEngine(sample_rate, clock="sample")
+        # Engines for other threads can share one loaded model.
+        self.ml_scorer = ml_scorer if ml_scorer is not None else ConfidenceMLScorer(model_path)
         self.custom_scorer = CustomConfidenceScorer(profiles_dict[profile_name])
+        self.profile_scores = ProfileScoreMatrix(profiles_dict)
         self.sample_rate = sample_rate
         self.profile_name = profile_name
         self.profiles_dict = profiles_dict
@@ -32,6 +40,7 @@ class ConfidenceEngine:
                 'confidence': 0.0,
                 'ml_confidence': None,
                 'features': None,
+                'profile_scores': None,
                 'speech_detected': False,
                 'audio_duration': 0.0
             }
@@ -39,17 +48,29 @@ class ConfidenceEngine:
         self.feature_engine.reset()
         self.custom_scorer.reset()
 
-        chunk_size = int(self.sample_rate * 0.5)
-        for chunk in chunk_audio(audio, chunk_size):
-            self.feature_engine.process_chunk(chunk)
+        self.feature_engine.process_audio(audio)
+        return self._score_features(len(audio) / self.sample_rate)
+
+    def begin_stream(self):
+        self.feature_engine.reset()
+        self.custom_scorer.reset()
+        return self.feature_engine
+
+    def finish_stream(self, audio):
+        # The feature engine was fed chunk by chunk during capture.
+        if audio is None or len(audio) == 0:
+            return self.score_audio(audio)
+        return self._score_features(len(audio) / self.sample_rate)
 
+    def _score_features(self, audio_duration):
         if not self.feature_engine.features_ready():
             return {
                 'confidence': 0.0,
                 'ml_confidence': None,
                 'features': None,
+                'profile_scores': None,
                 'speech_detected': False,
-                'audio_duration': len(audio) / self.sample_rate
+                'audio_duration': audio_duration
             }
 
         try:
@@ -59,8 +80,9 @@ class ConfidenceEngine:
                 'confidence': 0.0,
                 'ml_confidence': None,
                 'features': None,
+                'profile_scores': None,
                 'speech_detected': False,
-                'audio_duration': len(audio) / self.sample_rate
+                'audio_duration': audio_duration
             }
 
         try:
@@ -68,6 +90,11 @@ class ConfidenceEngine:
         except Exception:
             custom_confidence = 50.0
 
+        try:
+            profile_scores = self.profile_scores.score_all(features_clipped)
+        except Exception:
+            profile_scores = None
+
         try:
             ml_confidence = self.ml_scorer.score(features_clipped)
         except Exception:
@@ -79,12 +106,62 @@ class ConfidenceEngine:
             'confidence': float(custom_confidence),
             'ml_confidence': ml_confidence,
             'features': feature_dict,
+            'profile_scores': profile_scores,
             'features_raw': features_raw,
             'features_clipped': features_clipped,
             'speech_detected': True,
-            'audio_duration': len(audio) / self.sample_rate
+            'audio_duration': audio_duration
         }
 
+    def apply_transcript(self, result, transcript_features):
+        # An audio-only result is rescored in place once its transcript is
+        # analysed: the profile's confidence if it weighs transcript features,
+        # and every profile score.
+        if not result or not result.get('features') or transcript_features is None:
+            return result
+        values = np.array([result['features'][name] for name in FEATURE_NAMES], dtype=float)
+        if self.custom_scorer.uses_transcript():
+            result['confidence'] = self.custom_scorer.score(values, transcript_features)
+        result['profile_scores'] = self.profile_scores.score_all(values, transcript_features)
+        return result
+
+    def iter_score_batch(self, clips, workers=None, max_inflight_bytes=256 * 1024 * 1024):
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        if workers <= 1:
+            for i, audio in enumerate(clips):
+                yield i, self.score_audio(audio)
+            return
+
+        initargs = (self.ml_scorer.model_path, self.profile_name, self.profiles_dict, self.sample_rate)
+        clips = enumerate(clips)
+        next_clip = next(clips, None)
+        pending = {}
+        inflight_bytes = 0
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker, initargs=initargs) as pool:
+            while next_clip is not None or pending:
+                while next_clip is not None and len(pending) < 2 * workers:
+                    i, audio = next_clip
+                    audio = np.asarray(audio, dtype=np.float32)
+                    if pending and inflight_bytes + audio.nbytes > max_inflight_bytes:
+                        break
+
+                    future = pool.submit(_score_in_worker, i, audio)
+                    pending[future] = audio.nbytes
+                    inflight_bytes += audio.nbytes
+                    next_clip = next(clips, None)
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    inflight_bytes -= pending.pop(future)
+                    yield future.result()
+
+    def score_batch(self, clips, workers=None, max_inflight_bytes=256 * 1024 * 1024):
+        results = dict(self.iter_score_batch(clips, workers, max_inflight_bytes))
+        return [results[i] for i in range(len(results))]
+
     def switch_profile(self, new_profile_name):
         self.profile_name = new_profile_name
         self.custom_scorer = CustomConfidenceScorer(self.profiles_dict[new_profile_name])
@@ -1,42 +1,126 @@
 import numpy as np
-from feature_defs import FEATURE_BOUNDS, FEATURE_NAMES
+from feature_defs import FEATURE_BOUNDS, FEATURE_NAMES, TRANSCRIPT_FEATURE_NAMES
+
+
+def _bounds(names):
+    low = np.array([FEATURE_BOUNDS[name][0] for name in names], dtype=float)
+    high = np.array([FEATURE_BOUNDS[name][1] for name in names], dtype=float)
+    return low, high - low
+
+
+_LOW, _SPAN = _bounds(FEATURE_NAMES)
+_LOW32, _SPAN32 = _LOW.astype(np.float32), _SPAN.astype(np.float32)
+_TRANSCRIPT_LOW, _TRANSCRIPT_SPAN = _bounds(TRANSCRIPT_FEATURE_NAMES)
+
+# Only speech_rate and keyword_coverage count up; every other feature is
+# scored as 1 - normalized.
+_RISING = np.array([name == "speech_rate" for name in FEATURE_NAMES])
+_TRANSCRIPT_RISING = np.array([name == "keyword_coverage" for name in TRANSCRIPT_FEATURE_NAMES])
+
+
+def _profile_weights(profile_config):
+    weights = np.array([profile_config['weights'][name] for name in FEATURE_NAMES], dtype=float)
+    transcript_weights = profile_config.get('transcript_weights', {})
+    transcript = np.array([transcript_weights.get(name, 0.0) for name in TRANSCRIPT_FEATURE_NAMES], dtype=float)
+    return weights, transcript
+
+
+def normalize_features(features):
+    # float32 features are normalized in float32, as the per-element loop
+    # this replaces did, so scores are unchanged.
+    features = np.asarray(features)
+    if features.dtype == np.float32:
+        normalized = np.clip((features - _LOW32) / _SPAN32, 0, 1)
+    else:
+        normalized = np.clip((features - _LOW) / _SPAN, 0, 1)
+    return np.where(_RISING, normalized, 1 - normalized)
+
+
+def normalize_transcript(transcript_features):
+    if isinstance(transcript_features, dict):
+        transcript_features = [transcript_features[name] for name in TRANSCRIPT_FEATURE_NAMES]
+    values = np.asarray(transcript_features, dtype=float)
+    normalized = np.clip((values - _TRANSCRIPT_LOW) / _TRANSCRIPT_SPAN, 0, 1)
+    return np.where(_TRANSCRIPT_RISING, normalized, 1 - normalized)
 
 
 class CustomConfidenceScorer:
 
     def __init__(self, profile_config):
-        self.weights = np.array([
-            profile_config['weights']['pause_freq'],
-            profile_config['weights']['avg_pause'],
-            profile_config['weights']['silence_ratio'],
-            profile_config['weights']['speech_rate'],
-            profile_config['weights']['pitch_std']
-        ], dtype=float)
+        self.weights, self.transcript_weights = _profile_weights(profile_config)
+        self._abs_weights = np.abs(self.weights)
+        self._abs_transcript_weights = np.abs(self.transcript_weights)
         self.prev_conf = None
 
-    def score(self, features):
-        normalized = np.array([
-            (features[i] - FEATURE_BOUNDS[FEATURE_NAMES[i]][0]) /
-            (FEATURE_BOUNDS[FEATURE_NAMES[i]][1] - FEATURE_BOUNDS[FEATURE_NAMES[i]][0])
-            for i in range(len(features))
-        ])
-
-        normalized = np.clip(normalized, 0, 1)
-
-        inverted = np.array([
-            1 - normalized[0],
-            1 - normalized[1],
-            1 - normalized[2],
-            normalized[3],
-            1 - normalized[4]
-        ])
-
-        weighted_score = np.dot(inverted, np.abs(self.weights))
-        total_weight = np.sum(np.abs(self.weights))
+    def uses_transcript(self):
+        return bool(np.any(self.transcript_weights))
+
+    def score(self, features, transcript_features=None):
+        weighted_score = np.dot(normalize_features(features), self._abs_weights)
+        total_weight = np.sum(self._abs_weights)
+
+        if transcript_features is not None and self.uses_transcript():
+            weighted_score += np.dot(normalize_transcript(transcript_features), self._abs_transcript_weights)
+            total_weight += np.sum(self._abs_transcript_weights)
         confidence = (weighted_score / total_weight) * 100 if total_weight > 0 else 0
 
         confidence = float(np.clip(confidence, 0, 100))
         return confidence
 
+    def smooth(self, confidence, alpha=0.4):
+        if self.prev_conf is not None:
+            confidence = (1 - alpha) * self.prev_conf + alpha * confidence
+
+        confidence = float(np.clip(confidence, 0.0, 100.0))
+        self.prev_conf = confidence
+        return confidence
+
     def reset(self):
         self.prev_conf = None
+
+
+class ProfileScoreMatrix:
+
+    # Every profile as one row of a (profiles x features) weight matrix, so
+    # all profile scores for a batch of answers are one matrix multiply.
+    def __init__(self, profiles_dict):
+        self.names = list(profiles_dict)
+        weights, transcript = zip(*(_profile_weights(profiles_dict[name]) for name in self.names))
+        self.weights = np.abs(np.array(weights))
+        self.transcript_weights = np.abs(np.array(transcript))
+        self.total = self.weights.sum(axis=1)
+        self.transcript_total = self.transcript_weights.sum(axis=1)
+
+    def score_batch(self, features, transcript_features=None):
+        # (answers x features) in, (answers x profiles) out.
+        features = np.atleast_2d(features)
+        weighted = normalize_features(features) @ self.weights.T
+        total = np.broadcast_to(self.total, weighted.shape)
+
+        if transcript_features is not None:
+            if isinstance(transcript_features, dict):
+                transcript_features = [transcript_features]
+            transcript = np.array([normalize_transcript(t) for t in transcript_features])
+            weighted = weighted + transcript @ self.transcript_weights.T
+            total = total + self.transcript_total
+
+        confidence = np.divide(weighted, total, out=np.zeros_like(weighted), where=total > 0) * 100
+        return np.clip(confidence, 0, 100)
+
+    def score_all(self, features, transcript_features=None):
+        # One answer: a dot product per profile, the arithmetic of
+        # CustomConfidenceScorer.score, so each entry equals that profile's
+        # confidence exactly. A one-row matrix product can round differently.
+        normalized = normalize_features(features)
+        transcript = None if transcript_features is None else normalize_transcript(transcript_features)
+
+        scores = {}
+        for name, weights, transcript_weights, total, transcript_total in zip(
+                self.names, self.weights, self.transcript_weights, self.total, self.transcript_total):
+            weighted = np.dot(normalized, weights)
+            if transcript is not None and transcript_total > 0:
+                weighted += np.dot(transcript, transcript_weights)
+                total += transcript_total
+            confidence = (weighted / total) * 100 if total > 0 else 0
+            scores[name] = min(max(float(confidence), 0.0), 100.0)
+        return scores
\ No newline at end of file
@@ -1,6 +1,6 @@
 import numpy as np
 
 
-def compute_energy(audio):
-    rms = np.sqrt(np.mean(audio ** 2))
+def compute_energy(audio, axis=None):
+    rms = np.sqrt(np.mean(audio ** 2, axis=axis))
     return 20 * np.log10(rms + 1e-10)
\ No newline at end of file
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_answer(text):
+    text = re.sub(r"[^\w\s]", "", (text or "").lower())
+    return " ".join(text.split())
+
+
+class EvaluationCache:
+
+    def __init__(self, path=None, max_entries=1024, max_disk_entries=100000, ttl=30 * 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl = ttl
+
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._disk_rows = 0
+
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS evaluations ("
+                "key TEXT PRIMARY KEY, result TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS evaluations_accessed ON evaluations (accessed_at)")
+            self._db.commit()
+            self._disk_rows = self._db.execute("SELECT COUNT(*) FROM evaluations").fetchone()[0]
+
+    @staticmethod
+    def make_key(question, reference_answer, candidate_answer, rubric, model_name, prompt_version):
+        payload = json.dumps([
+            " ".join((question or "").split()),
+            " ".join((reference_answer or "").split()),
+            normalize_answer(candidate_answer),
+            " ".join((rubric or "").split()),
+            model_name,
+            prompt_version
+        ])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _expired(self, created_at, now):
+        return self.ttl is not None and now - created_at > self.ttl
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, result = entry
+                if not self._expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    self.stats['memory_hits'] += 1
+                    return dict(result)
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT result, created_at FROM evaluations WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and not self._expired(row[1], now):
+                    self._db.execute("UPDATE evaluations SET accessed_at = ? WHERE key = ?", (now, key))
+                    self._db.commit()
+                    result = json.loads(row[0])
+                    self._remember(key, row[1], result)
+                    self.stats['disk_hits'] += 1
+                    return dict(result)
+                if row is not None:
+                    self._db.execute("DELETE FROM evaluations WHERE key = ?", (key,))
+                    self._db.commit()
+                    self._disk_rows -= 1
+
+            self.stats['misses'] += 1
+            return None
+
+    def _remember(self, key, created_at, result):
+        self._memory[key] = (created_at, result)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def put(self, key, result):
+        now = time.time()
+        result = dict(result)
+        with self._lock:
+            self._remember(key, now, result)
+            self.stats['writes'] += 1
+
+            if self._db is not None:
+                exists = self._db.execute("SELECT 1 FROM evaluations WHERE key = ?", (key,)).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO evaluations (key, result, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(result), now, now)
+                )
+                if exists is None:
+                    self._disk_rows += 1
+                if self._disk_rows > self.max_disk_entries:
+                    self._trim(now)
+                self._db.commit()
+
+    def _trim(self, now):
+        # Only runs once the table is over its cap. Trimming to 90% of the cap
+        # leaves headroom, so the sort in the LRU delete runs once per
+        # max_disk_entries / 10 new keys rather than on every put.
+        if self.ttl is not None:
+            self._db.execute("DELETE FROM evaluations WHERE created_at < ?", (now - self.ttl,))
+        self._db.execute(
+            "DELETE FROM evaluations WHERE key IN ("
+            "SELECT key FROM evaluations ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries * 9 // 10,)
+        )
+        self._disk_rows = self._db.execute("SELECT COUNT(*) FROM evaluations").fetchone()[0]
+
+    def hit_rate(self):
+        hits = self.stats['memory_hits'] + self.stats['disk_hits']
+        total = hits + self.stats['misses']
+        return hits / total if total else 0.0
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM evaluations")
+                self._db.commit()
+                self._disk_rows = 0
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
\ No newline at end of file
@@ -6,10 +6,17 @@ FEATURE_NAMES = [
     "pitch_std"
 ]
 
+TRANSCRIPT_FEATURE_NAMES = [
+    "filler_rate",
+    "keyword_coverage"
+]
+
 FEATURE_BOUNDS = {
     "pause_freq": (0, 150),
     "avg_pause": (0, 2.0),
     "silence_ratio": (0, 0.95),
     "speech_rate": (0, 35),
-    "pitch_std": (0, 25)
+    "pitch_std": (0, 25),
+    "filler_rate": (0, 0.3),
+    "keyword_coverage": (0, 1.0)
 }
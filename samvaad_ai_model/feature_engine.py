@@ -1,16 +1,39 @@
 import time
 from collections import deque
 import numpy as np
-from pitch import estimate_pitch_fft
+from pitch import estimate_pitch_fft, estimate_pitch_fft_batch, legacy_pitch_scale
+from pitch_tracker import PitchTracker
 from energy import compute_energy
+from running_stats import VoicedWindow, RunningWindow
 from audioconfig import SAMPLE_RATE, CHUNK_DURATION, ANALYSIS_WINDOW
 from feature_defs import FEATURE_NAMES, FEATURE_BOUNDS
 
 
+_FEATURE_LOW = np.array([FEATURE_BOUNDS[name][0] for name in FEATURE_NAMES], dtype=np.float32)
+_FEATURE_HIGH = np.array([FEATURE_BOUNDS[name][1] for name in FEATURE_NAMES], dtype=np.float32)
+
+
+def frame_audio(audio, chunk_size):
+    audio = np.asarray(audio, dtype=np.float32)
+    n_frames = max(0, (len(audio) - 1) // chunk_size)
+    if n_frames == 0:
+        return np.empty((0, chunk_size), dtype=np.float32)
+
+    windows = np.lib.stride_tricks.sliding_window_view(audio, chunk_size)
+    return windows[:n_frames * chunk_size:chunk_size]
+
+
 class ConfidenceFeatureEngine:
 
-    def __init__(self, sample_rate=SAMPLE_RATE):
+    def __init__(self, sample_rate=SAMPLE_RATE, clock="wall", pitch_mode="chunk"):
+        if clock not in ("wall", "sample"):
+            raise ValueError(f"Unknown clock: {clock}")
+        if pitch_mode not in ("chunk", "track"):
+            raise ValueError(f"Unknown pitch mode: {pitch_mode}")
+
         self.sample_rate = sample_rate
+        self.clock = clock
+        self.pitch_mode = pitch_mode
         self.chunk_duration = CHUNK_DURATION
         self.analysis_window = ANALYSIS_WINDOW
 
@@ -18,15 +41,26 @@ class ConfidenceFeatureEngine:
         max_chunks = int(self.analysis_window / self.chunk_duration)
 
         self.voiced_buffer = deque(maxlen=max_chunks)
-        self.pitch_buffer = deque(maxlen=30)
+        # In track mode every voiced chunk contributes one F0 per tracker frame,
+        # so the buffer spans the same 30 chunks as in chunk mode.
+        self.pitch_tracker = None
+        pitch_buffer_len = 30
+        if pitch_mode == "track":
+            self.pitch_tracker = PitchTracker(sample_rate)
+            pitch_buffer_len *= max(1, self.pitch_tracker.frames_per_chunk(self.chunk_size))
+        # The tracker reports true Hz, but FEATURE_BOUNDS and the trained model
+        # use the chunk estimator's scale (~1.95x true Hz for 0.5 s chunks at
+        # 16 kHz). Store tracked F0 on that scale so pitch_std stays comparable.
+        self.pitch_scale = legacy_pitch_scale(self.chunk_size)
+        self.pitch_buffer = deque(maxlen=pitch_buffer_len)
         self.recent_pauses = deque(maxlen=20)
         self.energy_buffer = deque(maxlen=10)
-        self.all_energy_values = []
 
         self.is_speaking = False
         self.pause_start = None
         self.noise_floor = None
         self.chunk_count = 0
+        self.samples_seen = 0
 
     def process_chunk(self, chunk):
         if chunk is None or len(chunk) == 0:
@@ -34,10 +68,11 @@ class ConfidenceFeatureEngine:
 
         self.chunk_count += 1
         chunk = np.asarray(chunk, dtype=np.float32)
+        now = self._now()
+        self.samples_seen += len(chunk)
 
         energy = compute_energy(chunk)
         self.energy_buffer.append(energy)
-        self.all_energy_values.append(energy)
 
         if self.noise_floor is None and len(self.energy_buffer) >= 5:
             self.noise_floor = float(np.min(list(self.energy_buffer)))
@@ -45,11 +80,9 @@ class ConfidenceFeatureEngine:
         if self.noise_floor is None:
             return
 
-        speaking = bool(energy > self.noise_floor + 2)
+        speaking = bool(self.is_voiced(energy))
         self.voiced_buffer.append(speaking)
 
-        now = time.time()
-
         if self.is_speaking and not speaking:
             self.pause_start = now
         elif not self.is_speaking and speaking and self.pause_start is not None:
@@ -61,9 +94,81 @@ class ConfidenceFeatureEngine:
         self.is_speaking = speaking
 
         if speaking and energy > self.noise_floor + 5:
-            pitch = estimate_pitch_fft(chunk, self.sample_rate)
-            if pitch > 0:
-                self.pitch_buffer.append(pitch)
+            if self.pitch_tracker is not None:
+                pitches = self.pitch_tracker.track(chunk)
+                self.pitch_buffer.extend((pitches[pitches > 0] * self.pitch_scale).tolist())
+            else:
+                pitch = estimate_pitch_fft(chunk, self.sample_rate)
+                if pitch > 0:
+                    self.pitch_buffer.append(pitch)
+
+    def is_voiced(self, energy):
+        return energy > self.noise_floor + 2
+
+    def _now(self):
+        if self.clock == "sample":
+            return self.samples_seen / self.sample_rate
+        return time.time()
+
+    def process_audio(self, audio):
+        frames = frame_audio(audio, self.chunk_size)
+        n_frames = len(frames)
+        if n_frames == 0:
+            return
+
+        if self.clock == "sample":
+            origin = self.samples_seen / self.sample_rate
+        else:
+            origin = time.time() - n_frames * self.chunk_size / self.sample_rate
+        frame_times = origin + np.arange(n_frames) * self.chunk_size / self.sample_rate
+        self.chunk_count += n_frames
+        self.samples_seen += n_frames * self.chunk_size
+
+        energies = compute_energy(frames, axis=1)
+        start = 0
+
+        if self.noise_floor is None:
+            start = 5 - len(self.energy_buffer) - 1
+            if start >= n_frames:
+                self.energy_buffer.extend(energies.tolist())
+                return
+            self.noise_floor = float(np.min(list(self.energy_buffer) + energies[:start + 1].tolist()))
+
+        self.energy_buffer.extend(energies.tolist())
+
+        energies = energies[start:]
+        frames = frames[start:]
+        frame_times = frame_times[start:]
+
+        voiced = self.is_voiced(energies)
+        self.voiced_buffer.extend(voiced.tolist())
+
+        states = np.concatenate(([self.is_speaking], voiced)).astype(np.int8)
+        steps = np.diff(states)
+        pause_starts = frame_times[steps == -1]
+        pause_ends = frame_times[steps == 1]
+
+        if len(pause_ends) > 0:
+            if len(pause_starts) == 0 or pause_ends[0] < pause_starts[0]:
+                prior_start = np.nan if self.pause_start is None else self.pause_start
+                pause_starts = np.concatenate(([prior_start], pause_starts))
+            durations = pause_ends - pause_starts[:len(pause_ends)]
+            self.recent_pauses.extend(durations[durations >= 0.1].tolist())
+
+        if len(pause_starts) > len(pause_ends):
+            self.pause_start = float(pause_starts[-1])
+        elif len(pause_ends) > 0:
+            self.pause_start = None
+
+        self.is_speaking = bool(voiced[-1])
+
+        candidates = voiced & (energies > self.noise_floor + 5)
+        if np.any(candidates):
+            if self.pitch_tracker is not None:
+                pitches = self.pitch_tracker.track(frames[candidates]).ravel() * self.pitch_scale
+            else:
+                pitches = estimate_pitch_fft_batch(frames[candidates], self.sample_rate)
+            self.pitch_buffer.extend(pitches[pitches > 0].tolist())
 
     def features_ready(self) -> bool:
         if len(self.voiced_buffer) < 3:
@@ -124,8 +229,184 @@ class ConfidenceFeatureEngine:
         self.pitch_buffer.clear()
         self.recent_pauses.clear()
         self.energy_buffer.clear()
-        self.all_energy_values.clear()
         self.is_speaking = False
         self.pause_start = None
         self.noise_floor = None
-        self.chunk_count = 0
\ No newline at end of file
+        self.chunk_count = 0
+        self.samples_seen = 0
+
+
+class IncrementalFeatureEngine(ConfidenceFeatureEngine):
+
+    def __init__(self, sample_rate=SAMPLE_RATE, clock="wall", pitch_mode="chunk"):
+        super().__init__(sample_rate, clock=clock, pitch_mode=pitch_mode)
+        self.voiced_buffer = VoicedWindow(self.voiced_buffer.maxlen)
+        self.pitch_buffer = RunningWindow(self.pitch_buffer.maxlen)
+        self.recent_pauses = RunningWindow(self.recent_pauses.maxlen)
+
+    def features_ready(self) -> bool:
+        return (
+            len(self.voiced_buffer) >= 3
+            and self.voiced_buffer.voiced >= 1
+            and self.noise_floor is not None
+        )
+
+    def extract_features(self):
+        n_pauses = len(self.recent_pauses)
+        pause_freq = n_pauses / self.analysis_window * 60 if n_pauses > 0 else 0.0
+        avg_pause = self.recent_pauses.mean if n_pauses > 0 else 0.0
+
+        total_count = len(self.voiced_buffer)
+        silence_ratio = 1.0 - (self.voiced_buffer.voiced / total_count) if total_count > 0 else 0.5
+
+        if total_count > 1:
+            speech_rate = max(0, self.voiced_buffer.transitions * 60 / self.analysis_window / 3)
+        else:
+            speech_rate = 0.0
+
+        pitch_std = float(np.sqrt(self.pitch_buffer.variance)) if len(self.pitch_buffer) >= 2 else 0.0
+
+        raw_features = np.array(
+            [pause_freq, avg_pause, silence_ratio, speech_rate, pitch_std],
+            dtype=np.float32
+        )
+        clipped_features = np.clip(raw_features, _FEATURE_LOW, _FEATURE_HIGH).astype(np.float32)
+
+        return clipped_features, raw_features
+
+
+class BatchFeatureEngine:
+
+    # Struct-of-arrays form of ConfidenceFeatureEngine (sample clock, chunk
+    # pitch) for N streams. Every window is a right-aligned (N x maxlen)
+    # array holding the newest value in its last column, so one push and one
+    # reduction cover all streams.
+    def __init__(self, n_streams, sample_rate=SAMPLE_RATE):
+        self.n_streams = n_streams
+        self.sample_rate = sample_rate
+        self.chunk_duration = CHUNK_DURATION
+        self.analysis_window = ANALYSIS_WINDOW
+        self.chunk_size = int(sample_rate * self.chunk_duration)
+        max_chunks = int(self.analysis_window / self.chunk_duration)
+
+        self.energy = np.zeros((n_streams, 10), dtype=np.float32)
+        self.voiced = np.zeros((n_streams, max_chunks), dtype=bool)
+        self.pitches = np.zeros((n_streams, 30))
+        self.pauses = np.zeros((n_streams, 20))
+        self.energy_len = np.zeros(n_streams, dtype=np.int64)
+        self.voiced_len = np.zeros(n_streams, dtype=np.int64)
+        self.pitch_len = np.zeros(n_streams, dtype=np.int64)
+        self.pause_len = np.zeros(n_streams, dtype=np.int64)
+
+        self.noise_floor = np.full(n_streams, np.nan)
+        self.pause_start = np.full(n_streams, np.nan)
+        self.is_speaking = np.zeros(n_streams, dtype=bool)
+        self.chunk_count = np.zeros(n_streams, dtype=np.int64)
+        self.samples_seen = np.zeros(n_streams, dtype=np.int64)
+
+    @staticmethod
+    def _push(window, lengths, rows, values):
+        if len(rows) == 0:
+            return
+        window[rows, :-1] = window[rows, 1:]
+        window[rows, -1] = values
+        lengths[rows] = np.minimum(lengths[rows] + 1, window.shape[1])
+
+    def _threshold(self, rows, margin):
+        # The scalar engine compares a float32 energy with a Python float,
+        # which NumPy does in float32.
+        return (self.noise_floor[rows] + margin).astype(np.float32)
+
+    def process_block(self, block, active=None):
+        block = np.asarray(block, dtype=np.float32)
+        if block.shape != (self.n_streams, self.chunk_size):
+            raise ValueError(f"Expected a ({self.n_streams}, {self.chunk_size}) block, got {block.shape}")
+
+        rows = np.arange(self.n_streams) if active is None else np.flatnonzero(active)
+        if len(rows) == 0:
+            return
+        chunks = block[rows] if active is not None else block
+
+        self.chunk_count[rows] += 1
+        self.samples_seen[rows] += self.chunk_size
+        now = self.samples_seen[rows] / self.sample_rate
+
+        energies = compute_energy(chunks, axis=1)
+        self._push(self.energy, self.energy_len, rows, energies)
+
+        new_floor = np.isnan(self.noise_floor[rows]) & (self.energy_len[rows] >= 5)
+        if np.any(new_floor):
+            floor_rows = rows[new_floor]
+            self.noise_floor[floor_rows] = np.min(self.energy[floor_rows, -5:], axis=1)
+
+        ready = ~np.isnan(self.noise_floor[rows])
+        rows, chunks, energies, now = rows[ready], chunks[ready], energies[ready], now[ready]
+        if len(rows) == 0:
+            return
+
+        speaking = energies > self._threshold(rows, 2)
+        self._push(self.voiced, self.voiced_len, rows, speaking)
+
+        was_speaking = self.is_speaking[rows]
+        starts = was_speaking & ~speaking
+        self.pause_start[rows[starts]] = now[starts]
+
+        ends = ~was_speaking & speaking & ~np.isnan(self.pause_start[rows])
+        if np.any(ends):
+            durations = now[ends] - self.pause_start[rows[ends]]
+            long_enough = durations >= 0.1
+            self._push(self.pauses, self.pause_len, rows[ends][long_enough], durations[long_enough])
+            self.pause_start[rows[ends]] = np.nan
+
+        self.is_speaking[rows] = speaking
+
+        candidates = speaking & (energies > self._threshold(rows, 5))
+        if np.any(candidates):
+            pitches = estimate_pitch_fft_batch(chunks[candidates], self.sample_rate)
+            found = pitches > 0
+            self._push(self.pitches, self.pitch_len, rows[candidates][found], pitches[found])
+
+    def features_ready(self):
+        voiced_count = (self.voiced & self._valid(self.voiced, self.voiced_len)).sum(axis=1)
+        return (self.voiced_len >= 3) & (voiced_count >= 1) & ~np.isnan(self.noise_floor)
+
+    @staticmethod
+    def _valid(window, lengths):
+        return np.arange(window.shape[1])[::-1] < lengths[:, None]
+
+    def extract_features(self):
+        pause_mask = self._valid(self.pauses, self.pause_len)
+        n_pauses = self.pause_len
+        pause_freq = n_pauses / self.analysis_window * 60
+        avg_pause = np.divide(np.where(pause_mask, self.pauses, 0.0).sum(axis=1), n_pauses,
+                              out=np.zeros(self.n_streams), where=n_pauses > 0)
+
+        voiced_mask = self._valid(self.voiced, self.voiced_len)
+        total = self.voiced_len
+        voiced_count = (self.voiced & voiced_mask).sum(axis=1)
+        silence_ratio = np.where(total > 0, 1.0 - voiced_count / np.maximum(total, 1), 0.5)
+
+        changes = (self.voiced[:, 1:] != self.voiced[:, :-1]) & voiced_mask[:, :-1]
+        speech_rate = np.where(total > 1, np.maximum(0, changes.sum(axis=1) * 60 / self.analysis_window / 3), 0.0)
+
+        pitch_mask = self._valid(self.pitches, self.pitch_len)
+        n_pitches = np.maximum(self.pitch_len, 1)
+        pitch_mean = np.where(pitch_mask, self.pitches, 0.0).sum(axis=1) / n_pitches
+        pitch_var = np.where(pitch_mask, (self.pitches - pitch_mean[:, None]) ** 2, 0.0).sum(axis=1) / n_pitches
+        pitch_std = np.where(self.pitch_len >= 2, np.sqrt(pitch_var), 0.0)
+
+        raw_features = np.stack(
+            [pause_freq, avg_pause, silence_ratio, speech_rate, pitch_std], axis=1
+        ).astype(np.float32)
+        clipped_features = np.clip(raw_features, _FEATURE_LOW, _FEATURE_HIGH).astype(np.float32)
+
+        return clipped_features, raw_features
+
+    def reset(self, streams=None):
+        rows = slice(None) if streams is None else streams
+        for lengths in (self.energy_len, self.voiced_len, self.pitch_len, self.pause_len,
+                        self.chunk_count, self.samples_seen):
+            lengths[rows] = 0
+        self.noise_floor[rows] = np.nan
+        self.pause_start[rows] = np.nan
+        self.is_speaking[rows] = False
\ No newline at end of file
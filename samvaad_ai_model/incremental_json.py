@@ -0,0 +1,127 @@
+import json
+
+
+class IncrementalJSONObjectParser:
+
+    def __init__(self):
+        self.fields = {}
+        self.started = False
+        self.done = False
+        self.errors = []
+
+        self._text = ""
+        self._pos = 0
+        self._mode = "seek"
+        self._key = None
+        self._token_start = 0
+        self._kind = None
+        self._nesting = 0
+        self._in_string = False
+        self._escape = False
+
+    def _complete(self, raw):
+        try:
+            value = json.loads(raw)
+        except json.JSONDecodeError:
+            self.errors.append(self._key)
+            return None
+
+        self.fields[self._key] = value
+        return (self._key, value)
+
+    def feed(self, text):
+        if not text or self.done:
+            return []
+
+        self._text += text
+        completed = []
+        data = self._text
+        i = self._pos
+
+        while i < len(data) and not self.done:
+            c = data[i]
+            mode = self._mode
+
+            if mode == "seek":
+                if c == "{":
+                    self.started = True
+                    self._mode = "key"
+
+            elif mode == "key":
+                if c == '"':
+                    self._mode = "key_string"
+                    self._token_start = i
+                elif c == "}":
+                    self.done = True
+
+            elif mode == "key_string":
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._key = json.loads(data[self._token_start:i + 1])
+                    self._mode = "colon"
+
+            elif mode == "colon":
+                if c == ":":
+                    self._mode = "value_start"
+
+            elif mode == "value_start":
+                if not c.isspace():
+                    self._token_start = i
+                    self._nesting = 0
+                    self._mode = "value"
+                    if c == '"':
+                        self._kind = "string"
+                        self._in_string = True
+                    elif c in "{[":
+                        self._kind = "container"
+                        self._nesting = 1
+                    else:
+                        self._kind = "scalar"
+
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._kind == "string":
+                        field = self._complete(data[self._token_start:i + 1])
+                        if field:
+                            completed.append(field)
+                        self._mode = "key"
+
+            elif c == '"':
+                self._in_string = True
+
+            elif c in "{[":
+                self._nesting += 1
+
+            elif c in "}]":
+                if self._nesting > 0:
+                    self._nesting -= 1
+                    if self._nesting == 0:
+                        field = self._complete(data[self._token_start:i + 1])
+                        if field:
+                            completed.append(field)
+                        self._mode = "key"
+                else:
+                    # A scalar ends at the closing brace of the top-level object.
+                    field = self._complete(data[self._token_start:i].strip())
+                    if field:
+                        completed.append(field)
+                    self.done = True
+
+            elif c == "," and self._nesting == 0:
+                field = self._complete(data[self._token_start:i].strip())
+                if field:
+                    completed.append(field)
+                self._mode = "key"
+
+            i += 1
+
+        self._pos = i
+        return completed
\ No newline at end of file
@@ -1,19 +1,29 @@
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import json
 import os
 from audio_recorder import AudioRecorder
+from audio_buffer import AudioBuffer
 from confidence_engine import ConfidenceEngine
 from scoring_profiles import SCORING_PROFILES
 from audioconfig import SAMPLE_RATE
 from speech_to_text import SpeechToTextConverter
-from llm_evaluator import LLMEvaluator
+from stt_backends import make_stt_backend
+from llm_evaluator import LLMEvaluator, load_reference_answers
+from evaluation_cache import EvaluationCache
+from prescreen import AnswerPrescreener
+from transcript_analyzer import TranscriptAnalyzer
+from feature_defs import TRANSCRIPT_FEATURE_NAMES
 
 
 class InterviewManager:
 
-    def __init__(self, model_path="confidence_model.pkl", profile="balanced"):
-        self.recorder = AudioRecorder(sample_rate=SAMPLE_RATE)
+    def __init__(self, model_path="confidence_model.pkl", profile="balanced",
+                 recorder=None, stt=None, llm_evaluator=None, max_workers=4, batch_evaluation=False,
+                 prescreen=True, stt_backend="google", stt_workers=0, segmented_stt=False,
+                 evaluation_cache_path=None):
+        self.recorder = recorder or AudioRecorder(sample_rate=SAMPLE_RATE)
 
         self.conf_engine = ConfidenceEngine(
             model_path=model_path,
@@ -22,24 +32,29 @@ class InterviewManager:
             sample_rate=SAMPLE_RATE
         )
 
-        self.stt = SpeechToTextConverter(sample_rate=SAMPLE_RATE)
-        self.llm_evaluator = LLMEvaluator()
-        self.reference_answers = self._load_reference_answers()
+        self.stt = stt or SpeechToTextConverter(
+            sample_rate=SAMPLE_RATE,
+            backend=make_stt_backend(stt_backend, workers=stt_workers),
+            segmented=segmented_stt
+        )
+        self.llm_evaluator = llm_evaluator or LLMEvaluator(
+            cache=EvaluationCache(path=evaluation_cache_path)
+        )
+        self.reference_answers = load_reference_answers()
+        self.prescreener = AnswerPrescreener(self.reference_answers) if prescreen else None
+        self.transcript_analyzer = TranscriptAnalyzer(self.reference_answers)
+
+        self.batch_evaluation = batch_evaluation
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.pending = []
 
         self.answers = []
         self.candidate_name = ""
         self.interview_start_time = None
 
-    def _load_reference_answers(self):
-        try:
-            with open('reference_answers.json', 'r') as f:
-                data = json.load(f)
-                return data.get('reference_answers', {})
-        except:
-            return {}
-
     def start_interview(self, candidate_name):
         self.candidate_name = candidate_name
+        self.wait_for_evaluations()
         self.answers = []
         self.interview_start_time = datetime.now()
 
@@ -50,30 +65,18 @@ class InterviewManager:
         print(f"Profile: {self.conf_engine.profile_name}")
         print(f"{'='*70}\n")
 
-    def ask_question(self, question_num, question_text, max_duration=15):
-        print(f"\n{'='*70}")
-        print(f"Question {question_num}")
-        print(f"{'='*70}")
-        print(f"\n{question_text}\n")
-
-        input("Press Enter when ready to answer...")
-
-        try:
-            audio = self.recorder.record(max_duration=max_duration)
-        except Exception as e:
-            print(f"Error recording audio: {e}")
-            return None
-
-        try:
-            result = self.conf_engine.score_audio(audio)
-        except Exception as e:
-            print(f"Error scoring audio: {e}")
-            return None
+    def _reference_text(self, question_num):
+        reference = self.reference_answers.get(str(question_num), {})
+        return reference.get('reference_answer', '')
 
+    def _transcribe_and_evaluate(self, question_num, question_text, audio, stt_stream=None):
         transcription = {'text': '', 'confidence': 0.0, 'error': None}
         if self.stt.is_available():
             try:
-                transcription = self.stt.transcribe(audio)
+                if stt_stream is not None:
+                    transcription = stt_stream.finish(audio)
+                else:
+                    transcription = self.stt.transcribe(audio)
             except Exception as e:
                 transcription['error'] = str(e)
 
@@ -84,13 +87,18 @@ class InterviewManager:
             'error': None
         }
 
-        if self.llm_evaluator.is_available() and transcription['text']:
+        # In batch mode the whole interview is evaluated in wait_for_evaluations.
+        if self.llm_evaluator.is_available() and transcription['text'] and not self.batch_evaluation:
             try:
-                ref_answer_key = str(question_num)
-                reference = self.reference_answers.get(ref_answer_key, {})
-                reference_text = reference.get('reference_answer', '')
+                reference_text = self._reference_text(question_num)
+
+                local = None
+                if reference_text and self.prescreener is not None:
+                    local = self.prescreener.screen(question_num, transcription['text'])
 
-                if reference_text:
+                if local is not None:
+                    evaluation = local
+                elif reference_text:
                     evaluation = self.llm_evaluator.evaluate_answer(
                         candidate_answer=transcription['text'],
                         question=question_text,
@@ -99,6 +107,143 @@ class InterviewManager:
             except Exception as e:
                 evaluation['error'] = str(e)
 
+        return transcription, evaluation
+
+    def _fill_evaluation(self, answer, transcription, evaluation):
+        answer['transcription'] = {
+            'text': transcription.get('text', ''),
+            'confidence': transcription.get('confidence', 0.0),
+            'error': transcription.get('error')
+        }
+        answer['evaluation'] = {
+            'is_correct': evaluation.get('is_correct'),
+            'score': evaluation.get('score'),
+            'strengths': evaluation.get('strengths', []),
+            'gaps': evaluation.get('gaps', []),
+            'reasoning': evaluation.get('reasoning', ''),
+            'error': evaluation.get('error'),
+            'prescreened': evaluation.get('prescreened', False)
+        }
+
+    def _apply_transcript(self, answer, transcription):
+        text = transcription.get('text')
+        if not text:
+            return
+
+        analysis = self.transcript_analyzer.analyze(answer['question_number'], text)
+        answer['transcript_analysis'] = analysis
+        answer['transcript_features'] = {name: analysis[name] for name in TRANSCRIPT_FEATURE_NAMES}
+
+        # The audio-only score was shown while the transcript was pending.
+        if answer['speech_features']:
+            result = self.conf_engine.apply_transcript({
+                'confidence': answer['confidence_score'],
+                'features': answer['speech_features'],
+                'profile_scores': answer['profile_scores']
+            }, answer['transcript_features'])
+            answer['confidence_score'] = result['confidence']
+            answer['profile_scores'] = result['profile_scores']
+
+    def _evaluate_batch(self, completed):
+        if not self.llm_evaluator.is_available():
+            return
+
+        indices = []
+        items = []
+        for i, (answer, transcription, _) in enumerate(completed):
+            reference_text = self._reference_text(answer['question_number'])
+            if not transcription.get('text') or not reference_text:
+                continue
+
+            if self.prescreener is not None:
+                local = self.prescreener.screen(answer['question_number'], transcription['text'])
+                if local is not None:
+                    completed[i] = (answer, transcription, local)
+                    continue
+
+            indices.append(i)
+            items.append({
+                'question': answer['question_text'],
+                'candidate_answer': transcription['text'],
+                'reference_answer': reference_text
+            })
+
+        if not items:
+            return
+
+        try:
+            evaluations = self.llm_evaluator.evaluate_interview(items)
+        except Exception as e:
+            evaluations = [{'is_correct': None, 'score': 0.0, 'reasoning': '', 'error': str(e)}] * len(items)
+
+        for i, evaluation in zip(indices, evaluations):
+            answer, transcription, _ = completed[i]
+            completed[i] = (answer, transcription, evaluation)
+
+    def wait_for_evaluations(self):
+        pending, self.pending = self.pending, []
+        completed = []
+        for answer, future in pending:
+            try:
+                transcription, evaluation = future.result()
+            except Exception as e:
+                transcription = {'text': '', 'confidence': 0.0, 'error': str(e)}
+                evaluation = {'is_correct': None, 'score': 0.0, 'reasoning': '', 'error': str(e)}
+            completed.append((answer, transcription, evaluation))
+
+        if self.batch_evaluation:
+            self._evaluate_batch(completed)
+
+        for answer, transcription, evaluation in completed:
+            self._apply_transcript(answer, transcription)
+            self._fill_evaluation(answer, transcription, evaluation)
+
+    def ask_question(self, question_num, question_text, max_duration=15, wait_for_ready=True, pipelined=True):
+        print(f"\n{'='*70}")
+        print(f"Question {question_num}")
+        print(f"{'='*70}")
+        print(f"\n{question_text}\n")
+
+        if wait_for_ready:
+            input("Press Enter when ready to answer...")
+
+        # Streaming recorders feed the feature engine (and segmented STT)
+        # during capture and stop once the candidate has finished talking.
+        streamed = hasattr(self.recorder, 'stream')
+        stt_stream = None
+        try:
+            if streamed:
+                if getattr(self.stt, 'segmented', False) and self.stt.is_available():
+                    stt_stream = self.stt.start_stream()
+                audio = self.recorder.record(
+                    max_duration=max_duration,
+                    feature_engine=self.conf_engine.begin_stream(),
+                    on_frame=stt_stream.push if stt_stream is not None else None
+                )
+            else:
+                audio = self.recorder.record(max_duration=max_duration)
+        except Exception as e:
+            print(f"Error recording audio: {e}")
+            return None
+
+        # One float32 buffer is shared by the scorer and STT; its int16 view
+        # is built once, on first use.
+        if audio is not None:
+            audio = AudioBuffer(audio, getattr(self.recorder, 'sample_rate', SAMPLE_RATE))
+
+        # Transcription and the LLM call run in the background while the
+        # confidence score is computed and the next question is asked.
+        evaluation_future = self.executor.submit(
+            self._transcribe_and_evaluate, question_num, question_text, audio, stt_stream
+        )
+
+        try:
+            result = self.conf_engine.finish_stream(audio) if streamed else self.conf_engine.score_audio(audio)
+        except Exception as e:
+            print(f"Error scoring audio: {e}")
+            evaluation_future.cancel()
+            return None
+
         answer = {
             'question_number': question_num,
             'question_text': question_text,
@@ -108,20 +253,13 @@ class InterviewManager:
             'speech_detected': result['speech_detected'],
             'timestamp': datetime.now().isoformat(),
             'speech_features': result['features'],
-            'transcription': {
-                'text': transcription.get('text', ''),
-                'confidence': transcription.get('confidence', 0.0),
-                'error': transcription.get('error')
-            },
-            'evaluation': {
-                'is_correct': evaluation.get('is_correct'),
-                'score': evaluation.get('score'),
-                'strengths': evaluation.get('strengths', []),
-                'gaps': evaluation.get('gaps', []),
-                'reasoning': evaluation.get('reasoning', ''),
-                'error': evaluation.get('error')
-            }
+            'profile_scores': result.get('profile_scores'),
         }
+        self._fill_evaluation(answer, {}, {'score': None, 'reasoning': 'Evaluation pending'})
+        self.pending.append((answer, evaluation_future))
+
+        if not pipelined:
+            self.wait_for_evaluations()
 
         self.answers.append(answer)
 
@@ -142,6 +280,11 @@ class InterviewManager:
 
         print(f"Rating: {rating}")
 
+        if result.get('profile_scores'):
+            print(f"\nBy profile:")
+            for name, value in result['profile_scores'].items():
+                print(f"   {name}: {value:.1f}")
+
         if result['features']:
             print(f"\nFeatures:")
             for name, value in result['features'].items():
@@ -152,6 +295,7 @@ class InterviewManager:
         return answer
 
     def save_answers(self, output_dir="."):
+        self.wait_for_evaluations()
         os.makedirs(output_dir, exist_ok=True)
 
         if not self.answers:
@@ -171,7 +315,9 @@ class InterviewManager:
                         'ml_confidence': float(answer['ml_confidence']) if answer['ml_confidence'] else None,
                         'speech_duration': float(answer['speech_duration']),
                         'speech_detected': bool(answer['speech_detected']),
-                        'speech_features': answer['speech_features']
+                        'speech_features': answer['speech_features'],
+                        'transcript_features': answer.get('transcript_features'),
+                        'profile_scores': answer.get('profile_scores')
                     },
                     'transcription': {
                         'text': answer['transcription']['text'],
@@ -197,6 +343,7 @@ class InterviewManager:
                 print(f"Error saving answer {i}: {e}")
 
     def save_summary(self, output_dir="."):
+        self.wait_for_evaluations()
         if not self.answers:
             return
 
@@ -225,6 +372,7 @@ class InterviewManager:
             print(f"Error saving summary: {e}")
 
     def display_summary(self):
+        self.wait_for_evaluations()
         if not self.answers:
             return
 
@@ -245,6 +393,12 @@ class InterviewManager:
             eval_avg = np.mean(eval_scores)
             print(f"\nAverage Evaluation Score: {eval_avg:.1f}/100")
 
+        if self.prescreener is not None and self.prescreener.stats['screened']:
+            stats = self.prescreener.stats
+            skipped = stats['skipped_empty'] + stats['skipped_off_topic']
+            print(f"LLM calls skipped by pre-screen: {skipped}/{stats['screened']} "
+                  f"({self.prescreener.skip_rate():.0%})")
+
         if avg >= 85:
             assessment = "EXCELLENT"
         elif avg >= 70:
@@ -255,4 +409,10 @@ class InterviewManager:
             assessment = "FAIR"
 
         print(f"Overall: {assessment}")
-        print(f"{'='*70}\n")
\ No newline at end of file
+        print(f"{'='*70}\n")
+
+    def close(self):
+        self.wait_for_evaluations()
+        self.executor.shutdown()
+        if hasattr(self.stt, 'close'):
+            self.stt.close()
\ No newline at end of file
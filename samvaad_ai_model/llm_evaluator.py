@@ -1,18 +1,38 @@
 import json
 import os
-import re
 from google import genai
-from typing import Dict, Optional
+from typing import Callable, Dict, List, Optional
 from dotenv import load_dotenv
 from pathlib import Path
+from evaluation_cache import EvaluationCache
+from incremental_json import IncrementalJSONObjectParser
 
 env_path = Path(__file__).parent / '.env'
 load_dotenv(dotenv_path=env_path)
 
+PROMPT_VERSION = "1"
+
+
+def load_reference_answers(path='reference_answers.json'):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f).get('reference_answers', {})
+    except Exception:
+        return {}
+
 
 class LLMEvaluator:
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, cache: Optional[EvaluationCache] = None, client=None):
+        self.model_name = 'gemini-2.0-flash'
+        self.cache = cache
+        self.usage = {'requests': 0, 'prompt_tokens': 0}
+
+        if client is not None:
+            self.client = client
+            self.available = True
+            return
+
         try:
             key = api_key or os.getenv("GOOGLE_API_KEY")
 
@@ -21,36 +41,18 @@ class LLMEvaluator:
                 return
 
             self.client = genai.Client(api_key=key)
-            self.model_name = 'gemini-2.0-flash'
             self.available = True
         except Exception as e:
             self.available = False
 
-    def evaluate_answer(
+    def _build_prompt(
         self,
         candidate_answer: str,
         question: str,
         reference_answer: str,
         evaluation_rubric: Optional[str] = None
-    ) -> Dict:
-        if not self.available:
-            return {
-                'is_correct': None,
-                'score': 0.0,
-                'reasoning': 'Gemini API not available',
-                'error': 'API not configured'
-            }
-
-        if not candidate_answer or not candidate_answer.strip():
-            return {
-                'is_correct': False,
-                'score': 0.0,
-                'reasoning': 'No answer provided',
-                'error': None
-            }
-
-        try:
-            prompt = f"""Evaluate the following interview answer:
+    ) -> str:
+        return f"""Evaluate the following interview answer:
 
 QUESTION: {question}
 
@@ -78,41 +80,193 @@ Respond in JSON format:
     "reasoning": "detailed reasoning"
 }}"""
 
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=prompt
-            )
+    def _build_batch_prompt(self, items: List[Dict], evaluation_rubric: Optional[str] = None) -> str:
+        sections = []
+        for item_id, item in items:
+            sections.append(f"""### ITEM {item_id}
+QUESTION: {item['question']}
 
-            try:
-                response_text = response.text
+CANDIDATE'S ANSWER:
+{item['candidate_answer']}
 
-                json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+REFERENCE/EXPECTED ANSWER:
+{item['reference_answer']}""")
 
-                if json_match:
-                    result = json.loads(json_match.group())
-                else:
-                    result = {
-                        'is_correct': 'unknown',
-                        'score': 0.0,
-                        'reasoning': response_text
-                    }
-
-                return {
-                    'is_correct': result.get('is_correct', 'unknown'),
-                    'score': float(result.get('score', 0)),
-                    'strengths': result.get('strengths', []),
-                    'gaps': result.get('gaps', []),
-                    'reasoning': result.get('reasoning', ''),
-                    'error': None
-                }
-
-            except json.JSONDecodeError:
-                return {
-                    'is_correct': 'unknown',
-                    'score': 0.0,
-                    'reasoning': response.text,
-                    'error': 'Could not parse response'
-                }
+        answers = "\n\n".join(sections)
+        return f"""Evaluate each of the following interview answers independently.
+
+{f'EVALUATION RUBRIC:{evaluation_rubric}' if evaluation_rubric else ''}
+
+For every item, provide:
+1. Is the answer correct? (yes/no/partially)
+2. Score out of 100 (0-100)
+3. Key strengths in the answer
+4. Key gaps or issues
+5. Overall reasoning
+
+{answers}
+
+Respond with a JSON array holding one object per item, in the same order:
+[
+    {{
+        "id": "<item id>",
+        "is_correct": "yes/no/partially",
+        "score": <number 0-100>,
+        "strengths": ["strength1", "strength2"],
+        "gaps": ["gap1", "gap2"],
+        "reasoning": "detailed reasoning"
+    }}
+]"""
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        return len(text) // 4 + 1
+
+    def _count_request(self, prompt: str):
+        self.usage['requests'] += 1
+        self.usage['prompt_tokens'] += self.estimate_tokens(prompt)
+
+    def _generate(self, prompt: str):
+        self._count_request(prompt)
+        return self.client.models.generate_content(
+            model=self.model_name,
+            contents=prompt
+        )
+
+    def _normalize_result(self, result: Dict) -> Dict:
+        return {
+            'is_correct': result.get('is_correct', 'unknown'),
+            'score': float(result.get('score', 0)),
+            'strengths': result.get('strengths', []),
+            'gaps': result.get('gaps', []),
+            'reasoning': result.get('reasoning', ''),
+            'error': None
+        }
+
+    def _parse_response(self, response_text: str, parser: Optional[IncrementalJSONObjectParser] = None) -> Dict:
+        if parser is None:
+            parser = IncrementalJSONObjectParser()
+            parser.feed(response_text)
+
+        if not parser.started:
+            return self._normalize_result({
+                'is_correct': 'unknown',
+                'score': 0.0,
+                'reasoning': response_text
+            })
+
+        if not parser.done or parser.errors:
+            return {
+                'is_correct': 'unknown',
+                'score': 0.0,
+                'reasoning': response_text,
+                'error': 'Could not parse response'
+            }
+
+        return self._normalize_result(parser.fields)
+
+    def cache_key(
+        self,
+        candidate_answer: str,
+        question: str,
+        reference_answer: str,
+        evaluation_rubric: Optional[str] = None
+    ) -> str:
+        return EvaluationCache.make_key(
+            question, reference_answer, candidate_answer, evaluation_rubric,
+            self.model_name, PROMPT_VERSION
+        )
+
+    def _store(self, key: Optional[str], result: Dict):
+        if key is not None and result.get('error') is None and result.get('is_correct') != 'unknown':
+            self.cache.put(key, result)
+
+    def evaluate_answer(
+        self,
+        candidate_answer: str,
+        question: str,
+        reference_answer: str,
+        evaluation_rubric: Optional[str] = None
+    ) -> Dict:
+        if not self.available:
+            return {
+                'is_correct': None,
+                'score': 0.0,
+                'reasoning': 'Gemini API not available',
+                'error': 'API not configured'
+            }
+
+        if not candidate_answer or not candidate_answer.strip():
+            return {
+                'is_correct': False,
+                'score': 0.0,
+                'reasoning': 'No answer provided',
+                'error': None
+            }
+
+        key = None
+        if self.cache is not None:
+            key = self.cache_key(candidate_answer, question, reference_answer, evaluation_rubric)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        try:
+            prompt = self._build_prompt(candidate_answer, question, reference_answer, evaluation_rubric)
+
+            response = self._generate(prompt)
+
+            result = self._parse_response(response.text)
+            self._store(key, result)
+            return result
+
+        except Exception as e:
+            return {
+                'is_correct': None,
+                'score': 0.0,
+                'reasoning': str(e),
+                'error': str(e)
+            }
+
+    def evaluate_answer_stream(
+        self,
+        candidate_answer: str,
+        question: str,
+        reference_answer: str,
+        evaluation_rubric: Optional[str] = None,
+        on_field: Optional[Callable[[str, object], None]] = None
+    ) -> Dict:
+        if not self.available or not candidate_answer or not candidate_answer.strip():
+            return self.evaluate_answer(candidate_answer, question, reference_answer, evaluation_rubric)
+
+        key = None
+        if self.cache is not None:
+            key = self.cache_key(candidate_answer, question, reference_answer, evaluation_rubric)
+            cached = self.cache.get(key)
+            if cached is not None:
+                if on_field is not None:
+                    for name in ('is_correct', 'score', 'strengths', 'gaps', 'reasoning'):
+                        on_field(name, cached.get(name))
+                return cached
+
+        try:
+            prompt = self._build_prompt(candidate_answer, question, reference_answer, evaluation_rubric)
+            self._count_request(prompt)
+
+            parser = IncrementalJSONObjectParser()
+            chunks = []
+            for chunk in self.client.models.generate_content_stream(model=self.model_name, contents=prompt):
+                text = chunk.text or ''
+                chunks.append(text)
+                # score and is_correct are published as soon as they close,
+                # while the longer fields are still streaming.
+                for name, value in parser.feed(text):
+                    if on_field is not None:
+                        on_field(name, value)
+
+            result = self._parse_response(''.join(chunks), parser)
+            self._store(key, result)
+            return result
 
         except Exception as e:
             return {
@@ -122,6 +276,93 @@ Respond in JSON format:
                 'error': str(e)
             }
 
+    def _parse_batch_response(self, response_text: str) -> Dict[str, Dict]:
+        start = response_text.find('[')
+        end = response_text.rfind(']')
+        if start < 0 or end < start:
+            return {}
+
+        try:
+            items = json.loads(response_text[start:end + 1])
+        except json.JSONDecodeError:
+            return {}
+
+        parsed = {}
+        for item in items if isinstance(items, list) else []:
+            if not isinstance(item, dict) or 'id' not in item or 'score' not in item:
+                continue
+            try:
+                parsed[str(item['id'])] = self._normalize_result(item)
+            except (TypeError, ValueError):
+                continue
+        return parsed
+
+    def _split_batches(self, items: List, evaluation_rubric: Optional[str], max_prompt_tokens: int) -> List[List]:
+        batches = []
+        current = []
+        for item in items:
+            candidate = current + [item]
+            prompt = self._build_batch_prompt(candidate, evaluation_rubric)
+            if current and self.estimate_tokens(prompt) > max_prompt_tokens:
+                batches.append(current)
+                current = [item]
+            else:
+                current = candidate
+        if current:
+            batches.append(current)
+        return batches
+
+    def evaluate_interview(
+        self,
+        answers: List[Dict],
+        evaluation_rubric: Optional[str] = None,
+        max_prompt_tokens: int = 6000
+    ) -> List[Dict]:
+        results = [None] * len(answers)
+        keys = [None] * len(answers)
+        pending = []
+
+        for i, item in enumerate(answers):
+            candidate_answer = item.get('candidate_answer', '')
+            if not self.available or not candidate_answer or not candidate_answer.strip():
+                results[i] = self.evaluate_answer(
+                    candidate_answer, item.get('question', ''), item.get('reference_answer', ''), evaluation_rubric
+                )
+                continue
+
+            if self.cache is not None:
+                keys[i] = self.cache_key(
+                    candidate_answer, item['question'], item['reference_answer'], evaluation_rubric
+                )
+                cached = self.cache.get(keys[i])
+                if cached is not None:
+                    results[i] = cached
+                    continue
+
+            pending.append((str(i), item))
+
+        for batch in self._split_batches(pending, evaluation_rubric, max_prompt_tokens):
+            parsed = {}
+            if len(batch) > 1:
+                try:
+                    response = self._generate(self._build_batch_prompt(batch, evaluation_rubric))
+                    parsed = self._parse_batch_response(response.text)
+                except Exception:
+                    parsed = {}
+
+            # Items the batch response did not cover are retried one by one.
+            for item_id, item in batch:
+                i = int(item_id)
+                if item_id in parsed:
+                    results[i] = parsed[item_id]
+                    self._store(keys[i], results[i])
+                else:
+                    results[i] = self.evaluate_answer(
+                        item['candidate_answer'], item['question'], item['reference_answer'], evaluation_rubric
+                    )
+
+        return results
+
     def is_available(self):
         return self.available
 
@@ -0,0 +1,157 @@
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+
+_ITEM_PATTERN = re.compile(
+    r"(?:### ITEM (?P<id>\S+)\n)?QUESTION: (?P<question>.*?)\n\n"
+    r"CANDIDATE'S ANSWER:\n(?P<answer>.*?)\n\n"
+    r"REFERENCE/EXPECTED ANSWER:\n(?P<reference>.*?)(?=\n\n|\Z)",
+    re.DOTALL
+)
+
+
+def _words(text):
+    return set(re.findall(r"[a-z']+", text.lower()))
+
+
+def stub_evaluation(answer, reference):
+    answer_words = _words(answer)
+    reference_words = _words(reference)
+    overlap = len(answer_words & reference_words) / max(1, len(reference_words))
+    score = round(min(100.0, 100.0 * overlap * 2), 1)
+
+    if score >= 70:
+        verdict = "yes"
+    elif score >= 30:
+        verdict = "partially"
+    else:
+        verdict = "no"
+
+    return {
+        "is_correct": verdict,
+        "score": score,
+        "strengths": sorted(answer_words & reference_words)[:3],
+        "gaps": sorted(reference_words - answer_words)[:3],
+        "reasoning": f"Covers {overlap:.0%} of the reference terms."
+    }
+
+
+class StubAPIError(Exception):
+
+    def __init__(self, code, message="Injected stub error"):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+class StubResponse:
+
+    def __init__(self, text):
+        self.text = text
+
+
+class StubModels:
+
+    def __init__(self, client):
+        self.client = client
+
+    def generate_content(self, model, contents):
+        delay, error = self.client.plan_call(contents)
+        if delay:
+            time.sleep(delay)
+        if error is not None:
+            raise error
+        return StubResponse(self.client.respond(contents))
+
+    def generate_content_stream(self, model, contents):
+        delay, error = self.client.plan_call(contents)
+        if delay:
+            time.sleep(delay)
+        if error is not None:
+            raise error
+
+        text = self.client.respond(contents)
+        step = self.client.stream_chunk_size
+        for i in range(0, len(text), step):
+            if self.client.stream_delay and i:
+                time.sleep(self.client.stream_delay)
+            yield StubResponse(text[i:i + step])
+
+
+class StubAsyncModels:
+
+    def __init__(self, client):
+        self.client = client
+
+    async def generate_content(self, model, contents):
+        delay, error = self.client.plan_call(contents)
+        if delay:
+            await asyncio.sleep(delay)
+        if error is not None:
+            raise error
+        return StubResponse(self.client.respond(contents))
+
+
+class StubAio:
+
+    def __init__(self, client):
+        self.models = StubAsyncModels(client)
+
+
+class StubGeminiClient:
+
+    def __init__(self, latency=0.0, drop_items=(), latency_jitter=0.0, slow_fraction=0.0,
+                 slow_latency=0.0, error_rate=0.0, error_code=503, seed=0,
+                 stream_chunk_size=16, stream_delay=0.0):
+        self.latency = latency
+        self.stream_chunk_size = stream_chunk_size
+        self.stream_delay = stream_delay
+        self.latency_jitter = latency_jitter
+        self.slow_fraction = slow_fraction
+        self.slow_latency = slow_latency
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.drop_items = set(str(i) for i in drop_items)
+
+        self.calls = 0
+        self.errors = 0
+        self.prompt_chars = 0
+        self.models = StubModels(self)
+        self.aio = StubAio(self)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def plan_call(self, prompt):
+        with self._lock:
+            self.calls += 1
+            self.prompt_chars += len(prompt)
+
+            delay = self.latency + self._rng.uniform(0, self.latency_jitter)
+            if self._rng.random() < self.slow_fraction:
+                delay = self.slow_latency
+
+            error = None
+            if self._rng.random() < self.error_rate:
+                self.errors += 1
+                error = StubAPIError(self.error_code)
+
+        return delay, error
+
+    def respond(self, prompt):
+        items = list(_ITEM_PATTERN.finditer(prompt))
+        if items and items[0].group("id") is not None:
+            results = []
+            for match in items:
+                if match.group("id") in self.drop_items:
+                    continue
+                result = stub_evaluation(match.group("answer"), match.group("reference"))
+                results.append({"id": match.group("id"), **result})
+            return "```json\n" + json.dumps(results, indent=2) + "\n```"
+
+        if not items:
+            return "I could not find an answer to evaluate."
+
+        result = stub_evaluation(items[0].group("answer"), items[0].group("reference"))
+        return "```json\n" + json.dumps(result, indent=2) + "\n```"
\ No newline at end of file
@@ -29,7 +29,8 @@ def main():
 
     interview = InterviewManager(
         model_path="confidence_model.pkl",
-        profile=profile
+        profile=profile,
+        evaluation_cache_path="evaluation_cache.sqlite3"
     )
 
     interview.start_interview(candidate_name)
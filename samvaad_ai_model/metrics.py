@@ -0,0 +1,73 @@
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+import numpy as np
+
+
+class LatencyHistogram:
+
+    BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+    def __init__(self, buckets=BUCKETS, window=1024):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self._recent = deque(maxlen=window)
+
+    def observe(self, seconds):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self._recent.append(seconds)
+
+    def percentile(self, q):
+        if not self._recent:
+            return None
+        return float(np.percentile(self._recent, q))
+
+    def snapshot(self):
+        labels = [f"le_{b:g}" for b in self.buckets] + ["le_inf"]
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'buckets': dict(zip(labels, np.cumsum(self.counts).tolist()))
+        }
+
+
+class RouteMetrics:
+
+    def __init__(self, window=60.0):
+        self.window = window
+        self.latency = LatencyHistogram()
+        self.statuses = {}
+        self._recent = deque()
+        self._lock = threading.Lock()
+
+    def observe(self, status, seconds):
+        now = time.monotonic()
+        with self._lock:
+            self.latency.observe(seconds)
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            self._recent.append(now)
+            while self._recent and self._recent[0] < now - self.window:
+                self._recent.popleft()
+
+    def snapshot(self):
+        now = time.monotonic()
+        with self._lock:
+            while self._recent and self._recent[0] < now - self.window:
+                self._recent.popleft()
+            latency = self.latency.snapshot()
+            return {
+                'requests': self.latency.count,
+                'statuses': {str(k): v for k, v in sorted(self.statuses.items())},
+                'throughput_per_s': len(self._recent) / self.window,
+                'p50': latency['p50'],
+                'p99': latency['p99'],
+                'mean': latency['mean']
+            }
\ No newline at end of file
@@ -1,34 +1,73 @@
 import numpy as np
 import joblib
 import os
+from compiled_forest import CompiledForest
+from feature_defs import FEATURE_NAMES, FEATURE_BOUNDS
+
+
+def _probe_features(n_rows=256, seed=0):
+    rng = np.random.default_rng(seed)
+    low = np.array([FEATURE_BOUNDS[name][0] for name in FEATURE_NAMES], dtype=float)
+    high = np.array([FEATURE_BOUNDS[name][1] for name in FEATURE_NAMES], dtype=float)
+    return rng.uniform(low, high, size=(n_rows, len(FEATURE_NAMES)))
 
 
 class ConfidenceMLScorer:
 
-    def __init__(self, model_path):
+    def __init__(self, model_path, compile_model=True, compiled_max_rows=1000):
         self.model_path = model_path
+        self.compiled_max_rows = compiled_max_rows
         self.model = None
+        self.compiled = None
         self.has_model = False
 
-        if os.path.exists(model_path):
+        if model_path and os.path.exists(model_path):
             try:
                 self.model = joblib.load(model_path)
                 self.has_model = True
             except Exception:
                 pass
 
+        if self.has_model and compile_model:
+            try:
+                compiled = CompiledForest.from_sklearn(self.model)
+                if compiled.max_abs_error(self.model, _probe_features()) <= 1e-9:
+                    self.compiled = compiled
+            except Exception:
+                self.compiled = None
+
+    def _predict(self, feature_matrix):
+        # sklearn's own traversal wins back on very large batches.
+        if self.compiled is not None and len(feature_matrix) <= self.compiled_max_rows:
+            return self.compiled.predict(feature_matrix)
+        return self.model.predict(feature_matrix)
+
     def score(self, features):
         if not self.has_model or self.model is None:
             return None
 
         try:
             features = np.asarray(features, dtype=float)
-            pred = self.model.predict([features])[0]
+            pred = self._predict(features.reshape(1, -1))[0]
             pred_clipped = np.clip(float(pred), 1.0, 5.0)
             confidence = (pred_clipped - 1.0) / 4.0 * 100.0
             return float(confidence)
         except Exception:
             return None
 
+    def score_many(self, feature_matrix):
+        if not self.has_model or self.model is None:
+            return None
+
+        feature_matrix = np.asarray(feature_matrix, dtype=float).reshape(-1, len(FEATURE_NAMES))
+        if len(feature_matrix) == 0:
+            return np.empty(0)
+
+        preds = np.clip(self._predict(feature_matrix), 1.0, 5.0)
+        return (preds - 1.0) / 4.0 * 100.0
+
     def is_available(self):
-        return self.has_model
\ No newline at end of file
+        return self.has_model
+
+    def is_compiled(self):
+        return self.compiled is not None
\ No newline at end of file
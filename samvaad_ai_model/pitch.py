@@ -1,47 +1,87 @@
 import numpy as np
-from scipy import signal
+
+
+class PitchEstimator:
+
+    def __init__(self, min_freq=50, max_freq=320, max_analysis_size=4096, min_size=512, min_power_ratio=3.0):
+        self.min_freq = min_freq
+        self.max_freq = max_freq
+        self.max_analysis_size = max_analysis_size
+        self.min_size = min_size
+        self.min_power_ratio = min_power_ratio
+        self._plans = {}
+
+    def _plan(self, length, sample_rate):
+        key = (length, sample_rate)
+        plan = self._plans.get(key)
+        if plan is not None:
+            return plan
+
+        # Longer frames used to be resampled down to max_analysis_size before
+        # the FFT, which keeps bin k but labels it k * sample_rate / 4096.
+        # Keep that labelling so pitch_std stays on the scale FEATURE_BOUNDS
+        # and confidence_model.pkl were fitted on.
+        analysis_size = min(length, self.max_analysis_size)
+        freqs = np.fft.rfftfreq(analysis_size, 1.0 / sample_rate)
+        band = np.flatnonzero((freqs >= self.min_freq) & (freqs <= self.max_freq))
+
+        if len(band) == 0:
+            plan = (None, None, None)
+        else:
+            plan = (np.hamming(length), slice(band[0], band[-1] + 1), freqs[band])
+
+        self._plans[key] = plan
+        return plan
+
+    def legacy_scale(self, length):
+        # Factor from true Hz to the labelling _plan keeps for frames of this
+        # length: bin k is true k * sample_rate / length, labelled as if the
+        # frame were max_analysis_size long.
+        return length / self.max_analysis_size if length > self.max_analysis_size else 1.0
+
+    def estimate(self, audio, sample_rate=16000):
+        if len(audio) < self.min_size:
+            return 0.0
+
+        return float(self.estimate_batch(np.asarray(audio)[None, :], sample_rate)[0])
+
+    def estimate_batch(self, frames, sample_rate=16000):
+        frames = np.asarray(frames)
+        pitches = np.zeros(len(frames))
+
+        if frames.ndim != 2 or len(frames) == 0 or frames.shape[1] < self.min_size:
+            return pitches
+
+        window, band, band_freqs = self._plan(frames.shape[1], sample_rate)
+        if window is None:
+            return pitches
+
+        # Upcast, centre and window in a single float64 buffer.
+        centered = np.subtract(frames, np.mean(frames, axis=1, keepdims=True, dtype=np.float64), dtype=np.float64)
+        np.multiply(centered, window, out=centered)
+        spectrum = np.abs(np.fft.rfft(centered, axis=1)[:, band])
+
+        peak_idx = np.argmax(spectrum, axis=1)
+        peak_power = spectrum[np.arange(len(frames)), peak_idx]
+
+        avg_power = np.mean(spectrum, axis=1)
+        power_ratio = peak_power / (avg_power + 1e-10)
+
+        voiced = power_ratio >= self.min_power_ratio
+        pitches[voiced] = band_freqs[peak_idx[voiced]]
+        return pitches
+
+
+_default_estimator = PitchEstimator()
+
+
+def legacy_pitch_scale(length):
+    return _default_estimator.legacy_scale(length)
 
 
 def estimate_pitch_fft(audio, sample_rate=16000):
-    if len(audio) < 512:
-        return 0.0
-    
-    audio = np.asarray(audio, dtype=float)
-    audio = audio - np.mean(audio)
-    
-    if len(audio) > 4096:
-        audio = signal.resample(audio, 4096)
-    
-    window = np.hamming(len(audio))
-    audio_windowed = audio * window
-    
-    freqs = np.fft.rfftfreq(len(audio_windowed), 1.0 / sample_rate)
-    spectrum = np.abs(np.fft.rfft(audio_windowed))
-    
-    min_freq = 50
-    max_freq = 320
-    freq_mask = (freqs >= min_freq) & (freqs <= max_freq)
-    
-    if not np.any(freq_mask):
-        return 0.0
-    
-    masked_spectrum = spectrum[freq_mask]
-    masked_freqs = freqs[freq_mask]
-    
-    if len(masked_spectrum) == 0:
-        return 0.0
-    
-    peak_idx = np.argmax(masked_spectrum)
-    peak_freq = masked_freqs[peak_idx]
-    peak_power = masked_spectrum[peak_idx]
-    
-    avg_power = np.mean(masked_spectrum)
-    power_ratio = peak_power / (avg_power + 1e-10)
-    
-    if power_ratio < 3.0:
-        return 0.0
-    
-    if min_freq <= peak_freq <= max_freq:
-        return float(peak_freq)
-    
-    return 0.0
\ No newline at end of file
+    return _default_estimator.estimate(audio, sample_rate)
+
+
+def estimate_pitch_fft_batch(frames, sample_rate=16000):
+    return _default_estimator.estimate_batch(frames, sample_rate)
\ No newline at end of file
@@ -0,0 +1,102 @@
+import numpy as np
+from scipy import fft
+from audioconfig import SAMPLE_RATE
+
+
+class PitchTracker:
+
+    def __init__(self, sample_rate=SAMPLE_RATE, frame_duration=0.04, hop_duration=0.01,
+                 min_freq=50, max_freq=320, threshold=0.15, decimation=2):
+        # F0 tops out at max_freq, so frames are analysed at a reduced rate.
+        self.decimation = decimation
+        self.sample_rate = sample_rate / decimation
+        self.frame_length = int(self.sample_rate * frame_duration)
+        self.hop_length = int(self.sample_rate * hop_duration)
+        self.min_freq = min_freq
+        self.max_freq = max_freq
+        self.threshold = threshold
+
+        self.tau_min = max(2, int(self.sample_rate / max_freq) - 1)
+        self.tau_max = min(int(np.ceil(self.sample_rate / min_freq)), self.frame_length // 2)
+        # Lags up to tau_max only need frame_length + tau_max points to avoid
+        # circular wrap-around in the FFT autocorrelation.
+        self.n_fft = 1 << int(np.ceil(np.log2(self.frame_length + self.tau_max)))
+        self._taus = np.arange(1, self.tau_max + 1, dtype=np.float32)
+
+    def _decimate(self, audio):
+        audio = np.asarray(audio, dtype=np.float32)
+        if self.decimation == 1:
+            return audio
+
+        usable = audio.shape[-1] - audio.shape[-1] % self.decimation
+        blocks = audio[..., :usable].reshape(audio.shape[:-1] + (-1, self.decimation))
+        return blocks.mean(axis=-1)
+
+    def frames(self, audio):
+        audio = self._decimate(audio)
+        if audio.shape[-1] < self.frame_length:
+            return np.empty(audio.shape[:-1] + (0, self.frame_length), dtype=np.float32)
+
+        windows = np.lib.stride_tricks.sliding_window_view(audio, self.frame_length, axis=-1)
+        return windows[..., ::self.hop_length, :]
+
+    def frames_per_chunk(self, chunk_size):
+        chunk_size //= self.decimation
+        if chunk_size < self.frame_length:
+            return 0
+        return (chunk_size - self.frame_length) // self.hop_length + 1
+
+    def track(self, audio):
+        frames = self.frames(audio)
+        f0 = self.track_frames(frames.reshape(-1, self.frame_length))
+        return f0.reshape(frames.shape[:-1])
+
+    def track_frames(self, frames):
+        frames = np.asarray(frames, dtype=np.float32)
+        f0 = np.zeros(len(frames))
+        if len(frames) == 0:
+            return f0
+
+        width = self.frame_length
+        tau_max = self.tau_max
+        frames = frames - np.mean(frames, axis=1, keepdims=True)
+
+        spectrum = fft.rfft(frames, n=self.n_fft, axis=1)
+        acf = fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2, n=self.n_fft, axis=1)
+
+        energy = np.zeros((len(frames), width + 1), dtype=np.float32)
+        np.cumsum(frames * frames, axis=1, out=energy[:, 1:])
+
+        # YIN difference d(tau) = sum_j (x_j - x_{j+tau})^2 over the overlap,
+        # expanded into energies and the autocorrelation.
+        diff = (energy[:, width - 1:width - tau_max - 1:-1] + energy[:, width:width + 1]
+                - energy[:, 1:tau_max + 1] - 2 * acf[:, 1:tau_max + 1])
+        np.maximum(diff, 0, out=diff)
+
+        cumulative = np.cumsum(diff, axis=1)
+        cmnd = diff * self._taus / np.maximum(cumulative, 1e-12)
+
+        lags = cmnd[:, self.tau_min - 1:]
+        below = lags < self.threshold
+        voiced = np.any(below, axis=1) & (energy[:, -1] > 1e-8)
+
+        # First dip under the threshold, then walk down to its local minimum.
+        first = np.argmax(below, axis=1)
+        rising = np.zeros_like(below)
+        rising[:, :-1] = lags[:, 1:] >= lags[:, :-1]
+        rising[:, -1] = True
+        rising &= np.arange(lags.shape[1]) >= first[:, None]
+        best = np.argmax(rising, axis=1)
+
+        rows = np.arange(len(frames))
+        inner = (best > 0) & (best < lags.shape[1] - 1)
+        prev_val = lags[rows, np.maximum(best - 1, 0)]
+        next_val = lags[rows, np.minimum(best + 1, lags.shape[1] - 1)]
+        curv = prev_val - 2 * lags[rows, best] + next_val
+        shift = np.where(inner & (curv > 0), 0.5 * (prev_val - next_val) / np.where(curv > 0, curv, 1), 0.0)
+
+        period = self.tau_min + best + shift
+        freqs = self.sample_rate / period
+        voiced &= (freqs >= self.min_freq) & (freqs <= self.max_freq)
+        f0[voiced] = freqs[voiced]
+        return f0
@@ -0,0 +1,156 @@
+import math
+import threading
+import zlib
+
+from evaluation_cache import normalize_answer
+
+
+STOPWORDS = frozenset("""
+a an the and or but if so of to in on at by for with from as is are was were be been being
+i me my we our you your he she it its they them their this that these those there here
+do does did have has had will would can could should may might must not no yes
+um uh like just really very also about into than then what which who how when where why
+""".split())
+
+_SUFFIXES = (("ies", "y"), ("ing", ""), ("edly", ""), ("ed", ""), ("es", ""), ("ly", ""), ("s", ""))
+
+
+def stem(word):
+    for suffix, replacement in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)] + replacement
+            break
+    if word.endswith("e") and len(word) > 4:
+        word = word[:-1]
+    return word
+
+
+def content_terms(text):
+    return [stem(w) for w in normalize_answer(text).split() if w not in STOPWORDS and len(w) > 1]
+
+
+def hashed_ngrams(terms, n_features, max_n=2):
+    counts = {}
+    for n in range(1, max_n + 1):
+        for i in range(len(terms) - n + 1):
+            gram = " ".join(terms[i:i + n])
+            index = zlib.crc32(gram.encode("utf-8")) % n_features
+            counts[index] = counts.get(index, 0) + 1
+    return counts
+
+
+class AnswerPrescreener:
+
+    def __init__(self, reference_answers, n_features=2 ** 18, max_n=2,
+                 min_terms=1, min_similarity=None, max_overlap=0):
+        self.n_features = n_features
+        self.max_n = max_n
+        self.min_terms = min_terms
+        self.min_similarity = min_similarity
+        self.max_overlap = max_overlap
+
+        self.stats = {'screened': 0, 'skipped_empty': 0, 'skipped_off_topic': 0, 'passed': 0}
+        self._lock = threading.Lock()
+
+        documents = {}
+        for question_id, entry in reference_answers.items():
+            text = f"{entry.get('question', '')} {entry.get('reference_answer', '')}"
+            documents[str(question_id)] = content_terms(text)
+
+        # Smoothed IDF over the reference answers, computed once so screening
+        # an answer is a single pass over its own n-grams.
+        document_frequency = {}
+        for terms in documents.values():
+            for index in hashed_ngrams(terms, n_features, max_n):
+                document_frequency[index] = document_frequency.get(index, 0) + 1
+
+        n_documents = len(documents)
+        self.idf = {
+            index: math.log((1 + n_documents) / (1 + df)) + 1.0
+            for index, df in document_frequency.items()
+        }
+        self.default_idf = math.log(1 + n_documents) + 1.0
+
+        self.index = {}
+        for question_id, terms in documents.items():
+            self.index[question_id] = (self._vectorize(terms), frozenset(terms))
+
+    def _vectorize(self, terms):
+        vector = {
+            index: count * self.idf.get(index, self.default_idf)
+            for index, count in hashed_ngrams(terms, self.n_features, self.max_n).items()
+        }
+        norm = math.sqrt(sum(v * v for v in vector.values()))
+        if norm:
+            for index in vector:
+                vector[index] /= norm
+        return vector
+
+    def similarity(self, question_id, answer_text):
+        entry = self.index.get(str(question_id))
+        if entry is None:
+            return 0.0
+        reference_vector, _ = entry
+        vector = self._vectorize(content_terms(answer_text))
+        return sum(weight * reference_vector.get(index, 0.0) for index, weight in vector.items())
+
+    def _count(self, key):
+        with self._lock:
+            self.stats['screened'] += 1
+            self.stats[key] += 1
+
+    def screen(self, question_id, answer_text):
+        entry = self.index.get(str(question_id))
+        if entry is None:
+            return None
+
+        reference_vector, reference_terms = entry
+        terms = content_terms(answer_text)
+
+        # Only empty answers, filler or a bare "no"/"yes" (all stopwords) are
+        # scored locally by default; short real answers such as "Patience and
+        # empathy." still go to the LLM.
+        if len(terms) < self.min_terms:
+            self._count('skipped_empty')
+            return {
+                'is_correct': 'no',
+                'score': 0.0,
+                'strengths': [],
+                'gaps': ['Answer is too short to evaluate'],
+                'reasoning': 'Pre-screen: no content words.' if self.min_terms == 1
+                             else 'Pre-screen: fewer than %d content words.' % self.min_terms,
+                'error': None,
+                'prescreened': True
+            }
+
+        # On-topic answers often share no words with a single reference answer
+        # ("I am patient, curious and hardworking" for a strengths question),
+        # so the off-topic skip is opt-in: set min_similarity only after
+        # checking it against labelled answers for your question set.
+        if self.min_similarity is None:
+            self._count('passed')
+            return None
+
+        vector = self._vectorize(terms)
+        similarity = sum(weight * reference_vector.get(index, 0.0) for index, weight in vector.items())
+        overlap = len(reference_terms.intersection(terms))
+
+        if overlap <= self.max_overlap and similarity < self.min_similarity:
+            self._count('skipped_off_topic')
+            return {
+                'is_correct': 'no',
+                'score': round(100.0 * similarity, 1),
+                'strengths': [],
+                'gaps': ['Answer does not address the question'],
+                'reasoning': 'Pre-screen: no overlap with the reference answer (similarity %.2f).' % similarity,
+                'error': None,
+                'prescreened': True
+            }
+
+        self._count('passed')
+        return None
+
+    def skip_rate(self):
+        screened = self.stats['screened']
+        skipped = self.stats['skipped_empty'] + self.stats['skipped_off_topic']
+        return skipped / screened if screened else 0.0
\ No newline at end of file
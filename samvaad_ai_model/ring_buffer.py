@@ -0,0 +1,72 @@
+import threading
+import numpy as np
+
+
+class AudioRingBuffer:
+
+    def __init__(self, capacity, dtype=np.float32):
+        self.capacity = int(capacity)
+        self.overruns = 0
+        self._data = np.zeros(self.capacity, dtype=dtype)
+        self._write_pos = 0
+        self._read_pos = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def write(self, block):
+        n = len(block)
+        if n > self.capacity:
+            self.overruns += n - self.capacity
+            block = block[n - self.capacity:]
+            n = self.capacity
+
+        with self._cond:
+            start = self._write_pos % self.capacity
+            first = min(n, self.capacity - start)
+            np.copyto(self._data[start:start + first], block[:first])
+            if first < n:
+                np.copyto(self._data[:n - first], block[first:])
+            self._write_pos += n
+
+            # Drop the oldest samples rather than block the audio callback.
+            overflow = self._write_pos - self._read_pos - self.capacity
+            if overflow > 0:
+                self._read_pos += overflow
+                self.overruns += overflow
+
+            self._cond.notify()
+
+    def read_into(self, out, timeout=None):
+        n = len(out)
+        with self._cond:
+            ready = self._cond.wait_for(
+                lambda: self._closed or self._write_pos - self._read_pos >= n,
+                timeout=timeout
+            )
+            if not ready:
+                return 0
+
+            n = min(n, self._write_pos - self._read_pos)
+            start = self._read_pos % self.capacity
+            first = min(n, self.capacity - start)
+            np.copyto(out[:first], self._data[start:start + first])
+            if first < n:
+                np.copyto(out[first:n], self._data[:n - first])
+            self._read_pos += n
+            return n
+
+    def available(self):
+        with self._cond:
+            return self._write_pos - self._read_pos
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def reset(self):
+        with self._cond:
+            self._write_pos = 0
+            self._read_pos = 0
+            self._closed = False
+            self.overruns = 0
\ No newline at end of file
@@ -0,0 +1,90 @@
+from collections import deque
+
+
+class VoicedWindow:
+
+    def __init__(self, maxlen):
+        self.maxlen = maxlen
+        self.voiced = 0
+        self.transitions = 0
+        self._flags = deque()
+
+    def append(self, flag):
+        flag = bool(flag)
+
+        if len(self._flags) == self.maxlen:
+            oldest = self._flags.popleft()
+            self.voiced -= oldest
+            if self._flags and self._flags[0] != oldest:
+                self.transitions -= 1
+
+        if self._flags and self._flags[-1] != flag:
+            self.transitions += 1
+
+        self._flags.append(flag)
+        self.voiced += flag
+
+    def extend(self, flags):
+        for flag in flags:
+            self.append(flag)
+
+    def clear(self):
+        self._flags.clear()
+        self.voiced = 0
+        self.transitions = 0
+
+    def __len__(self):
+        return len(self._flags)
+
+    def __iter__(self):
+        return iter(self._flags)
+
+
+class RunningWindow:
+
+    def __init__(self, maxlen):
+        self.maxlen = maxlen
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._values = deque()
+
+    def append(self, value):
+        value = float(value)
+
+        if len(self._values) == self.maxlen:
+            self._remove(self._values.popleft())
+
+        self._values.append(value)
+        delta = value - self.mean
+        self.mean += delta / len(self._values)
+        self._m2 += delta * (value - self.mean)
+
+    def _remove(self, value):
+        count = len(self._values)
+        if count == 0:
+            self.mean = 0.0
+            self._m2 = 0.0
+            return
+
+        delta = value - self.mean
+        self.mean -= delta / count
+        self._m2 = max(0.0, self._m2 - delta * (value - self.mean))
+
+    def extend(self, values):
+        for value in values:
+            self.append(value)
+
+    def clear(self):
+        self._values.clear()
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    @property
+    def variance(self):
+        return self._m2 / len(self._values) if self._values else 0.0
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self._values)
\ No newline at end of file
@@ -44,6 +44,10 @@ SCORING_PROFILES = {
             "silence_ratio": -0.80,
             "speech_rate": 0.0,
             "pitch_std": -0.10
+        },
+        "transcript_weights": {
+            "filler_rate": -0.40,
+            "keyword_coverage": 0.30
         }
     },
     
@@ -0,0 +1,446 @@
+import argparse
+import base64
+import io
+import json
+import os
+import re
+import threading
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import numpy as np
+from audio_source import read_wav
+from audioconfig import SAMPLE_RATE
+from confidence_engine import _init_batch_worker, _score_in_worker
+from evaluation_cache import EvaluationCache
+from feature_defs import TRANSCRIPT_FEATURE_NAMES
+from llm_evaluator import LLMEvaluator
+from metrics import RouteMetrics
+from scoring_profiles import SCORING_PROFILES
+from session_manager import SessionLimitReached, SessionManager, SharedModels
+
+MAX_BODY_BYTES = 32 * 1024 * 1024
+
+
+class QueueFull(Exception):
+    pass
+
+
+class BadRequest(Exception):
+    pass
+
+
+class AdmissionControl:
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.inflight = 0
+        self.admitted = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            if self.inflight >= self.limit:
+                self.rejected += 1
+                raise QueueFull()
+            self.inflight += 1
+            self.admitted += 1
+
+    def release(self):
+        with self._lock:
+            self.inflight -= 1
+
+    def submit(self, executor, fn, *args):
+        # The slot is held until the work itself finishes, not until the
+        # caller stops waiting: a request that times out still occupies a
+        # worker, and releasing early would let the queue grow without bound.
+        self.acquire()
+        try:
+            future = executor.submit(fn, *args)
+        except BaseException:
+            self.release()
+            raise
+        future.add_done_callback(lambda _: self.release())
+        return future
+
+    def snapshot(self):
+        with self._lock:
+            return {'limit': self.limit, 'inflight': self.inflight,
+                    'admitted': self.admitted, 'rejected': self.rejected}
+
+
+def decode_audio(body, content_type, query):
+    sample_rate = int(query.get('sample_rate', [SAMPLE_RATE])[0])
+
+    if content_type.startswith('application/json'):
+        payload = json.loads(body or b'{}')
+        return decode_audio_field(payload)
+
+    if content_type in ('audio/wav', 'audio/x-wav', 'audio/wave'):
+        audio, sample_rate = read_wav(io.BytesIO(body))
+    elif content_type in ('application/octet-stream', 'audio/l32f', ''):
+        if len(body) % 4:
+            raise BadRequest("float32 PCM body length must be a multiple of 4")
+        audio = np.frombuffer(body, dtype='<f4')
+    else:
+        raise BadRequest(f"Unsupported content type: {content_type}")
+
+    return audio, sample_rate
+
+
+def decode_audio_field(payload):
+    if payload.get('audio_wav_base64'):
+        return read_wav(io.BytesIO(base64.b64decode(payload['audio_wav_base64'])))
+    if payload.get('audio_f32_base64'):
+        audio = np.frombuffer(base64.b64decode(payload['audio_f32_base64']), dtype='<f4')
+        return audio, int(payload.get('sample_rate', SAMPLE_RATE))
+    return None, None
+
+
+def public_result(result):
+    return {k: v for k, v in result.items() if not isinstance(v, np.ndarray)}
+
+
+class ScoringService:
+
+    def __init__(self, model_path="confidence_model.pkl", profile="balanced", workers=None,
+                 max_queue=32, max_evaluations=64, max_transcriptions=16, request_timeout=30.0,
+                 llm_evaluator=None, stt=None, reference_path="reference_answers.json",
+                 session_ttl=1800.0, max_sessions=10000, evaluation_cache_path=None):
+        self.model_path = model_path
+        self.profile = profile
+        self.workers = workers or os.cpu_count() or 1
+        self.request_timeout = request_timeout
+
+        self.score_admission = AdmissionControl(self.workers + max_queue)
+        self.evaluate_admission = AdmissionControl(max_evaluations)
+        self.transcribe_admission = AdmissionControl(max_transcriptions)
+        self.metrics_by_route = {}
+        self.started_at = time.time()
+
+        # Audio is scored in the worker processes, so the shared models here
+        # skip loading the ML model.
+        shared = SharedModels(model_path=None, reference_path=reference_path,
+                              llm_evaluator=llm_evaluator, stt=stt,
+                              evaluation_cache_path=evaluation_cache_path)
+        self.reference_answers = shared.reference_answers
+        self.prescreener = shared.prescreener
+        self.transcript_analyzer = shared.transcript_analyzer
+        self.shared = shared
+        self.llm_evaluator = shared.llm_evaluator
+        self.stt = stt
+        self.io_executor = ThreadPoolExecutor(max_workers=max_evaluations + max_transcriptions)
+
+        self.sessions = SessionManager(shared, idle_ttl=session_ttl, max_sessions=max_sessions,
+                                       default_profile=profile)
+        self.pool = None
+
+    def start(self):
+        # Every worker loads the model pickle and profiles once in the
+        # initializer; the empty clips make the pool spawn them up front.
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_batch_worker,
+            initargs=(self.model_path, self.profile, SCORING_PROFILES, SAMPLE_RATE)
+        )
+        warmups = [self.pool.submit(_score_in_worker, i, np.zeros(0, dtype=np.float32)) for i in range(self.workers)]
+        for future in warmups:
+            future.result()
+        return self
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+        self.io_executor.shutdown()
+
+    def record(self, route, status, seconds):
+        metrics = self.metrics_by_route.get(route)
+        if metrics is None:
+            metrics = self.metrics_by_route.setdefault(route, RouteMetrics())
+        metrics.observe(status, seconds)
+
+    def score(self, audio, sample_rate=SAMPLE_RATE, profile=None):
+        if sample_rate != SAMPLE_RATE:
+            raise BadRequest(f"sample_rate must be {SAMPLE_RATE}")
+        if profile is not None and profile not in SCORING_PROFILES:
+            raise BadRequest(f"Unknown profile: {profile}")
+
+        audio = np.asarray(audio, dtype=np.float32)
+        future = self.score_admission.submit(self.pool, _score_in_worker, 0, audio, profile or self.profile)
+        _, result = future.result(timeout=self.request_timeout)
+        return public_result(result)
+
+    def transcribe(self, audio):
+        future = self.transcribe_admission.submit(self.io_executor, self.stt.transcribe, audio)
+        return future.result(timeout=self.request_timeout)
+
+    def _analyze(self, question_id, text):
+        if question_id is None or not text:
+            return None
+        analysis = self.transcript_analyzer.analyze(question_id, text)
+        return {name: analysis[name] for name in TRANSCRIPT_FEATURE_NAMES}, analysis
+
+    def _call_llm(self, fn, *args):
+        future = self.evaluate_admission.submit(self.io_executor, fn, *args)
+        return future.result(timeout=self.request_timeout)
+
+    def evaluate(self, payload):
+        question_id = payload.get('question_id')
+        candidate_answer = payload.get('candidate_answer') or payload.get('transcript') or ''
+        reference_answer = payload.get('reference_answer')
+
+        if question_id is not None:
+            reference = self.reference_answers.get(str(question_id), {})
+            reference_answer = reference_answer or reference.get('reference_answer')
+        if not reference_answer:
+            raise BadRequest("reference_answer or a known question_id is required")
+
+        evaluation = self.shared.evaluate(
+            question_id, payload.get('question', ''), candidate_answer,
+            reference_answer=reference_answer, rubric=payload.get('rubric'), call=self._call_llm
+        )
+
+        response = {'evaluation': evaluation}
+        analyzed = self._analyze(question_id, candidate_answer)
+        if analyzed is not None:
+            response['transcript_features'], response['transcript_analysis'] = analyzed
+        return response
+
+    def interview_answer(self, interview_id, payload):
+        question_number = payload.get('question_number')
+        if question_number is None:
+            raise BadRequest("question_number is required")
+        try:
+            question_number = int(question_number)
+        except (TypeError, ValueError):
+            raise BadRequest("question_number must be an integer")
+        profile = payload.get('profile')
+        try:
+            scoring_profile = self.sessions.profile_for(interview_id, profile)
+        except ValueError as e:
+            raise BadRequest(str(e))
+        # A full manager would only refuse the answer after it was scored,
+        # transcribed and evaluated.
+        try:
+            self.sessions.check_capacity(interview_id)
+        except SessionLimitReached:
+            raise QueueFull()
+
+        audio, sample_rate = decode_audio_field(payload)
+        score = None
+        if audio is not None:
+            score = self.score(audio, sample_rate, scoring_profile)
+
+        transcript = payload.get('transcript')
+        if transcript is None and audio is not None and self.stt is not None:
+            transcript = self.transcribe(audio).get('text', '')
+
+        evaluation = None
+        transcript_features = None
+        if transcript:
+            evaluated = self.evaluate({
+                'question_id': question_number,
+                'question': payload.get('question_text', ''),
+                'candidate_answer': transcript
+            })
+            evaluation = evaluated['evaluation']
+            if 'transcript_features' in evaluated:
+                transcript_features = evaluated['transcript_features']
+                self.shared.apply_transcript(score, scoring_profile, transcript_features)
+
+        try:
+            answer, summary = self.sessions.record(
+                interview_id, question_number, profile=profile,
+                question_text=payload.get('question_text', ''), transcript=transcript, score=score,
+                evaluation=evaluation, transcript_features=transcript_features
+            )
+        except SessionLimitReached:
+            raise QueueFull()
+        return {'answer': answer, 'summary': summary}
+
+    def interview_summary(self, interview_id):
+        return self.sessions.summary(interview_id, detail=True)
+
+    def metrics(self):
+        return {
+            'uptime_s': time.time() - self.started_at,
+            'workers': self.workers,
+            'admission': {
+                'score': self.score_admission.snapshot(),
+                'evaluate': self.evaluate_admission.snapshot(),
+                'transcribe': self.transcribe_admission.snapshot()
+            },
+            'routes': {route: m.snapshot() for route, m in list(self.metrics_by_route.items())},
+            'interviews': self.sessions.metrics(),
+            'llm_usage': dict(getattr(self.llm_evaluator, 'usage', {})),
+            'prescreen': dict(self.prescreener.stats)
+        }
+
+
+_INTERVIEW_ANSWER = re.compile(r"^/interview/([\w\-]+)/answer$")
+_INTERVIEW = re.compile(r"^/interview/([\w\-]+)$")
+_ROUTES = ('/score', '/evaluate', '/metrics', '/health')
+
+
+def route_label(path):
+    if path in _ROUTES:
+        return path
+    if _INTERVIEW_ANSWER.match(path):
+        return '/interview/{id}/answer'
+    if _INTERVIEW.match(path):
+        return '/interview/{id}'
+    return 'other'
+
+
+class ScoringRequestHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload, default=float).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+        return status
+
+    def _body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_BODY_BYTES:
+            raise BadRequest("Request body too large")
+        return self.rfile.read(length) if length else b''
+
+    def _json(self, body):
+        try:
+            payload = json.loads(body or b'{}')
+        except ValueError:
+            raise BadRequest("Body must be JSON")
+        if not isinstance(payload, dict):
+            raise BadRequest("Body must be a JSON object")
+        return payload
+
+    def _dispatch(self, method):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        service = self.server.service
+
+        if method == 'GET' and url.path == '/metrics':
+            return self._send(200, service.metrics())
+        if method == 'GET' and url.path == '/health':
+            return self._send(200, {'status': 'ok'})
+
+        if method == 'GET':
+            match = _INTERVIEW.match(url.path)
+            if match:
+                summary = service.interview_summary(match.group(1))
+                if summary is None:
+                    return self._send(404, {'error': 'Unknown interview'})
+                return self._send(200, summary)
+
+        if method == 'POST':
+            body = self._body()
+            if url.path == '/score':
+                content_type = (self.headers.get('Content-Type') or '').split(';')[0].strip()
+                audio, sample_rate = decode_audio(body, content_type, query)
+                if audio is None:
+                    raise BadRequest("No audio in request")
+                profile = query.get('profile', [None])[0]
+                return self._send(200, service.score(audio, sample_rate, profile))
+
+            if url.path == '/evaluate':
+                return self._send(200, service.evaluate(self._json(body)))
+
+            match = _INTERVIEW_ANSWER.match(url.path)
+            if match:
+                return self._send(200, service.interview_answer(match.group(1), self._json(body)))
+
+        return self._send(404, {'error': f'No route for {method} {url.path}'})
+
+    def _handle(self, method):
+        start = time.perf_counter()
+        try:
+            status = self._dispatch(method)
+        except QueueFull:
+            status = self._send(429, {'error': 'Server busy, retry later'}, {'Retry-After': '1'})
+        except (BadRequest, ValueError, wave.Error, EOFError) as e:
+            status = self._send(400, {'error': str(e) or f"Invalid request body ({type(e).__name__})"})
+        except FutureTimeoutError:
+            status = self._send(504, {'error': 'Timed out'})
+        except Exception as e:
+            status = self._send(500, {'error': str(e)})
+        self.server.service.record(route_label(urlparse(self.path).path), status, time.perf_counter() - start)
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+
+class ScoringHTTPServer(ThreadingHTTPServer):
+
+    # socketserver's default listen backlog of 5 resets connections under
+    # bursts long before the admission queue would answer 429.
+    request_queue_size = 128
+    daemon_threads = True
+
+
+def make_server(service, host="127.0.0.1", port=8765, verbose=False):
+    server = ScoringHTTPServer((host, port), ScoringRequestHandler)
+    server.service = service
+    server.verbose = verbose
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP scoring service for confidence scoring and answer evaluation")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--model", default="confidence_model.pkl")
+    parser.add_argument("--profile", default="balanced", choices=sorted(SCORING_PROFILES))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-queue", type=int, default=32)
+    parser.add_argument("--llm", choices=["gemini", "stub"], default="gemini")
+    parser.add_argument("--stt", choices=["none", "google", "local", "fake"], default="none")
+    parser.add_argument("--evaluation-cache", help="SQLite file for cached LLM evaluations (default: memory only)")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    llm_evaluator = None
+    if args.llm == "stub":
+        from llm_stub import StubGeminiClient
+        llm_evaluator = LLMEvaluator(client=StubGeminiClient(), cache=EvaluationCache(path=args.evaluation_cache))
+
+    stt = None
+    if args.stt != "none":
+        from speech_to_text import SpeechToTextConverter
+        from stt_backends import make_stt_backend
+        stt = SpeechToTextConverter(sample_rate=SAMPLE_RATE, backend=make_stt_backend(args.stt))
+
+    service = ScoringService(args.model, args.profile, workers=args.workers, max_queue=args.max_queue,
+                             llm_evaluator=llm_evaluator, stt=stt,
+                             evaluation_cache_path=args.evaluation_cache).start()
+    server = make_server(service, args.host, args.port, args.verbose)
+    print(f"Scoring service on http://{args.host}:{args.port} ({service.workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
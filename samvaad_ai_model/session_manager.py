@@ -0,0 +1,380 @@
+import math
+import threading
+import time
+import uuid
+from array import array
+from collections import OrderedDict
+import numpy as np
+from audioconfig import SAMPLE_RATE
+from confidence_engine import ConfidenceEngine
+from evaluation_cache import EvaluationCache
+from feature_defs import FEATURE_NAMES, TRANSCRIPT_FEATURE_NAMES
+from llm_evaluator import LLMEvaluator, load_reference_answers
+from ml_scorer import ConfidenceMLScorer
+from prescreen import AnswerPrescreener
+from scoring_profiles import SCORING_PROFILES
+from transcript_analyzer import TranscriptAnalyzer
+
+NAN = float('nan')
+
+# Per-answer slots in InterviewSession.scores.
+_CONFIDENCE, _ML_CONFIDENCE, _DURATION, _EVALUATION = range(4)
+_N_SCORES = 4
+_N_FEATURES = len(FEATURE_NAMES)
+_N_TRANSCRIPT = len(TRANSCRIPT_FEATURE_NAMES)
+_PROFILE_NAMES = tuple(SCORING_PROFILES)
+_N_PROFILES = len(_PROFILE_NAMES)
+
+
+class SessionLimitReached(Exception):
+    pass
+
+
+def _optional(value):
+    return None if math.isnan(value) else value
+
+
+class SharedModels:
+
+    # Everything here is loaded once per process and only read by sessions.
+    def __init__(self, model_path="confidence_model.pkl", reference_path="reference_answers.json",
+                 llm_evaluator=None, stt=None, prescreen=True, sample_rate=SAMPLE_RATE,
+                 evaluation_cache_path=None):
+        self.ml_scorer = ConfidenceMLScorer(model_path)
+        self.reference_answers = load_reference_answers(reference_path)
+        self.prescreener = AnswerPrescreener(self.reference_answers) if prescreen else None
+        self.transcript_analyzer = TranscriptAnalyzer(self.reference_answers)
+        self.llm_evaluator = llm_evaluator or LLMEvaluator(
+            cache=EvaluationCache(path=evaluation_cache_path)
+        )
+        self.stt = stt
+        self.sample_rate = sample_rate
+        self._local = threading.local()
+
+    def engine(self, profile):
+        # A ConfidenceEngine's feature engine is scratch space, reset for every
+        # clip, so one engine per thread (sharing the loaded model) serves any
+        # number of sessions.
+        engine = getattr(self._local, 'engine', None)
+        if engine is None:
+            engine = self._local.engine = ConfidenceEngine(
+                None, profile, SCORING_PROFILES, self.sample_rate, ml_scorer=self.ml_scorer
+            )
+        elif engine.profile_name != profile:
+            engine.switch_profile(profile)
+        return engine
+
+    def score_audio(self, audio, profile):
+        return self.engine(profile).score_audio(audio)
+
+    def apply_transcript(self, score, profile, transcript_features):
+        return self.engine(profile).apply_transcript(score, transcript_features)
+
+    def evaluate(self, question_number, question_text, transcript, reference_answer=None,
+                 rubric=None, call=None):
+        # Prescreen, then the LLM. call runs the LLM request; the HTTP service
+        # passes one that goes through its admission control.
+        reference = self.reference_answers.get(str(question_number), {})
+        reference_text = reference_answer or reference.get('reference_answer', '')
+        if not transcript or not reference_text or not self.llm_evaluator.is_available():
+            return None
+
+        if self.prescreener is not None and question_number is not None:
+            local = self.prescreener.screen(question_number, transcript)
+            if local is not None:
+                return local
+
+        args = (transcript, question_text or reference.get('question', ''), reference_text, rubric)
+        if call is None:
+            return self.llm_evaluator.evaluate_answer(*args)
+        return call(self.llm_evaluator.evaluate_answer, *args)
+
+
+class InterviewSession:
+
+    # Numbers live in typed arrays (a few dozen bytes per answer); only the
+    # texts and evaluation dicts are Python objects.
+    __slots__ = ('session_id', 'candidate_name', 'profile', 'created', 'last_active',
+                 'questions', 'timestamps', 'scores', 'features', 'profile_scores',
+                 'transcript_features', 'texts', 'evaluations')
+
+    def __init__(self, session_id, candidate_name="", profile="balanced", now=None):
+        now = time.time() if now is None else now
+        self.session_id = session_id
+        self.candidate_name = candidate_name
+        self.profile = profile
+        self.created = now
+        self.last_active = now
+
+        self.questions = array('i')
+        self.timestamps = array('d')
+        self.scores = array('d')
+        self.features = array('f')
+        self.profile_scores = array('f')
+        self.transcript_features = array('d')
+        self.texts = []
+        self.evaluations = []
+
+    def __len__(self):
+        return len(self.questions)
+
+    def _slot(self, question_number):
+        # Answering a question again replaces the earlier answer.
+        try:
+            return self.questions.index(question_number)
+        except ValueError:
+            self.questions.append(question_number)
+            self.timestamps.append(0.0)
+            self.scores.extend((NAN,) * _N_SCORES)
+            self.features.extend((NAN,) * _N_FEATURES)
+            self.profile_scores.extend((NAN,) * _N_PROFILES)
+            self.transcript_features.extend((NAN,) * _N_TRANSCRIPT)
+            self.texts.append(None)
+            self.evaluations.append(None)
+            return len(self.questions) - 1
+
+    def record(self, question_number, question_text="", transcript="", score=None,
+               evaluation=None, transcript_features=None, now=None):
+        now = time.time() if now is None else now
+        i = self._slot(int(question_number))
+        self.timestamps[i] = now
+        self.texts[i] = (question_text or '', transcript or '')
+        self.evaluations[i] = evaluation
+
+        scores = [NAN] * _N_SCORES
+        features = [NAN] * _N_FEATURES
+        profile_scores = [NAN] * _N_PROFILES
+        if score is not None:
+            scores[_CONFIDENCE] = score['confidence']
+            scores[_ML_CONFIDENCE] = NAN if score['ml_confidence'] is None else score['ml_confidence']
+            scores[_DURATION] = score['audio_duration']
+            if score['features']:
+                features = [score['features'][name] for name in FEATURE_NAMES]
+            if score.get('profile_scores'):
+                profile_scores = [score['profile_scores'][name] for name in _PROFILE_NAMES]
+        if evaluation is not None and evaluation.get('score') is not None:
+            scores[_EVALUATION] = evaluation['score']
+        self.scores[i * _N_SCORES:(i + 1) * _N_SCORES] = array('d', scores)
+        self.features[i * _N_FEATURES:(i + 1) * _N_FEATURES] = array('f', features)
+        self.profile_scores[i * _N_PROFILES:(i + 1) * _N_PROFILES] = array('f', profile_scores)
+
+        transcript_values = [NAN] * _N_TRANSCRIPT
+        if transcript_features is not None:
+            transcript_values = [transcript_features[name] for name in TRANSCRIPT_FEATURE_NAMES]
+        self.transcript_features[i * _N_TRANSCRIPT:(i + 1) * _N_TRANSCRIPT] = array('d', transcript_values)
+
+        self.last_active = now
+        return self.answer(i)
+
+    def answer(self, i):
+        question_text, transcript = self.texts[i]
+        scores = self.scores[i * _N_SCORES:(i + 1) * _N_SCORES]
+        answer = {
+            'question_number': self.questions[i],
+            'question_text': question_text,
+            'transcript': transcript,
+            'timestamp': self.timestamps[i],
+        }
+
+        if not math.isnan(scores[_DURATION]):
+            features = self.features[i * _N_FEATURES:(i + 1) * _N_FEATURES]
+            detected = not math.isnan(features[0])
+            answer.update({
+                'confidence_score': scores[_CONFIDENCE],
+                'ml_confidence': _optional(scores[_ML_CONFIDENCE]),
+                'speech_duration': scores[_DURATION],
+                'speech_detected': detected,
+                'speech_features': dict(zip(FEATURE_NAMES, features)) if detected else None,
+            })
+            profile_scores = self.profile_scores[i * _N_PROFILES:(i + 1) * _N_PROFILES]
+            if not math.isnan(profile_scores[0]):
+                answer['profile_scores'] = dict(zip(_PROFILE_NAMES, profile_scores))
+
+        if self.evaluations[i] is not None:
+            answer['evaluation'] = self.evaluations[i]
+
+        transcript_values = self.transcript_features[i * _N_TRANSCRIPT:(i + 1) * _N_TRANSCRIPT]
+        if not math.isnan(transcript_values[0]):
+            answer['transcript_features'] = dict(zip(TRANSCRIPT_FEATURE_NAMES, transcript_values))
+        return answer
+
+    def answers(self):
+        return [self.answer(i) for i in range(len(self))]
+
+    def summary(self):
+        scores = np.frombuffer(self.scores, dtype=np.float64).reshape(-1, _N_SCORES)
+        confidences = scores[:, _CONFIDENCE][~np.isnan(scores[:, _CONFIDENCE])]
+        evaluations = scores[:, _EVALUATION][~np.isnan(scores[:, _EVALUATION])]
+        return {
+            'interview_id': self.session_id,
+            'candidate_name': self.candidate_name,
+            'profile': self.profile,
+            'answers': len(self),
+            'average_confidence': float(np.mean(confidences)) if len(confidences) else None,
+            'average_evaluation': float(np.mean(evaluations)) if len(evaluations) else None
+        }
+
+
+class SessionManager:
+
+    def __init__(self, shared=None, idle_ttl=1800.0, max_sessions=10000, default_profile="balanced"):
+        self.shared = shared or SharedModels()
+        self.idle_ttl = idle_ttl
+        self.max_sessions = max_sessions
+        self.default_profile = default_profile
+
+        # Ordered by last activity, so expired sessions are always at the
+        # front and eviction never scans live ones.
+        self.sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {'created': 0, 'ended': 0, 'evicted': 0, 'rejected': 0}
+
+    def _evict_idle(self, now):
+        cutoff = now - self.idle_ttl
+        evicted = 0
+        while self.sessions:
+            session = next(iter(self.sessions.values()))
+            if session.last_active >= cutoff:
+                break
+            self.sessions.popitem(last=False)
+            evicted += 1
+        self.counters['evicted'] += evicted
+        return evicted
+
+    def evict_idle(self, now=None):
+        with self._lock:
+            return self._evict_idle(time.time() if now is None else now)
+
+    def _create(self, session_id, candidate_name, profile, now):
+        if profile not in SCORING_PROFILES:
+            raise ValueError(f"Unknown profile: {profile}")
+        if len(self.sessions) >= self.max_sessions:
+            self.counters['rejected'] += 1
+            raise SessionLimitReached()
+
+        session = InterviewSession(session_id, candidate_name, profile, now)
+        self.sessions[session_id] = session
+        self.counters['created'] += 1
+        return session
+
+    def create(self, candidate_name="", profile=None, session_id=None, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            self._evict_idle(now)
+            session_id = session_id or uuid.uuid4().hex
+            if session_id in self.sessions:
+                raise ValueError(f"Session already exists: {session_id}")
+            return self._create(session_id, candidate_name, profile or self.default_profile, now)
+
+    def check_capacity(self, session_id, now=None):
+        # Raises SessionLimitReached if an answer for session_id could not be
+        # recorded now, so callers can refuse it before doing any work.
+        now = time.time() if now is None else now
+        with self._lock:
+            if session_id in self.sessions:
+                return
+            self._evict_idle(now)
+            if len(self.sessions) >= self.max_sessions:
+                self.counters['rejected'] += 1
+                raise SessionLimitReached()
+
+    def profile_for(self, session_id, profile=None):
+        # The profile an answer is scored with: the one it names, else the
+        # session's, else the default.
+        if profile is not None:
+            if profile not in SCORING_PROFILES:
+                raise ValueError(f"Unknown profile: {profile}")
+            return profile
+        with self._lock:
+            session = self.sessions.get(session_id)
+            return session.profile if session is not None else self.default_profile
+
+    def get(self, session_id, create=False, profile=None, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            self._evict_idle(now)
+            session = self.sessions.get(session_id)
+            if session is None:
+                if not create:
+                    return None
+                return self._create(session_id, "", profile or self.default_profile, now)
+
+            session.last_active = now
+            self.sessions.move_to_end(session_id)
+            return session
+
+    def record(self, session_id, question_number, profile=None, now=None, **answer):
+        # Creates the session on its first answer; an answer naming a profile
+        # switches the session to it.
+        now = time.time() if now is None else now
+        if profile is not None and profile not in SCORING_PROFILES:
+            raise ValueError(f"Unknown profile: {profile}")
+        with self._lock:
+            session = self.sessions.get(session_id)
+            if session is None:
+                self._evict_idle(now)
+                session = self._create(session_id, "", profile or self.default_profile, now)
+            elif profile is not None:
+                session.profile = profile
+            result = session.record(question_number, now=now, **answer)
+            self.sessions.move_to_end(session_id)
+            return result, session.summary()
+
+    def submit(self, session_id, question_number, question_text="", audio=None, transcript=None,
+               sample_rate=SAMPLE_RATE, profile=None):
+        # Like record, creates the session on its first answer.
+        if audio is not None and sample_rate != self.shared.sample_rate:
+            raise ValueError(f"sample_rate must be {self.shared.sample_rate}")
+        scoring_profile = self.profile_for(session_id, profile)
+        self.check_capacity(session_id)
+
+        # Scoring, STT and evaluation run outside the manager lock; only the
+        # final write into the session is serialized.
+        shared = self.shared
+        score = None
+        if audio is not None:
+            audio = np.asarray(audio, dtype=np.float32)
+            score = shared.score_audio(audio, scoring_profile)
+            if transcript is None and shared.stt is not None:
+                transcript = shared.stt.transcribe(audio).get('text', '')
+
+        evaluation = None
+        transcript_features = None
+        if transcript:
+            evaluation = shared.evaluate(question_number, question_text, transcript)
+            analysis = shared.transcript_analyzer.analyze(question_number, transcript)
+            transcript_features = {name: analysis[name] for name in TRANSCRIPT_FEATURE_NAMES}
+            shared.apply_transcript(score, scoring_profile, transcript_features)
+
+        answer, _ = self.record(
+            session_id, question_number, profile=profile,
+            question_text=question_text, transcript=transcript, score=score,
+            evaluation=evaluation, transcript_features=transcript_features
+        )
+        return answer
+
+    def summary(self, session_id, detail=False):
+        with self._lock:
+            session = self.sessions.get(session_id)
+            if session is None:
+                return None
+            summary = session.summary()
+            if detail:
+                summary['detail'] = session.answers()
+            return summary
+
+    def end(self, session_id):
+        with self._lock:
+            session = self.sessions.pop(session_id, None)
+            if session is None:
+                return None
+            self.counters['ended'] += 1
+            return {**session.summary(), 'detail': session.answers()}
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def metrics(self):
+        with self._lock:
+            return {'active': len(self.sessions), 'idle_ttl_s': self.idle_ttl,
+                    'max_sessions': self.max_sessions, **self.counters}
\ No newline at end of file
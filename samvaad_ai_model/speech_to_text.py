@@ -1,49 +1,41 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import speech_recognition as sr
 import numpy as np
-import io
-import wave
+from stt_backends import GoogleSTTBackend, numpy_to_wav_bytes
+from utterance_segmenter import UtteranceSegmenter
 
 
 class SpeechToTextConverter:
 
-    def __init__(self, sample_rate=16000):
+    def __init__(self, sample_rate=16000, backend=None, segmented=False, max_workers=4, min_pause=0.5):
+        self.backend = None
         try:
-            self.recognizer = sr.Recognizer()
-            self.sample_rate = sample_rate
-            self.available = True
-        except Exception as e:
+            self.backend = backend or GoogleSTTBackend()
+            self.recognizer = getattr(self.backend, 'recognizer', None)
+            self.available = self.backend.is_available()
+        except Exception:
             self.available = False
 
-    def _numpy_to_wav_bytes(self, audio_np):
-        audio_np = np.asarray(audio_np, dtype=np.float32)
-        max_val = np.max(np.abs(audio_np))
-        if max_val > 0:
-            audio_np = audio_np / max_val
-        audio_int16 = (audio_np * 32767).astype(np.int16)
-
-        buf = io.BytesIO()
-        with wave.open(buf, 'wb') as wf:
-            wf.setnchannels(1)
-            wf.setsampwidth(2)
-            wf.setframerate(self.sample_rate)
-            wf.writeframes(audio_int16.tobytes())
-        buf.seek(0)
-        return buf
+        self.sample_rate = sample_rate
+        self.segmented = segmented
+        self.max_workers = max_workers
+        self.min_pause = min_pause
+        self._executor = None
+        self._lock = threading.Lock()
 
-    def transcribe(self, audio):
-        if not self.available:
-            return {'text': '', 'confidence': 0.0, 'error': 'API not available'}
+    def _numpy_to_wav_bytes(self, audio_np):
+        return numpy_to_wav_bytes(audio_np, self.sample_rate)
 
-        if audio is None or len(audio) == 0:
-            return {'text': '', 'confidence': 0.0, 'error': 'No audio'}
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            return self._executor
 
+    def _transcribe_single(self, audio):
         try:
-            wav_buf = self._numpy_to_wav_bytes(audio)
-
-            with sr.AudioFile(wav_buf) as source:
-                audio_data = self.recognizer.record(source)
-
-            text = self.recognizer.recognize_google(audio_data)
+            text = self.backend.run(audio, self.sample_rate)
 
             return {
                 'text': text.strip(),
@@ -70,5 +62,94 @@ class SpeechToTextConverter:
                 'error': str(e)
             }
 
+    def transcribe(self, audio):
+        if not self.available:
+            return {'text': '', 'confidence': 0.0, 'error': 'API not available'}
+
+        if audio is None or len(audio) == 0:
+            return {'text': '', 'confidence': 0.0, 'error': 'No audio'}
+
+        if self.segmented:
+            return self.transcribe_segmented(audio)
+
+        return self._transcribe_single(audio)
+
+    def _stitch(self, results):
+        texts = [r['text'] for r in results if r['text']]
+        if not texts:
+            errors = [r['error'] for r in results if r['error']]
+            return {
+                'text': '',
+                'confidence': 0.0,
+                'error': errors[0] if errors else 'Could not understand audio',
+                'segments': len(results)
+            }
+
+        return {
+            'text': ' '.join(texts),
+            'confidence': float(np.mean([r['confidence'] for r in results if r['text']])),
+            'error': None,
+            'segments': len(results)
+        }
+
+    def transcribe_segmented(self, audio):
+        if not self.available:
+            return {'text': '', 'confidence': 0.0, 'error': 'API not available'}
+
+        if audio is None or len(audio) == 0:
+            return {'text': '', 'confidence': 0.0, 'error': 'No audio'}
+
+        segments = UtteranceSegmenter(self.sample_rate, min_pause=self.min_pause).split(audio)
+        if len(segments) <= 1:
+            return self._transcribe_single(audio)
+
+        executor = self._get_executor()
+        futures = [executor.submit(self._transcribe_single, segment['audio']) for segment in segments]
+        return self._stitch([future.result() for future in futures])
+
+    def start_stream(self):
+        return StreamingTranscription(self)
+
     def is_available(self):
         return self.available
+
+    def metrics(self):
+        return self.backend.metrics() if self.backend is not None else {}
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+        if self.backend is not None:
+            self.backend.close()
+
+
+class StreamingTranscription:
+
+    def __init__(self, converter):
+        self.converter = converter
+        self.segmenter = UtteranceSegmenter(converter.sample_rate, min_pause=converter.min_pause)
+        self.futures = []
+
+    def _submit(self, segments):
+        executor = self.converter._get_executor()
+        for segment in segments:
+            self.futures.append(executor.submit(self.converter._transcribe_single, segment['audio']))
+
+    def push(self, audio):
+        # Finished utterances are sent off while the candidate keeps talking.
+        self._submit(self.segmenter.push(audio))
+
+    def finish(self, audio=None):
+        # audio is the full recording (the recorder's buffer), only read when
+        # no utterance was found and the whole answer is sent as one request.
+        if not self.converter.is_available():
+            return {'text': '', 'confidence': 0.0, 'error': 'API not available'}
+
+        self._submit(self.segmenter.flush())
+
+        if not self.futures:
+            return self.converter.transcribe(audio)
+
+        return self.converter._stitch([future.result() for future in self.futures])
\ No newline at end of file
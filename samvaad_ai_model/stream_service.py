@@ -0,0 +1,249 @@
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from urllib.parse import parse_qs, urlparse
+import numpy as np
+from websockets.asyncio.server import serve
+from websockets.exceptions import ConnectionClosed, ConnectionClosedOK
+from audioconfig import SAMPLE_RATE
+from ml_scorer import ConfidenceMLScorer
+from scoring_profiles import SCORING_PROFILES
+from streaming_scorer import StreamingConfidenceScorer
+
+PCM_FORMATS = {'f32': np.dtype('<f4'), 's16': np.dtype('<i2')}
+
+
+class StreamSession:
+
+    def __init__(self, profile_config, ml_scorer, sample_rate=SAMPLE_RATE, pcm_format='f32',
+                 score_every=2, max_buffered_frames=64):
+        self.scorer = StreamingConfidenceScorer(profile_config, ml_scorer=ml_scorer, sample_rate=sample_rate)
+        self.chunk_size = self.scorer.feature_engine.chunk_size
+        self.dtype = PCM_FORMATS[pcm_format]
+        self.score_every = score_every
+
+        # Drop-oldest: a slow consumer loses stale audio, never the newest.
+        self.frames = deque(maxlen=max_buffered_frames)
+        self.frame_ready = asyncio.Event()
+        self.pending = np.zeros(0, dtype=np.float32)
+        # Scoring runs in worker threads; one step at a time per session.
+        self.lock = asyncio.Lock()
+
+        self.frames_received = 0
+        self.frames_dropped = 0
+        self.scores_sent = 0
+        self.chunks_since_score = 0
+
+    def receive(self, data):
+        if len(data) % self.dtype.itemsize:
+            raise ValueError(f"Frame length must be a multiple of {self.dtype.itemsize} bytes")
+
+        self.frames_received += 1
+        if len(self.frames) == self.frames.maxlen:
+            self.frames_dropped += 1
+        self.frames.append((self.frames_received, data))
+        self.frame_ready.set()
+
+    def _decode(self, data):
+        audio = np.frombuffer(data, dtype=self.dtype)
+        if self.dtype.kind == 'i':
+            return audio.astype(np.float32) / 32768.0
+        return audio.astype(np.float32, copy=False)
+
+    def process_pending(self):
+        # Returns the sequence number of the newest frame consumed and whether
+        # a score is due.
+        last_seq = None
+        due = False
+        while self.frames:
+            last_seq, data = self.frames.popleft()
+            audio = self._decode(data)
+            if len(self.pending):
+                audio = np.concatenate((self.pending, audio))
+
+            n_full = len(audio) // self.chunk_size
+            for i in range(n_full):
+                self.scorer.push(audio[i * self.chunk_size:(i + 1) * self.chunk_size])
+                self.chunks_since_score += 1
+                if self.chunks_since_score >= self.score_every:
+                    self.chunks_since_score = 0
+                    due = True
+            self.pending = audio[n_full * self.chunk_size:].copy()
+        return last_seq, due
+
+    def reset(self):
+        self.frames.clear()
+        self.pending = np.zeros(0, dtype=np.float32)
+        self.scorer.reset()
+
+    async def score(self, final=False):
+        # Decoding, feature extraction and the model run off the event loop,
+        # so one busy session does not stall every other connection.
+        async with self.lock:
+            last_seq, due = await asyncio.to_thread(self.process_pending)
+            if not (due or final):
+                return None
+            return await asyncio.to_thread(self.message, last_seq, final)
+
+    def message(self, last_seq, final=False):
+        snapshot = self.scorer.snapshot()
+        self.scores_sent += 1
+        return json.dumps({
+            'type': 'final' if final else 'score',
+            'seq': self.scores_sent,
+            'last_frame': last_seq,
+            'frames_received': self.frames_received,
+            'frames_dropped': self.frames_dropped,
+            'chunks': snapshot['chunks'],
+            'speech_detected': snapshot['speech_detected'],
+            'confidence': snapshot['confidence'],
+            'ml_confidence': snapshot['ml_confidence'],
+            'features': snapshot['features']
+        })
+
+
+class StreamingScoreServer:
+
+    def __init__(self, model_path="confidence_model.pkl", profile="balanced", score_every=2,
+                 max_buffered_frames=64, max_connections=5000):
+        # One read-only model shared by every connection.
+        self.ml_scorer = ConfidenceMLScorer(model_path)
+        self.profile = profile
+        self.score_every = score_every
+        self.max_buffered_frames = max_buffered_frames
+        self.max_connections = max_connections
+
+        self.active = 0
+        self.counters = {'connections': 0, 'rejected': 0, 'closed': 0, 'frames': 0, 'dropped': 0,
+                         'scores': 0, 'errors': 0}
+        self.started_at = time.time()
+
+    def _session(self, path):
+        query = parse_qs(urlparse(path).query)
+        profile = query.get('profile', [self.profile])[0]
+        pcm_format = query.get('format', ['f32'])[0]
+        if profile not in SCORING_PROFILES:
+            raise ValueError(f"Unknown profile: {profile}")
+        if pcm_format not in PCM_FORMATS:
+            raise ValueError(f"Unknown format: {pcm_format}")
+        sample_rate = int(query.get('sample_rate', [SAMPLE_RATE])[0])
+        if sample_rate != SAMPLE_RATE:
+            raise ValueError(f"sample_rate must be {SAMPLE_RATE}")
+
+        return StreamSession(
+            SCORING_PROFILES[profile], self.ml_scorer,
+            sample_rate=sample_rate,
+            pcm_format=pcm_format,
+            score_every=max(1, int(query.get('every', [self.score_every])[0])),
+            max_buffered_frames=self.max_buffered_frames
+        )
+
+    async def _score_loop(self, websocket, session):
+        try:
+            while True:
+                await session.frame_ready.wait()
+                session.frame_ready.clear()
+                message = await session.score()
+                if message is not None:
+                    await websocket.send(message)
+        except ConnectionClosed:
+            raise
+        except Exception:
+            # Close at once rather than keep accepting frames that will never
+            # be scored.
+            await websocket.close(code=1011, reason="Scoring failed")
+            raise
+
+    @staticmethod
+    def _failure(task):
+        # The exception a finished scorer loop died of; a send on a connection
+        # the client already closed is not a failure.
+        if not task.done() or task.cancelled():
+            return None
+        error = task.exception()
+        return None if isinstance(error, ConnectionClosed) else error
+
+    async def handler(self, websocket):
+        if self.active >= self.max_connections:
+            self.counters['rejected'] += 1
+            await websocket.close(code=1013, reason="Server at capacity")
+            return
+
+        path = websocket.request.path if websocket.request is not None else '/'
+        try:
+            session = self._session(path)
+        except ValueError as e:
+            await websocket.close(code=1008, reason=str(e))
+            return
+
+        self.active += 1
+        self.counters['connections'] += 1
+        scorer_task = asyncio.create_task(self._score_loop(websocket, session))
+        try:
+            async for message in websocket:
+                if isinstance(message, bytes):
+                    session.receive(message)
+                    continue
+
+                command = json.loads(message)
+                if not isinstance(command, dict):
+                    raise ValueError("Commands must be JSON objects")
+                if command.get('type') == 'end':
+                    await websocket.send(await session.score(final=True))
+                    break
+                if command.get('type') == 'reset':
+                    async with session.lock:
+                        session.reset()
+            self.counters['closed'] += 1
+        except ConnectionClosedOK:
+            self.counters['closed'] += 1
+        except ConnectionClosed:
+            # A scorer failure closes the connection too; it is counted below.
+            if self._failure(scorer_task) is None:
+                self.counters['errors'] += 1
+        except ValueError as e:
+            self.counters['errors'] += 1
+            await websocket.close(code=1007, reason=str(e)[:120])
+        finally:
+            scorer_task.cancel()
+            await asyncio.gather(scorer_task, return_exceptions=True)
+            if self._failure(scorer_task) is not None:
+                self.counters['errors'] += 1
+            self.active -= 1
+            self.counters['frames'] += session.frames_received
+            self.counters['dropped'] += session.frames_dropped
+            self.counters['scores'] += session.scores_sent
+
+    def metrics(self):
+        return {'active': self.active, 'uptime_s': time.time() - self.started_at, **self.counters}
+
+    async def serve(self, host="127.0.0.1", port=8766, ready=None):
+        async with serve(self.handler, host, port, max_size=2 ** 20, compression=None) as server:
+            if ready is not None:
+                ready.set_result(server.sockets[0].getsockname()[1])
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="WebSocket endpoint that streams rolling confidence scores")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--model", default="confidence_model.pkl")
+    parser.add_argument("--profile", default="balanced", choices=sorted(SCORING_PROFILES))
+    parser.add_argument("--every", type=int, default=2, help="send a score every N 0.5 s chunks")
+    parser.add_argument("--max-buffered-frames", type=int, default=64)
+    parser.add_argument("--max-connections", type=int, default=5000)
+    args = parser.parse_args()
+
+    server = StreamingScoreServer(args.model, args.profile, args.every, args.max_buffered_frames, args.max_connections)
+    print(f"Streaming scores on ws://{args.host}:{args.port}/stream")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
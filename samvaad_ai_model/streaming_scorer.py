@@ -0,0 +1,65 @@
+from feature_engine import IncrementalFeatureEngine
+from custom_scorer import CustomConfidenceScorer
+from audioconfig import SAMPLE_RATE
+from feature_defs import FEATURE_NAMES
+
+
+class StreamingConfidenceScorer:
+
+    def __init__(self, profile_config, ml_scorer=None, sample_rate=SAMPLE_RATE, clock="sample", pitch_mode="chunk"):
+        self.feature_engine = IncrementalFeatureEngine(sample_rate, clock=clock, pitch_mode=pitch_mode)
+        self.custom_scorer = CustomConfidenceScorer(profile_config)
+        self.ml_scorer = ml_scorer
+
+    def push(self, chunk):
+        self.feature_engine.process_chunk(chunk)
+
+    def push_audio(self, audio):
+        self.feature_engine.process_audio(audio)
+
+    def ready(self):
+        return self.feature_engine.features_ready()
+
+    def features(self):
+        if not self.ready():
+            return None
+        return self.feature_engine.extract_features()
+
+    def score(self):
+        if not self.ready():
+            return None
+
+        features_clipped, _ = self.feature_engine.extract_features()
+        return self.custom_scorer.score(features_clipped)
+
+    def ml_score(self):
+        if self.ml_scorer is None or not self.ready():
+            return None
+
+        features_clipped, _ = self.feature_engine.extract_features()
+        return self.ml_scorer.score(features_clipped)
+
+    def snapshot(self):
+        if not self.ready():
+            return {
+                'confidence': None,
+                'ml_confidence': None,
+                'features': None,
+                'speech_detected': False,
+                'chunks': self.feature_engine.chunk_count
+            }
+
+        features_clipped, features_raw = self.feature_engine.extract_features()
+        ml_confidence = self.ml_scorer.score(features_clipped) if self.ml_scorer is not None else None
+
+        return {
+            'confidence': self.custom_scorer.score(features_clipped),
+            'ml_confidence': ml_confidence,
+            'features': dict(zip(FEATURE_NAMES, features_raw.tolist())),
+            'speech_detected': True,
+            'chunks': self.feature_engine.chunk_count
+        }
+
+    def reset(self):
+        self.feature_engine.reset()
+        self.custom_scorer.reset()
\ No newline at end of file
@@ -0,0 +1,235 @@
+import io
+import os
+import threading
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import speech_recognition as sr
+from metrics import LatencyHistogram
+from audio_buffer import AudioBuffer
+
+
+def numpy_to_wav_bytes(audio_np, sample_rate):
+    audio_np = np.asarray(audio_np, dtype=np.float32)
+    max_val = np.max(np.abs(audio_np))
+    if max_val > 0:
+        audio_np = audio_np / max_val
+    audio_int16 = (audio_np * 32767).astype(np.int16)
+
+    buf = io.BytesIO()
+    with wave.open(buf, 'wb') as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(audio_int16.tobytes())
+    buf.seek(0)
+    return buf
+
+
+class STTBackend:
+
+    name = "base"
+
+    def __init__(self):
+        self.counters = {'requests': 0, 'errors': 0, 'no_speech': 0, 'audio_seconds': 0.0, 'busy_seconds': 0.0}
+        self.latency_histogram = LatencyHistogram()
+        self._stats_lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    def recognize(self, audio, sample_rate):
+        raise NotImplementedError
+
+    def is_available(self):
+        return True
+
+    def run(self, audio, sample_rate):
+        start = time.perf_counter()
+        outcome = None
+        try:
+            return self.recognize(audio, sample_rate)
+        except sr.UnknownValueError:
+            outcome = 'no_speech'
+            raise
+        except Exception:
+            outcome = 'errors'
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._stats_lock:
+                self.counters['requests'] += 1
+                self.counters['audio_seconds'] += len(audio) / sample_rate
+                self.counters['busy_seconds'] += elapsed
+                if outcome:
+                    self.counters[outcome] += 1
+                self.latency_histogram.observe(elapsed)
+
+    def metrics(self):
+        with self._stats_lock:
+            counters = dict(self.counters)
+            latency = self.latency_histogram.snapshot()
+        wall = time.perf_counter() - self._started
+        audio_seconds = counters['audio_seconds']
+        return {
+            'backend': self.name,
+            **counters,
+            'realtime_factor': counters['busy_seconds'] / audio_seconds if audio_seconds else None,
+            'audio_seconds_per_second': audio_seconds / wall if wall > 0 else None,
+            'latency': latency
+        }
+
+    def close(self):
+        pass
+
+
+class GoogleSTTBackend(STTBackend):
+
+    name = "google"
+
+    def __init__(self):
+        super().__init__()
+        self.recognizer = sr.Recognizer()
+
+    def recognize(self, audio, sample_rate):
+        # The int16 view goes to the recognizer directly instead of through
+        # an in-memory WAV file that sr.AudioFile would parse again.
+        buffer = AudioBuffer.wrap(audio, sample_rate)
+        audio_data = sr.AudioData(buffer.pcm_bytes(), buffer.sample_rate, 2)
+
+        return self.recognizer.recognize_google(audio_data)
+
+
+class LocalSTTBackend(STTBackend):
+
+    name = "local"
+    MODEL_RATE = 16000
+
+    def __init__(self, model_size="base.en", compute_type="int8", cpu_threads=0, beam_size=1, language="en"):
+        super().__init__()
+        self.model_size = model_size
+        self.beam_size = beam_size
+        self.language = language
+        self.model = None
+        self.error = None
+
+        try:
+            from faster_whisper import WhisperModel
+            self.model = WhisperModel(model_size, device="cpu", compute_type=compute_type, cpu_threads=cpu_threads)
+        except Exception as e:
+            self.error = str(e)
+
+    def is_available(self):
+        return self.model is not None
+
+    def warmup(self):
+        if self.model is not None:
+            list(self.model.transcribe(np.zeros(self.MODEL_RATE, dtype=np.float32), beam_size=1)[0])
+
+    def recognize(self, audio, sample_rate):
+        if self.model is None:
+            raise sr.RequestError(f"Local STT unavailable: {self.error}")
+
+        audio = np.asarray(audio, dtype=np.float32).reshape(-1)
+        if sample_rate != self.MODEL_RATE:
+            n = int(round(len(audio) * self.MODEL_RATE / sample_rate))
+            audio = np.interp(
+                np.arange(n) * sample_rate / self.MODEL_RATE, np.arange(len(audio)), audio
+            ).astype(np.float32)
+
+        peak = np.max(np.abs(audio)) if len(audio) else 0.0
+        if peak > 1.0:
+            audio = audio / peak
+
+        segments, _ = self.model.transcribe(
+            audio, language=self.language, beam_size=self.beam_size, condition_on_previous_text=False
+        )
+        text = " ".join(segment.text.strip() for segment in segments).strip()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+class FakeSTTBackend(STTBackend):
+
+    name = "fake"
+
+    def __init__(self, latency=0.3, realtime_factor=0.1, text_fn=None):
+        super().__init__()
+        self.latency = latency
+        self.realtime_factor = realtime_factor
+        self.text_fn = text_fn
+
+    def recognize(self, audio, sample_rate):
+        audio = np.asarray(audio)
+        duration = len(audio) / sample_rate
+        time.sleep(self.latency + self.realtime_factor * duration)
+
+        if self.text_fn is not None:
+            text = self.text_fn(audio, sample_rate)
+        else:
+            text = f"speech {duration:.1f}s"
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+_worker_backend = None
+
+
+def _init_stt_worker(backend_cls, backend_kwargs, warmup):
+    global _worker_backend
+    _worker_backend = backend_cls(**backend_kwargs)
+    if warmup and hasattr(_worker_backend, 'warmup'):
+        _worker_backend.warmup()
+
+
+def _worker_status():
+    return os.getpid(), _worker_backend.is_available()
+
+
+def _recognize_in_worker(audio, sample_rate):
+    return _worker_backend.recognize(audio, sample_rate)
+
+
+class PooledSTTBackend(STTBackend):
+
+    def __init__(self, backend_cls, backend_kwargs=None, workers=2, warmup=True):
+        super().__init__()
+        self.name = f"pooled-{backend_cls.name}"
+        self.workers = workers
+        # Every worker loads its own engine once in the initializer and keeps
+        # it for the life of the pool.
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_stt_worker,
+            initargs=(backend_cls, backend_kwargs or {}, warmup)
+        )
+        statuses = [self.executor.submit(_worker_status) for _ in range(workers)]
+        self.available = all(future.result()[1] for future in statuses)
+
+    def is_available(self):
+        return self.available
+
+    def recognize(self, audio, sample_rate):
+        audio = np.asarray(audio, dtype=np.float32)
+        return self.executor.submit(_recognize_in_worker, audio, sample_rate).result()
+
+    def close(self):
+        self.executor.shutdown()
+
+
+STT_BACKENDS = {
+    'google': GoogleSTTBackend,
+    'local': LocalSTTBackend,
+    'fake': FakeSTTBackend,
+}
+
+
+def make_stt_backend(name="google", workers=0, **kwargs):
+    if name not in STT_BACKENDS:
+        raise ValueError(f"Unknown STT backend: {name}")
+
+    backend_cls = STT_BACKENDS[name]
+    if workers > 0:
+        return PooledSTTBackend(backend_cls, kwargs, workers=workers)
+    return backend_cls(**kwargs)
\ No newline at end of file
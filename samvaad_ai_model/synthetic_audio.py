@@ -0,0 +1,93 @@
+import numpy as np
+from audioconfig import SAMPLE_RATE
+from feature_defs import FEATURE_BOUNDS, FEATURE_NAMES
+
+
+def noise_std(noise_floor_db):
+    # Noise floors are given as RMS in dBFS, the scale compute_energy uses.
+    return 10 ** (noise_floor_db / 20)
+
+
+def tone_bursts(duration, rate=0.4, f0=140.0, rng=None, sample_rate=SAMPLE_RATE,
+                amplitude=0.2, noise=0.003, phase=0.0):
+    # A sine tone gated on and off `rate` times a second over white noise:
+    # cheap, and enough for throughput measurements.
+    rng = rng if rng is not None else np.random.default_rng(0)
+    n = int(duration * sample_rate)
+    t = np.arange(n) / sample_rate
+    envelope = (np.sin(2 * np.pi * rate * t + phase) > -0.3).astype(np.float32)
+    voice = amplitude * np.sin(2 * np.pi * f0 * t) * envelope
+    return (voice + rng.normal(0, noise, n)).astype(np.float32)
+
+
+def harmonic_segment(duration, f0, sample_rate=SAMPLE_RATE, amplitude=0.2, n_harmonics=5,
+                     vibrato=0.05, vibrato_rate=2.0, ramp=0.02):
+    n = int(duration * sample_rate)
+    t = np.arange(n) / sample_rate
+    freq = f0 * (1 + vibrato * np.sin(2 * np.pi * vibrato_rate * t))
+    phase = 2 * np.pi * np.cumsum(freq) / sample_rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, n_harmonics + 1))
+    voice *= amplitude / np.max(np.abs(voice)) if n else 0.0
+
+    # Short fades so segment edges do not add broadband clicks.
+    n_ramp = min(int(ramp * sample_rate), n // 2)
+    if n_ramp:
+        fade = np.linspace(0.0, 1.0, n_ramp)
+        voice[:n_ramp] *= fade
+        voice[-n_ramp:] *= fade[::-1]
+    return voice
+
+
+def render(plan, sample_rate=SAMPLE_RATE, noise_floor_db=-50.0, seed=0):
+    # plan: ('voice', seconds, f0[, amplitude]) and ('pause', seconds) steps.
+    rng = np.random.default_rng(seed)
+    parts = []
+    for step in plan:
+        kind, duration = step[0], step[1]
+        if kind == 'voice':
+            amplitude = step[3] if len(step) > 3 else 0.2
+            parts.append(harmonic_segment(duration, step[2], sample_rate, amplitude=amplitude))
+        elif kind == 'pause':
+            parts.append(np.zeros(int(duration * sample_rate)))
+        else:
+            raise ValueError(f"Unknown plan step: {kind}")
+
+    audio = np.concatenate(parts) if parts else np.zeros(0)
+    audio = audio + rng.normal(0, noise_std(noise_floor_db), len(audio))
+    return audio.astype(np.float32)
+
+
+def random_plan(duration, seed=0, f0_range=(90, 240), voiced_range=(0.4, 2.5),
+                pause_range=(0.2, 1.5), lead_silence=3.0):
+    # The leading silence lets the feature engine settle its noise floor
+    # (five chunks) before the candidate starts talking.
+    rng = np.random.default_rng(seed)
+    plan = [('pause', min(lead_silence, duration))]
+    elapsed = plan[0][1]
+    while elapsed < duration:
+        voiced = min(rng.uniform(*voiced_range), duration - elapsed)
+        plan.append(('voice', voiced, rng.uniform(*f0_range), rng.uniform(0.05, 0.3)))
+        elapsed += voiced
+        if elapsed >= duration:
+            break
+        pause = min(rng.uniform(*pause_range), duration - elapsed)
+        plan.append(('pause', pause))
+        elapsed += pause
+    return plan
+
+
+def synthetic_answer(duration, seed=0, sample_rate=SAMPLE_RATE, noise_floor_db=-50.0, **plan_options):
+    return render(random_plan(duration, seed, **plan_options), sample_rate, noise_floor_db, seed)
+
+
+def synthetic_batch(n_clips, duration, seed=0, sample_rate=SAMPLE_RATE, noise_floor_db=-50.0):
+    return [synthetic_answer(duration, seed + i, sample_rate, noise_floor_db) for i in range(n_clips)]
+
+
+def synthetic_features(n_rows, seed=0):
+    # Feature rows drawn uniformly within FEATURE_BOUNDS, for timing the
+    # scorers without going through audio.
+    rng = np.random.default_rng(seed)
+    low = np.array([FEATURE_BOUNDS[name][0] for name in FEATURE_NAMES], dtype=float)
+    high = np.array([FEATURE_BOUNDS[name][1] for name in FEATURE_NAMES], dtype=float)
+    return rng.uniform(low, high, size=(n_rows, len(FEATURE_NAMES)))
\ No newline at end of file
@@ -0,0 +1,99 @@
+import asyncio
+import pytest
+from async_llm import AsyncLLMEvaluator
+from llm_evaluator import LLMEvaluator
+from llm_stub import StubAPIError, StubGeminiClient
+
+
+class ScriptedModels:
+    # Plays back (delay, error) per call and records peak concurrency.
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+
+    async def generate_content(self, model, contents):
+        delay, error = self.script[min(self.calls, len(self.script) - 1)]
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self.in_flight -= 1
+        if error is not None:
+            raise error
+        return f"response {self.calls}"
+
+
+def make_evaluator(script, **options):
+    client = StubGeminiClient()
+    models = ScriptedModels(script)
+    client.aio.models = models
+    options.setdefault('backoff_base', 0.001)
+    return AsyncLLMEvaluator(LLMEvaluator(client=client), **options), models
+
+
+def warm_up(async_eval, seconds=0.01, samples=20):
+    for _ in range(samples):
+        async_eval.latency.observe(seconds)
+
+
+def test_retryable_errors_are_retried():
+    async_eval, models = make_evaluator([(0, StubAPIError(503)), (0, StubAPIError(429)), (0, None)])
+
+    assert asyncio.run(async_eval.generate("prompt")) == "response 3"
+    assert async_eval.counters['retries'] == 2
+    assert async_eval.counters['errors'] == 0
+
+
+def test_non_retryable_errors_are_raised():
+    async_eval, models = make_evaluator([(0, StubAPIError(400))])
+
+    with pytest.raises(StubAPIError):
+        asyncio.run(async_eval.generate("prompt"))
+    assert models.calls == 1
+    assert async_eval.counters['errors'] == 1
+
+
+def test_timeouts_count_and_give_up_after_max_retries():
+    async_eval, models = make_evaluator([(1.0, None)], timeout=0.02, max_retries=2)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(async_eval.generate("prompt"))
+    assert models.calls == 3
+    assert async_eval.counters['timeouts'] == 3
+
+
+def test_slow_primary_is_hedged():
+    async_eval, models = make_evaluator([(0.5, None), (0.0, None)], hedge=True)
+    warm_up(async_eval)
+
+    assert asyncio.run(async_eval.generate("prompt")) == "response 2"
+    assert async_eval.counters['hedges'] == 1
+    assert async_eval.counters['hedge_wins'] == 1
+
+
+def test_hedges_stay_within_max_concurrency():
+    async_eval, models = make_evaluator([(0.1, None)], hedge=True, max_concurrency=2)
+    warm_up(async_eval)
+
+    async def run():
+        return await asyncio.gather(*[async_eval.generate(f"prompt {i}") for i in range(6)])
+
+    assert len(asyncio.run(run())) == 6
+    assert models.peak <= 2
+    assert async_eval.counters['hedges_skipped'] > 0
+    assert async_eval.semaphore._value == 2
+
+
+def test_hedge_uses_a_free_slot():
+    async_eval, models = make_evaluator([(0.1, None)], hedge=True, max_concurrency=2)
+    warm_up(async_eval)
+
+    asyncio.run(async_eval.generate("prompt"))
+    assert async_eval.counters['hedges'] == 1
+    assert models.peak == 2
+    assert async_eval.semaphore._value == 2
\ No newline at end of file
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from audio_recorder import AudioRecorder
+from audio_source import ArrayAudioSource
+from synthetic_audio import render
+
+SAMPLE_RATE = 16000
+
+
+def answer(lead=3.0, speech=4.0, tail=10.0):
+    return render([('pause', lead), ('voice', speech, 150.0), ('pause', tail)], SAMPLE_RATE, seed=1)
+
+
+def test_stops_after_trailing_silence():
+    audio = answer()
+    recorder = AudioRecorder(SAMPLE_RATE, source=ArrayAudioSource(audio, SAMPLE_RATE), silence_timeout=2.0)
+
+    recorded = recorder.record(max_duration=15)
+
+    assert recorder.stopped_early
+    # Speech ends at 7 s; the next 2 s of silence are kept, to frame precision.
+    assert 9.0 <= len(recorded) / SAMPLE_RATE <= 9.5
+    np.testing.assert_array_equal(recorded, audio[:len(recorded)])
+
+
+def test_leading_silence_does_not_stop_recording():
+    audio = answer(lead=6.0, tail=1.0)
+    recorder = AudioRecorder(SAMPLE_RATE, source=ArrayAudioSource(audio, SAMPLE_RATE), silence_timeout=2.0)
+
+    recorded = recorder.record(max_duration=15)
+
+    assert not recorder.stopped_early
+    assert len(recorded) == len(audio)
+
+
+def test_silence_only_records_until_max_duration():
+    audio = render([('pause', 16.0)], SAMPLE_RATE, seed=2)
+    recorder = AudioRecorder(SAMPLE_RATE, source=ArrayAudioSource(audio, SAMPLE_RATE), silence_timeout=2.0)
+
+    assert len(recorder.record(max_duration=15)) == 15 * SAMPLE_RATE
+    assert not recorder.stopped_early
+
+
+@pytest.mark.parametrize("silence_timeout, min_duration, expected", [
+    (None, 1.0, 15.0),
+    (2.0, 12.0, 12.0),
+])
+def test_early_stop_can_be_disabled_or_delayed(silence_timeout, min_duration, expected):
+    recorder = AudioRecorder(SAMPLE_RATE, source=ArrayAudioSource(answer(), SAMPLE_RATE),
+                             silence_timeout=silence_timeout, min_duration=min_duration)
+
+    assert len(recorder.record(max_duration=15)) / SAMPLE_RATE == expected
+
+
+def test_frames_are_views_of_the_recording():
+    recorder = AudioRecorder(SAMPLE_RATE, source=ArrayAudioSource(answer(), SAMPLE_RATE), silence_timeout=2.0)
+    frames = []
+
+    recorded = recorder.record(max_duration=15, on_frame=frames.append)
+
+    assert all(np.shares_memory(frame, recorded) for frame in frames)
+    assert sum(len(frame) for frame in frames) == len(recorded)
\ No newline at end of file
@@ -0,0 +1,17 @@
+from benchmark import compare
+
+
+def case(items_per_s):
+    return {'items_per_s': items_per_s}
+
+
+def test_compare_flags_slower_and_missing_cases():
+    baseline = {'pitch/chunk': case(100.0), 'energy/chunk': case(100.0), 'ml/score': case(50.0)}
+    results = {'pitch/chunk': case(95.0), 'energy/chunk': case(80.0), 'new/case': case(1.0)}
+
+    assert compare(results, baseline, 0.10) == ['energy/chunk', 'ml/score']
+
+
+def test_compare_ignores_cases_outside_the_filter():
+    baseline = {'pitch/chunk': case(100.0), 'ml/score': case(50.0)}
+    assert compare({'pitch/chunk': case(100.0)}, baseline, 0.10, pattern='pitch') == []
\ No newline at end of file
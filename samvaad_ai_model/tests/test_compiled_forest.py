@@ -0,0 +1,60 @@
+import os
+import warnings
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from compiled_forest import CompiledForest
+from feature_defs import FEATURE_BOUNDS, FEATURE_NAMES
+from ml_scorer import ConfidenceMLScorer
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "confidence_model.pkl")
+
+
+def fixed_rows():
+    rng = np.random.default_rng(1234)
+    low = np.array([FEATURE_BOUNDS[name][0] for name in FEATURE_NAMES])
+    high = np.array([FEATURE_BOUNDS[name][1] for name in FEATURE_NAMES])
+    rows = rng.uniform(low, high, size=(200, len(FEATURE_NAMES)))
+    return np.vstack([rows, low, high, (low + high) / 2]).astype(np.float32)
+
+
+def test_compiled_matches_fitted_forest():
+    rng = np.random.default_rng(0)
+    X = rng.uniform(0, 1, size=(300, 5))
+    y = X @ [1.0, -2.0, 0.5, 3.0, 0.0] + rng.normal(0, 0.1, 300)
+    model = RandomForestRegressor(n_estimators=12, max_depth=8, random_state=0).fit(X, y)
+
+    compiled = CompiledForest.from_sklearn(model)
+    rows = rng.uniform(-0.2, 1.2, size=(100, 5))
+
+    np.testing.assert_allclose(compiled.predict(rows), model.predict(rows.astype(np.float32)), rtol=0, atol=1e-12)
+
+
+def test_compiled_thresholds_are_compared_like_sklearn():
+    rng = np.random.default_rng(1)
+    X = rng.uniform(0, 1, size=(200, 5))
+    model = RandomForestRegressor(n_estimators=5, random_state=0).fit(X, X[:, 0])
+    compiled = CompiledForest.from_sklearn(model)
+
+    # Rows sitting exactly on split thresholds take the left branch in both.
+    thresholds = model.estimators_[0].tree_.threshold
+    rows = np.tile(X[:1], (10, 1))
+    rows[:, 0] = thresholds[thresholds != -2][:10]
+
+    np.testing.assert_allclose(compiled.predict(rows), model.predict(rows.astype(np.float32)), rtol=0, atol=1e-12)
+
+
+@pytest.mark.skipif(not os.path.exists(MODEL_PATH), reason="confidence_model.pkl not present")
+def test_shipped_model_compiles_to_sklearn_predictions():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        scorer = ConfidenceMLScorer(MODEL_PATH)
+    assert scorer.is_compiled()
+
+    rows = fixed_rows()
+    np.testing.assert_allclose(scorer.compiled.predict(rows), scorer.model.predict(rows), rtol=0, atol=1e-9)
+    np.testing.assert_allclose(
+        [scorer.score(row) for row in rows[:20]],
+        scorer.score_many(rows[:20]),
+        rtol=0, atol=1e-9
+    )
\ No newline at end of file
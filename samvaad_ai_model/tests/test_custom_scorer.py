@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from custom_scorer import CustomConfidenceScorer, ProfileScoreMatrix
+from feature_defs import FEATURE_BOUNDS, FEATURE_NAMES
+from scoring_profiles import SCORING_PROFILES
+from synthetic_audio import synthetic_features
+
+ROWS = synthetic_features(2000, seed=5)
+rng = np.random.default_rng(6)
+TRANSCRIPTS = [{'filler_rate': rate, 'keyword_coverage': coverage}
+               for rate, coverage in zip(rng.uniform(0, 0.4, len(ROWS)), rng.uniform(0, 1, len(ROWS)))]
+SCORERS = {name: CustomConfidenceScorer(profile) for name, profile in SCORING_PROFILES.items()}
+
+
+def loop_score(weights, features):
+    # The per-element scorer that normalize_features replaced.
+    normalized = np.clip(np.array([
+        (features[i] - FEATURE_BOUNDS[name][0]) / (FEATURE_BOUNDS[name][1] - FEATURE_BOUNDS[name][0])
+        for i, name in enumerate(FEATURE_NAMES)
+    ]), 0, 1)
+    inverted = np.array([1 - normalized[0], 1 - normalized[1], 1 - normalized[2],
+                         normalized[3], 1 - normalized[4]])
+    confidence = np.dot(inverted, np.abs(weights)) / np.sum(np.abs(weights)) * 100
+    return float(np.clip(confidence, 0, 100))
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_scorer_matches_per_element_loop(dtype):
+    for name, profile in SCORING_PROFILES.items():
+        weights = np.array([profile['weights'][feature] for feature in FEATURE_NAMES])
+        for row in ROWS[:500].astype(dtype):
+            assert SCORERS[name].score(row) == loop_score(weights, row)
+
+
+@pytest.fixture(scope="module")
+def matrix():
+    return ProfileScoreMatrix(SCORING_PROFILES)
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+@pytest.mark.parametrize("with_transcript", [False, True])
+def test_score_batch_matches_each_profile_scorer(matrix, dtype, with_transcript):
+    rows = ROWS.astype(dtype)
+    transcripts = TRANSCRIPTS if with_transcript else None
+    scores = matrix.score_batch(rows, transcripts)
+
+    assert scores.shape == (len(rows), len(SCORING_PROFILES))
+    for j, name in enumerate(matrix.names):
+        expected = [SCORERS[name].score(row, transcripts[i] if transcripts else None)
+                    for i, row in enumerate(rows)]
+        assert scores[:, j].tolist() == expected
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_score_all_matches_each_profile_scorer(matrix, dtype):
+    for i in range(0, len(ROWS), 97):
+        row = ROWS[i].astype(dtype)
+        assert matrix.score_all(row) == {name: scorer.score(row) for name, scorer in SCORERS.items()}
+        assert matrix.score_all(row, TRANSCRIPTS[i]) == {
+            name: scorer.score(row, TRANSCRIPTS[i]) for name, scorer in SCORERS.items()
+        }
\ No newline at end of file
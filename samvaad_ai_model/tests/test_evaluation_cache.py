@@ -0,0 +1,39 @@
+import time
+from evaluation_cache import EvaluationCache
+
+
+def test_default_cache_is_memory_only(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache = EvaluationCache()
+    cache.put("k", {'score': 7})
+
+    assert cache.get("k") == {'score': 7}
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_disk_rows_are_trimmed_only_past_the_cap(tmp_path):
+    cache = EvaluationCache(path=str(tmp_path / "cache.sqlite3"), max_entries=2, max_disk_entries=10)
+    for i in range(10):
+        cache.put(f"k{i}", {'score': i})
+    cache.put("k9", {'score': 9})
+    assert cache._disk_rows == 10
+
+    cache.put("k10", {'score': 10})
+    rows = cache._db.execute("SELECT COUNT(*) FROM evaluations").fetchone()[0]
+    assert rows == cache._disk_rows == 9
+    assert cache.get("k10") == {'score': 10}
+    assert cache.get("k0") is None
+
+
+def test_row_count_survives_reopen_and_expiry(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = EvaluationCache(path=path, max_entries=1)
+    cache.put("a", {'score': 1})
+    cache.put("b", {'score': 2})
+    cache.close()
+
+    reopened = EvaluationCache(path=path, max_entries=1, ttl=0.05)
+    assert reopened._disk_rows == 2
+    time.sleep(0.1)
+    assert reopened.get("a") is None
+    assert reopened._disk_rows == 1
\ No newline at end of file
@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+from custom_scorer import CustomConfidenceScorer
+from feature_defs import FEATURE_NAMES
+from feature_engine import BatchFeatureEngine, ConfidenceFeatureEngine, IncrementalFeatureEngine, frame_audio
+from scoring_profiles import SCORING_PROFILES
+from streaming_scorer import StreamingConfidenceScorer
+from synthetic_audio import synthetic_answer
+
+CLIPS = [synthetic_answer(20 + seed, seed=seed) for seed in range(4)]
+
+
+def chunked(engine_class, audio, **options):
+    engine = engine_class(clock="sample", **options)
+    for chunk in frame_audio(audio, engine.chunk_size):
+        engine.process_chunk(chunk)
+    return engine
+
+
+def state(engine):
+    return (list(engine.voiced_buffer), list(engine.pitch_buffer), list(engine.recent_pauses),
+            engine.noise_floor, engine.is_speaking, engine.pause_start, engine.chunk_count)
+
+
+@pytest.mark.parametrize("pitch_mode", ["chunk", "track"])
+@pytest.mark.parametrize("audio", CLIPS)
+def test_process_audio_matches_chunk_loop(audio, pitch_mode):
+    expected = chunked(ConfidenceFeatureEngine, audio, pitch_mode=pitch_mode)
+    engine = ConfidenceFeatureEngine(clock="sample", pitch_mode=pitch_mode)
+    engine.process_audio(audio)
+
+    assert state(engine) == state(expected)
+    assert engine.features_ready() and expected.features_ready()
+    for got, want in zip(engine.extract_features(), expected.extract_features()):
+        np.testing.assert_array_equal(got, want)
+
+
+def test_process_audio_before_the_noise_floor_settles():
+    audio = CLIPS[0][:3 * 8000 + 1]
+    expected = chunked(ConfidenceFeatureEngine, audio)
+    engine = ConfidenceFeatureEngine(clock="sample")
+    engine.process_audio(audio)
+
+    assert engine.noise_floor is None
+    assert state(engine) == state(expected)
+    assert list(engine.energy_buffer) == list(expected.energy_buffer)
+
+
+@pytest.mark.parametrize("pitch_mode", ["chunk", "track"])
+def test_incremental_engine_matches_deque_engine(pitch_mode):
+    # 60 s overflows every window, so the running statistics evict.
+    audio = synthetic_answer(60, seed=7)
+    expected = ConfidenceFeatureEngine(clock="sample", pitch_mode=pitch_mode)
+    engine = IncrementalFeatureEngine(clock="sample", pitch_mode=pitch_mode)
+
+    for chunk in frame_audio(audio, engine.chunk_size):
+        expected.process_chunk(chunk)
+        engine.process_chunk(chunk)
+        assert engine.features_ready() == expected.features_ready()
+        if expected.features_ready():
+            for got, want in zip(engine.extract_features(), expected.extract_features()):
+                np.testing.assert_array_equal(got, want)
+    assert len(engine.pitch_buffer) == engine.pitch_buffer.maxlen
+
+
+def test_streaming_scorer_snapshot():
+    profile = SCORING_PROFILES['balanced']
+    audio = CLIPS[1]
+    scorer = StreamingConfidenceScorer(profile, clock="sample")
+    assert scorer.snapshot()['confidence'] is None
+
+    scorer.push_audio(audio)
+    expected = chunked(ConfidenceFeatureEngine, audio)
+    features, raw = expected.extract_features()
+    snapshot = scorer.snapshot()
+
+    assert snapshot['chunks'] == expected.chunk_count
+    assert snapshot['confidence'] == CustomConfidenceScorer(profile).score(features)
+    assert snapshot['features'] == dict(zip(FEATURE_NAMES, raw.tolist()))
+
+    scorer.reset()
+    assert scorer.snapshot() == {'confidence': None, 'ml_confidence': None, 'features': None,
+                                 'speech_detected': False, 'chunks': 0}
+
+
+def run_batch(n_streams, n_steps, active=None, resets=()):
+    # Streams are fed one chunk per step; active[t] masks the streams fed at
+    # step t and resets maps a step to the streams reset before it.
+    streams = [frame_audio(synthetic_answer(n_steps * 0.5 + 1, seed=10 + i), 8000)[:n_steps]
+               for i in range(n_streams)]
+    batch = BatchFeatureEngine(n_streams)
+    engines = [ConfidenceFeatureEngine(clock="sample") for _ in range(n_streams)]
+
+    for t in range(n_steps):
+        if t in resets:
+            batch.reset(resets[t])
+            for i in resets[t]:
+                engines[i].reset()
+        mask = None if active is None else active[t]
+        batch.process_block(np.stack([stream[t] for stream in streams]), mask)
+        for i, engine in enumerate(engines):
+            if mask is None or mask[i]:
+                engine.process_chunk(streams[i][t])
+
+        ready = batch.features_ready()
+        assert ready.tolist() == [engine.features_ready() for engine in engines]
+        clipped, raw = batch.extract_features()
+        for i in np.flatnonzero(ready):
+            expected_clipped, expected_raw = engines[i].extract_features()
+            np.testing.assert_array_equal(clipped[i], expected_clipped)
+            np.testing.assert_array_equal(raw[i], expected_raw)
+    return batch, engines
+
+
+def test_batch_engine_matches_scalar_engines():
+    batch, engines = run_batch(8, 80)
+    assert batch.features_ready().all()
+    assert batch.chunk_count.tolist() == [engine.chunk_count for engine in engines]
+
+
+def test_batch_engine_active_mask_and_reset():
+    rng = np.random.default_rng(3)
+    active = rng.random((80, 8)) < 0.7
+    active[20] = False
+    batch, engines = run_batch(8, 80, active=active, resets={30: [1, 4], 55: np.array([0, 7])})
+    assert batch.chunk_count.tolist() == [engine.chunk_count for engine in engines]
\ No newline at end of file
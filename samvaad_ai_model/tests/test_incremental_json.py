@@ -0,0 +1,97 @@
+import json
+import random
+
+import pytest
+
+from incremental_json import IncrementalJSONObjectParser
+from llm_evaluator import LLMEvaluator
+from llm_stub import StubGeminiClient
+
+DOCUMENTS = [
+    '{"is_correct": "yes", "score": 85, "strengths": ["clear"], "gaps": [], "reasoning": "Good."}',
+    '{"reasoning": "uses {braces}, [brackets], \\"quotes\\" and a \\\\ backslash", "score": 40.5}',
+    '{"a": {"b": [1, {"c": "}"}], "d": {}}, "e": [[], [true, false, null]], "f": -1e3}',
+    '{"escaped \\"key\\"": "\\u00e9\\n\\t", "score": 0}',
+    '{ "spaced" :  12 , "last" : "x" }',
+    '{}'
+]
+
+
+def feed_in_chunks(text, rng):
+    parser = IncrementalJSONObjectParser()
+    fields = []
+    i = 0
+    while i < len(text):
+        step = rng.randint(1, 8)
+        fields.extend(parser.feed(text[i:i + step]))
+        i += step
+    return parser, fields
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_matches_json_loads_under_any_chunking(document):
+    expected = json.loads(document)
+    rng = random.Random(0)
+    for _ in range(200):
+        parser, fields = feed_in_chunks(document, rng)
+        assert parser.done and not parser.errors
+        assert parser.fields == expected
+        assert dict(fields) == expected
+
+
+def test_fields_are_published_as_they_close():
+    parser = IncrementalJSONObjectParser()
+    assert parser.feed('{"score": 72, "reasoning": "still') == [('score', 72)]
+    assert parser.feed(' going"}') == [('reasoning', 'still going')]
+    assert parser.done
+
+
+@pytest.mark.parametrize("wrapper", [
+    "Here is my evaluation:\n{}\nHope this helps.",
+    "```json\n{}\n```",
+    "{}"
+])
+def test_prose_and_fences_around_the_object(wrapper):
+    document = DOCUMENTS[0]
+    parser = IncrementalJSONObjectParser()
+    parser.feed(wrapper.format(document))
+    assert parser.done
+    assert parser.fields == json.loads(document)
+
+
+def test_parse_response_matches_normalized_json():
+    evaluator = LLMEvaluator(client=StubGeminiClient())
+    text = "```json\n" + DOCUMENTS[0] + "\n```"
+    assert evaluator._parse_response(text) == evaluator._normalize_result(json.loads(DOCUMENTS[0]))
+
+
+def test_truncated_stream_is_reported():
+    evaluator = LLMEvaluator(client=StubGeminiClient())
+    text = DOCUMENTS[0][:40]
+    result = evaluator._parse_response(text)
+    assert result['error'] == 'Could not parse response'
+    assert result['reasoning'] == text
+
+
+def test_invalid_value_is_reported():
+    evaluator = LLMEvaluator(client=StubGeminiClient())
+    result = evaluator._parse_response('{"score": 8x, "reasoning": "ok"}')
+    assert result['error'] == 'Could not parse response'
+
+
+def test_text_without_object_is_kept_as_reasoning():
+    evaluator = LLMEvaluator(client=StubGeminiClient())
+    result = evaluator._parse_response("I cannot evaluate this answer.")
+    assert result['is_correct'] == 'unknown'
+    assert result['reasoning'] == "I cannot evaluate this answer."
+    assert result['error'] is None
+
+
+def test_streaming_counts_usage_like_single_calls():
+    single = LLMEvaluator(client=StubGeminiClient())
+    streamed = LLMEvaluator(client=StubGeminiClient())
+    args = ("I led the migration.", "Describe a project.", "A project you led.")
+    single.evaluate_answer(*args)
+    streamed.evaluate_answer_stream(*args)
+    assert single.usage == streamed.usage
+    assert streamed.usage['requests'] == 1
\ No newline at end of file
@@ -0,0 +1,82 @@
+from llm_evaluator import LLMEvaluator
+from llm_stub import StubAPIError, StubGeminiClient, stub_evaluation
+
+ANSWERS = [
+    {
+        'question': "What are your main strengths?",
+        'reference_answer': "Problem solving, communication and teamwork.",
+        'candidate_answer': "My strengths are problem solving and clear communication."
+    },
+    {
+        'question': "Describe a challenge you solved.",
+        'reference_answer': "A production outage fixed by tracing logs and adding monitoring.",
+        'candidate_answer': "We had an outage, I traced the logs and added monitoring."
+    },
+    {
+        'question': "What are your career goals?",
+        'reference_answer': "Grow into a technical lead role.",
+        'candidate_answer': "I want to become a technical lead."
+    }
+]
+
+
+def expected(item):
+    result = stub_evaluation(item['candidate_answer'], item['reference_answer'])
+    return {**result, 'score': float(result['score']), 'error': None}
+
+
+def test_batch_response_is_parsed_per_item():
+    client = StubGeminiClient()
+    evaluator = LLMEvaluator(client=client)
+
+    results = evaluator.evaluate_interview(ANSWERS)
+
+    assert client.calls == 1
+    assert results == [expected(item) for item in ANSWERS]
+
+
+def test_items_missing_from_batch_fall_back_to_single_calls():
+    client = StubGeminiClient(drop_items=[1])
+    evaluator = LLMEvaluator(client=client)
+
+    results = evaluator.evaluate_interview(ANSWERS)
+
+    assert client.calls == 2
+    assert results == [expected(item) for item in ANSWERS]
+
+
+def test_unparseable_batch_response_falls_back():
+    evaluator = LLMEvaluator(client=StubGeminiClient())
+
+    assert evaluator._parse_batch_response("no json here") == {}
+    assert evaluator._parse_batch_response("[{\"id\": \"0\"}, 3, {\"id\": 1, \"score\": \"x\"}]") == {}
+    parsed = evaluator._parse_batch_response("```json\n[{\"id\": 2, \"score\": \"40\", \"is_correct\": \"no\"}]\n```")
+    assert parsed['2']['score'] == 40.0 and parsed['2']['is_correct'] == 'no'
+
+
+def test_batch_error_retries_each_item():
+    client = StubGeminiClient()
+    evaluator = LLMEvaluator(client=client)
+    calls = []
+
+    def generate(prompt):
+        calls.append(prompt)
+        if len(calls) == 1:
+            raise StubAPIError(503)
+        return client.models.generate_content(model=evaluator.model_name, contents=prompt)
+
+    evaluator._generate = generate
+    results = evaluator.evaluate_interview(ANSWERS)
+
+    assert len(calls) == 1 + len(ANSWERS)
+    assert results == [expected(item) for item in ANSWERS]
+
+
+def test_small_token_budget_splits_batches():
+    client = StubGeminiClient()
+    evaluator = LLMEvaluator(client=client)
+
+    results = evaluator.evaluate_interview(ANSWERS, max_prompt_tokens=1)
+
+    assert client.calls == len(ANSWERS)
+    assert results == [expected(item) for item in ANSWERS]
\ No newline at end of file
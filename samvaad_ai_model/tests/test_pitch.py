@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from scipy import signal
+from pitch import estimate_pitch_fft, estimate_pitch_fft_batch, legacy_pitch_scale
+from pitch_tracker import PitchTracker
+from synthetic_audio import harmonic_segment
+
+F0S = (60, 90, 110, 140, 160, 200, 250, 300)
+LENGTHS = (8000, 4096, 2048, 1024)
+
+
+def resample_estimate(audio, sample_rate=16000):
+    # The estimator PitchEstimator replaced: frames over 4096 samples were
+    # resampled down to 4096 before the FFT.
+    if len(audio) < 512:
+        return 0.0
+    audio = np.asarray(audio, dtype=float)
+    audio = audio - np.mean(audio)
+    if len(audio) > 4096:
+        audio = signal.resample(audio, 4096)
+
+    freqs = np.fft.rfftfreq(len(audio), 1.0 / sample_rate)
+    spectrum = np.abs(np.fft.rfft(audio * np.hamming(len(audio))))
+    mask = (freqs >= 50) & (freqs <= 320)
+    spectrum, freqs = spectrum[mask], freqs[mask]
+    peak = np.argmax(spectrum)
+    if spectrum[peak] / (np.mean(spectrum) + 1e-10) < 3.0:
+        return 0.0
+    return float(freqs[peak])
+
+
+@pytest.mark.parametrize("length", LENGTHS)
+def test_estimate_matches_resample_estimator(length):
+    rng = np.random.default_rng(length)
+    frames = []
+    for f0 in F0S:
+        for vibrato in (0.0, 0.05):
+            frame = harmonic_segment(length / 16000, f0, vibrato=vibrato)
+            frames.append((frame + rng.normal(0, 0.003, length)).astype(np.float32))
+    frames.append(rng.normal(0, 0.01, length).astype(np.float32))
+
+    expected = [resample_estimate(frame) for frame in frames]
+    assert [estimate_pitch_fft(frame) for frame in frames] == expected
+    assert estimate_pitch_fft_batch(np.stack(frames)).tolist() == expected
+
+
+def test_short_frames_have_no_pitch():
+    assert estimate_pitch_fft(harmonic_segment(0.03, 140)) == 0.0
+
+
+@pytest.mark.parametrize("f0", F0S)
+def test_tracker_recovers_f0(f0):
+    tracker = PitchTracker()
+    chunk = harmonic_segment(0.5, f0, vibrato=0.0).astype(np.float32)
+    pitches = tracker.track(chunk)
+
+    assert len(pitches) == tracker.frames_per_chunk(len(chunk))
+    assert np.all(pitches > 0)
+    assert np.median(pitches) == pytest.approx(f0, rel=0.01)
+
+
+@pytest.mark.parametrize("f0", (60, 90, 110, 140, 160))
+def test_tracked_f0_on_legacy_scale_matches_chunk_estimate(f0):
+    # Within one labelled FFT bin of the chunk estimator, for F0s whose
+    # scaled value stays inside its 50-320 band.
+    chunk = harmonic_segment(0.5, f0, vibrato=0.0).astype(np.float32)
+    scaled = np.median(PitchTracker().track(chunk)) * legacy_pitch_scale(len(chunk))
+    assert scaled == pytest.approx(estimate_pitch_fft(chunk), abs=16000 / 4096)
+
+
+def test_tracker_leaves_silence_unvoiced():
+    tracker = PitchTracker()
+    assert not np.any(tracker.track(np.zeros(8000, dtype=np.float32)))
+    noise = np.random.default_rng(0).normal(0, 0.01, 8000).astype(np.float32)
+    assert np.mean(tracker.track(noise) > 0) < 0.2
\ No newline at end of file
@@ -0,0 +1,48 @@
+import json
+import os
+import pytest
+from prescreen import AnswerPrescreener
+
+REFERENCE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "reference_answers.json")
+
+
+@pytest.fixture(scope="module")
+def reference_answers():
+    with open(REFERENCE_PATH) as f:
+        return json.load(f)['reference_answers']
+
+
+@pytest.mark.parametrize("question_id, answer", [
+    (1, "I grew up in Pune and studied mechanical engineering at COEP, then joined Tata Motors"),
+    (2, "I am patient, curious and hardworking"),
+    (2, "Patience and empathy."),
+    (3, "I tend to overcommit sometimes"),
+    (5, "Lead a team."),
+    (7, "I don't know"),
+])
+def test_real_answers_go_to_the_llm(reference_answers, question_id, answer):
+    prescreener = AnswerPrescreener(reference_answers)
+    assert prescreener.screen(question_id, answer) is None
+    assert prescreener.stats['passed'] == 1
+
+
+@pytest.mark.parametrize("answer", ["", "   ", "No.", "no", "Um, uh...", "yes"])
+def test_empty_answers_are_scored_locally(reference_answers, answer):
+    prescreener = AnswerPrescreener(reference_answers)
+    result = prescreener.screen(2, answer)
+    assert result['score'] == 0.0
+    assert result['prescreened'] is True
+    assert prescreener.stats['skipped_empty'] == 1
+
+
+def test_off_topic_skip_is_opt_in(reference_answers):
+    answer = "The weather in the mountains was lovely last weekend"
+    assert AnswerPrescreener(reference_answers).screen(4, answer) is None
+
+    strict = AnswerPrescreener(reference_answers, min_similarity=0.02)
+    assert strict.screen(4, answer)['prescreened'] is True
+    assert strict.stats['skipped_off_topic'] == 1
+
+
+def test_unknown_question_is_not_screened(reference_answers):
+    assert AnswerPrescreener(reference_answers).screen(99, "") is None
\ No newline at end of file
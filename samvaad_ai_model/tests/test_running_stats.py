@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+from running_stats import RunningWindow, VoicedWindow
+
+
+def test_running_window_evicts_oldest():
+    rng = np.random.default_rng(0)
+    values = rng.normal(150.0, 40.0, 500)
+    window = RunningWindow(30)
+
+    for i, value in enumerate(values):
+        window.append(value)
+        recent = values[max(0, i - 29):i + 1]
+        assert len(window) == len(recent)
+        assert list(window) == recent.tolist()
+        assert window.mean == pytest.approx(np.mean(recent), rel=1e-12)
+        assert window.variance == pytest.approx(np.var(recent), rel=1e-9, abs=1e-9)
+
+
+def test_running_window_of_one_and_clear():
+    window = RunningWindow(1)
+    window.extend([5.0, 7.0])
+    assert (window.mean, window.variance) == (7.0, 0.0)
+
+    window.clear()
+    assert (len(window), window.mean, window.variance) == (0, 0.0, 0.0)
+
+
+def test_voiced_window_counts_after_eviction():
+    rng = np.random.default_rng(1)
+    flags = (rng.random(300) < 0.6).tolist()
+    window = VoicedWindow(10)
+
+    for i, flag in enumerate(flags):
+        window.append(flag)
+        recent = flags[max(0, i - 9):i + 1]
+        assert list(window) == recent
+        assert window.voiced == sum(recent)
+        assert window.transitions == sum(a != b for a, b in zip(recent, recent[1:]))
\ No newline at end of file
@@ -0,0 +1,217 @@
+import base64
+import contextlib
+import io
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+import warnings
+from concurrent.futures import TimeoutError as FutureTimeoutError
+import numpy as np
+import pytest
+from audio_source import read_wav
+from confidence_engine import ConfidenceEngine
+from llm_evaluator import LLMEvaluator
+from llm_stub import StubGeminiClient
+from scoring_profiles import SCORING_PROFILES
+from scoring_service import QueueFull, ScoringService, make_server
+from speech_to_text import SpeechToTextConverter
+from stt_backends import FakeSTTBackend, numpy_to_wav_bytes
+from synthetic_audio import synthetic_answer
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_PATH = os.path.join(PACKAGE_DIR, "confidence_model.pkl")
+REQUEST = {
+    'question': "What are your main strengths?",
+    'reference_answer': "Problem solving, communication and teamwork.",
+    'candidate_answer': "I am good at problem solving."
+}
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def service():
+    # The process pool is never started: these tests only use the thread
+    # pool behind /evaluate and transcription.
+    service = ScoringService(
+        workers=1, max_evaluations=1, max_transcriptions=1, request_timeout=0.05,
+        llm_evaluator=LLMEvaluator(client=StubGeminiClient(latency=0.5)),
+        stt=SpeechToTextConverter(16000, backend=FakeSTTBackend(latency=0.5, realtime_factor=0.0)),
+        reference_path=os.path.join(PACKAGE_DIR, "reference_answers.json")
+    )
+    yield service
+    service.close()
+
+
+def test_timed_out_evaluation_keeps_its_slot_until_done(service):
+    with pytest.raises(FutureTimeoutError):
+        service.evaluate(REQUEST)
+    assert service.evaluate_admission.inflight == 1
+
+    with pytest.raises(QueueFull):
+        service.evaluate(REQUEST)
+    assert service.evaluate_admission.rejected == 1
+
+    wait_until(lambda: service.evaluate_admission.inflight == 0)
+    service.request_timeout = 5.0
+    assert service.evaluate(REQUEST)['evaluation']['error'] is None
+
+
+def test_transcription_goes_through_admission(service):
+    audio = np.zeros(16000, dtype=np.float32)
+    with pytest.raises(FutureTimeoutError):
+        service.transcribe(audio)
+    with pytest.raises(QueueFull):
+        service.transcribe(audio)
+
+    wait_until(lambda: service.transcribe_admission.inflight == 0)
+    assert service.metrics()['admission']['transcribe']['admitted'] == 1
+
+
+@contextlib.contextmanager
+def serve(service):
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def call(url, body=None, content_type='application/json'):
+    data = json.dumps(body).encode() if isinstance(body, (dict, list)) else body
+    request = urllib.request.Request(url, data=data, method='GET' if data is None else 'POST',
+                                     headers={'Content-Type': content_type})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, dict(response.headers), json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, dict(e.headers), json.load(e)
+
+
+def test_busy_server_answers_429(service):
+    with serve(service) as base:
+        assert call(base + "/evaluate", REQUEST)[0] == 504
+        status, headers, _ = call(base + "/evaluate", REQUEST)
+        assert status == 429
+        assert headers['Retry-After'] == '1'
+        # Route metrics are recorded just after the response is written.
+        wait_until(lambda: service.metrics()['routes']['/evaluate']['statuses'] == {'429': 1, '504': 1})
+
+
+def test_json_body_must_be_an_object(service):
+    with serve(service) as base:
+        for path in ("/evaluate", "/interview/i-1/answer"):
+            status, _, body = call(base + path, [1])
+            assert status == 400
+            assert body['error'] == "Body must be a JSON object"
+
+
+def test_evaluate_skips_an_unavailable_llm(service):
+    client = service.llm_evaluator.client
+    service.llm_evaluator.available = False
+
+    assert service.evaluate(REQUEST)['evaluation'] is None
+    assert client.calls == 0
+    assert service.evaluate_admission.admitted == 0
+
+
+def test_full_session_manager_answers_429_before_scoring(service):
+    service.sessions.max_sessions = 0
+    audio = base64.b64encode(np.zeros(16000, dtype='<f4').tobytes()).decode()
+
+    with pytest.raises(QueueFull):
+        service.interview_answer("i-1", {'question_number': 1, 'audio_f32_base64': audio,
+                                         'transcript': REQUEST['candidate_answer']})
+    assert service.score_admission.admitted == 0
+    assert service.llm_evaluator.client.calls == 0
+
+
+@pytest.fixture(scope="module")
+def live():
+    # A started service: audio is scored in its worker process.
+    service = ScoringService(
+        MODEL_PATH, workers=1, llm_evaluator=LLMEvaluator(client=StubGeminiClient()),
+        reference_path=os.path.join(PACKAGE_DIR, "reference_answers.json")
+    ).start()
+    with serve(service) as base:
+        yield base
+    service.close()
+
+
+@pytest.fixture(scope="module")
+def clip():
+    return synthetic_answer(10, seed=3)
+
+
+@pytest.fixture(scope="module")
+def engine():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return ConfidenceEngine(MODEL_PATH, "balanced", SCORING_PROFILES)
+
+
+def test_score_wav(live, clip, engine):
+    wav = numpy_to_wav_bytes(clip, 16000).getvalue()
+    status, _, result = call(live + "/score", wav, 'audio/wav')
+
+    expected = engine.score_audio(read_wav(io.BytesIO(wav))[0])
+    assert status == 200
+    assert result['speech_detected']
+    assert result['confidence'] == pytest.approx(expected['confidence'])
+    assert result['profile_scores'] == pytest.approx(expected['profile_scores'])
+
+
+def test_score_f32_honours_the_profile(live, clip, engine):
+    body = clip.astype('<f4').tobytes()
+    _, _, balanced = call(live + "/score", body, 'application/octet-stream')
+    status, _, result = call(live + "/score?profile=content_focus", body, 'application/octet-stream')
+
+    assert status == 200
+    assert balanced['confidence'] == pytest.approx(engine.score_audio(clip)['confidence'])
+    assert result['confidence'] == pytest.approx(result['profile_scores']['content_focus'])
+    assert result['confidence'] != pytest.approx(balanced['confidence'])
+    assert result['profile_scores'] == pytest.approx(balanced['profile_scores'])
+
+
+def test_score_rejects_other_sample_rates(live, clip):
+    body = clip.astype('<f4').tobytes()
+    status, _, result = call(live + "/score?sample_rate=8000", body, 'application/octet-stream')
+    assert status == 400
+    assert result['error'] == "sample_rate must be 16000"
+
+    wav = numpy_to_wav_bytes(clip, 8000).getvalue()
+    assert call(live + "/score", wav, 'audio/wav')[0] == 400
+
+
+def test_interview_answer_is_recorded(live, clip):
+    wav = numpy_to_wav_bytes(clip, 16000).getvalue()
+    status, _, result = call(live + "/interview/live-1/answer", {
+        'question_number': 1,
+        'question_text': "Tell me about yourself",
+        'transcript': "I studied computer science and my work experience is in backend services",
+        'audio_wav_base64': base64.b64encode(wav).decode(),
+        'profile': 'content_focus'
+    })
+    assert status == 200
+    assert result['summary']['answers'] == 1
+
+    status, _, summary = call(live + "/interview/live-1")
+    assert status == 200
+    assert summary['profile'] == 'content_focus'
+    [answer] = summary['detail']
+    assert answer == result['answer']
+    assert answer['speech_detected']
+    assert answer['evaluation']['error'] is None
+    assert set(answer['transcript_features']) == {'filler_rate', 'keyword_coverage'}
+    assert answer['confidence_score'] == pytest.approx(answer['profile_scores']['content_focus'], abs=1e-4)
\ No newline at end of file
@@ -0,0 +1,100 @@
+import os
+import warnings
+import numpy as np
+import pytest
+from confidence_engine import ConfidenceEngine
+from llm_evaluator import LLMEvaluator
+from llm_stub import StubGeminiClient
+from scoring_profiles import SCORING_PROFILES
+from session_manager import SessionLimitReached, SessionManager, SharedModels
+from synthetic_audio import synthetic_answer
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_PATH = os.path.join(PACKAGE_DIR, "confidence_model.pkl")
+ANSWER = "I studied computer science and my work experience is in backend services and key skills"
+
+
+@pytest.fixture(scope="module")
+def shared():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return SharedModels(MODEL_PATH, os.path.join(PACKAGE_DIR, "reference_answers.json"),
+                            llm_evaluator=LLMEvaluator(client=StubGeminiClient()))
+
+
+@pytest.fixture(scope="module")
+def clip():
+    return synthetic_answer(12, seed=4)
+
+
+def test_shared_scoring_matches_confidence_engine(shared, clip):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        engine = ConfidenceEngine(MODEL_PATH, "presence", SCORING_PROFILES)
+    expected = engine.score_audio(clip)
+    result = shared.score_audio(clip, "presence")
+
+    assert result['confidence'] == expected['confidence']
+    assert result['ml_confidence'] == expected['ml_confidence']
+    assert result['profile_scores'] == expected['profile_scores']
+    assert shared.score_audio(clip, "balanced")['confidence'] == expected['profile_scores']['balanced']
+
+
+def test_submit_creates_the_session_like_record(shared, clip):
+    manager = SessionManager(shared)
+
+    answer = manager.submit("new-1", 1, "Tell me about yourself", audio=clip, transcript=ANSWER)
+
+    assert len(manager) == 1
+    assert answer['speech_detected']
+    assert set(answer['profile_scores']) == set(SCORING_PROFILES)
+    assert answer['evaluation']['error'] is None
+    assert manager.summary("new-1")['profile'] == "balanced"
+
+
+def test_later_answer_switches_the_session_profile(shared, clip):
+    manager = SessionManager(shared)
+    manager.submit("p-1", 1, audio=clip, transcript=ANSWER)
+    second = manager.submit("p-1", 2, audio=clip, transcript=ANSWER, profile="content_focus")
+    third = manager.submit("p-1", 3, audio=clip, transcript=ANSWER)
+
+    assert manager.summary("p-1")['profile'] == "content_focus"
+    # Answers without a profile use the session's, so 3 is scored like 2.
+    assert third['confidence_score'] == pytest.approx(second['confidence_score'], abs=1e-4)
+    assert second['confidence_score'] == pytest.approx(second['profile_scores']['content_focus'], abs=1e-4)
+
+    with pytest.raises(ValueError):
+        manager.record("p-1", 4, profile="nope")
+
+
+def test_transcript_rescores_profiles_using_it(shared, clip):
+    score = shared.score_audio(clip, "content_focus")
+    audio_only = dict(score['profile_scores'])
+    shared.apply_transcript(score, "content_focus", {'filler_rate': 0.0, 'keyword_coverage': 1.0})
+
+    assert score['confidence'] == score['profile_scores']['content_focus']
+    assert score['profile_scores']['content_focus'] != audio_only['content_focus']
+    assert score['profile_scores']['balanced'] == pytest.approx(audio_only['balanced'], abs=1e-4)
+
+
+def test_silence_scores_without_profiles(shared):
+    manager = SessionManager(shared)
+    answer = manager.submit("s-1", 1, audio=np.zeros(16000, dtype=np.float32))
+
+    assert answer['speech_detected'] is False
+    assert 'profile_scores' not in answer
+
+
+def test_full_manager_refuses_before_scoring(shared, clip, monkeypatch):
+    manager = SessionManager(shared, max_sessions=1)
+    manager.submit("full-1", 1, audio=clip, transcript=ANSWER)
+    scored = []
+    monkeypatch.setattr(shared, 'score_audio', lambda *args: scored.append(args))
+
+    with pytest.raises(SessionLimitReached):
+        manager.submit("full-2", 1, audio=clip, transcript=ANSWER)
+    assert scored == []
+    assert manager.metrics()['rejected'] == 1
+
+    # The existing session still takes answers.
+    manager.check_capacity("full-1")
\ No newline at end of file
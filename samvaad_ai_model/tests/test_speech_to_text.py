@@ -0,0 +1,102 @@
+import numpy as np
+from audio_buffer import AudioBuffer
+from energy import compute_energy
+from feature_engine import ConfidenceFeatureEngine, frame_audio
+from speech_to_text import SpeechToTextConverter
+from stt_backends import FakeSTTBackend
+from synthetic_audio import synthetic_answer
+from utterance_segmenter import UtteranceSegmenter
+
+SAMPLE_RATE = 16000
+FREQUENCIES = (150, 200, 250, 300)
+
+
+def utterances(frequencies, speech=2.0, gap=1.0, lead=1.0, seed=0):
+    rng = np.random.default_rng(seed)
+    parts = [rng.normal(0, 0.003, int(lead * SAMPLE_RATE))]
+    for f in frequencies:
+        t = np.arange(int(speech * SAMPLE_RATE)) / SAMPLE_RATE
+        parts.append(0.3 * np.sin(2 * np.pi * f * t) + rng.normal(0, 0.003, len(t)))
+        parts.append(rng.normal(0, 0.003, int(gap * SAMPLE_RATE)))
+    return np.concatenate(parts).astype(np.float32)
+
+
+def label(audio, sample_rate):
+    # "Transcribes" a segment as its dominant frequency, so stitched text
+    # shows which utterances were sent and in what order.
+    spectrum = np.abs(np.fft.rfft(audio))
+    peak = np.argmax(spectrum) * sample_rate / len(audio)
+    return f"w{int(round(peak / 50)) * 50}" if peak > 100 else ""
+
+
+def converter(segmented=True):
+    return SpeechToTextConverter(SAMPLE_RATE, backend=FakeSTTBackend(0.0, 0.0, label), segmented=segmented)
+
+
+EXPECTED = " ".join(f"w{f}" for f in FREQUENCIES)
+
+
+def test_segments_are_stitched_in_order():
+    audio = utterances(FREQUENCIES)
+    assert len(UtteranceSegmenter(SAMPLE_RATE).split(audio)) == len(FREQUENCIES)
+
+    stt = converter()
+    result = stt.transcribe(audio)
+    stt.close()
+
+    assert result['text'] == EXPECTED
+    assert result['segments'] == len(FREQUENCIES)
+    assert result['error'] is None
+
+
+def test_streaming_matches_segmented_for_any_block_size():
+    audio = utterances(FREQUENCIES)
+    stt = converter()
+    for block in (333, 1024, 8000):
+        stream = stt.start_stream()
+        for i in range(0, len(audio), block):
+            stream.push(audio[i:i + block])
+        assert stream.finish(AudioBuffer(audio))['text'] == EXPECTED
+    stt.close()
+
+
+def test_stream_without_utterances_transcribes_the_recording():
+    silence = np.random.default_rng(1).normal(0, 0.003, 4 * SAMPLE_RATE).astype(np.float32)
+    tone = utterances([200], speech=1.0, lead=0.0)
+    stt = converter()
+
+    stream = stt.start_stream()
+    stream.push(silence)
+    result = stream.finish(AudioBuffer(tone))
+    stt.close()
+
+    assert stream.futures == []
+    assert result['text'] == "w200"
+
+
+def test_stitch_reports_first_error_when_nothing_was_heard():
+    stt = converter()
+    results = [
+        {'text': '', 'confidence': 0.0, 'error': 'Could not understand audio'},
+        {'text': '', 'confidence': 0.0, 'error': 'timeout'}
+    ]
+    assert stt._stitch(results) == {'text': '', 'confidence': 0.0, 'error': 'Could not understand audio', 'segments': 2}
+
+    mixed = [{'text': 'hello', 'confidence': 0.8, 'error': None}, results[1]]
+    assert stt._stitch(mixed)['text'] == 'hello'
+    stt.close()
+
+
+def test_segmenter_voicing_matches_the_feature_engine():
+    audio = synthetic_answer(20, seed=2)
+    engine = ConfidenceFeatureEngine(SAMPLE_RATE, clock="sample")
+    segmenter = UtteranceSegmenter(SAMPLE_RATE)
+    voiced = []
+    for chunk in frame_audio(audio, engine.chunk_size):
+        engine.process_chunk(chunk)
+        segmenter.push(chunk)
+        if segmenter.noise_floor is not None:
+            voiced.append(bool(segmenter.is_voiced(compute_energy(chunk))))
+
+    assert segmenter.noise_floor == engine.noise_floor
+    assert voiced[-len(engine.voiced_buffer):] == list(engine.voiced_buffer)
\ No newline at end of file
@@ -0,0 +1,115 @@
+import asyncio
+import json
+import os
+import warnings
+import pytest
+from websockets.asyncio.client import connect
+from websockets.exceptions import ConnectionClosedError
+from stream_service import StreamingScoreServer, StreamSession
+from synthetic_audio import tone_bursts
+
+MODEL_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "confidence_model.pkl")
+
+
+@pytest.fixture(scope="module")
+def server():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return StreamingScoreServer(MODEL_PATH, score_every=2)
+
+
+def run_with_server(server, client):
+    async def main():
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        serving = asyncio.create_task(server.serve(port=0, ready=ready))
+        port = await ready
+        try:
+            return await client(f"ws://127.0.0.1:{port}/stream")
+        finally:
+            serving.cancel()
+            await asyncio.gather(serving, return_exceptions=True)
+
+    return asyncio.run(main())
+
+
+def test_scores_stream_and_end_with_final(server):
+    audio = tone_bursts(6.0).tobytes()
+    before = dict(server.counters)
+
+    async def client(url):
+        messages = []
+        async with connect(url) as websocket:
+            # 0.25 s frames: 24 of them fit the 64-frame buffer, so none drop.
+            for i in range(0, len(audio), 16000):
+                await websocket.send(audio[i:i + 16000])
+            await websocket.send(json.dumps({'type': 'end'}))
+            async for message in websocket:
+                messages.append(json.loads(message))
+        return messages
+
+    messages = run_with_server(server, client)
+    assert messages[-1]['type'] == 'final'
+    assert messages[-1]['chunks'] == 12
+    assert messages[-1]['frames_received'] == 24
+    assert messages[-1]['frames_dropped'] == 0
+    assert [m['type'] for m in messages[:-1]] == ['score'] * (len(messages) - 1)
+    assert server.counters['closed'] - before['closed'] == 1
+    assert server.counters['errors'] == before['errors']
+
+
+def test_clean_disconnect_is_not_an_error(server):
+    before = dict(server.counters)
+
+    async def client(url):
+        async with connect(url) as websocket:
+            await websocket.send(tone_bursts(1.0).tobytes())
+        await asyncio.sleep(0.1)
+
+    run_with_server(server, client)
+    assert server.counters['closed'] - before['closed'] == 1
+    assert server.counters['errors'] == before['errors']
+
+
+@pytest.mark.parametrize("command", ["[1, 2]", "\"end\"", "not json"])
+def test_bad_commands_close_with_1007(server, command):
+    before = dict(server.counters)
+
+    async def client(url):
+        async with connect(url) as websocket:
+            await websocket.send(command)
+            with pytest.raises(ConnectionClosedError):
+                await websocket.recv()
+            return websocket.close_code
+
+    assert run_with_server(server, client) == 1007
+    assert server.counters['errors'] - before['errors'] == 1
+
+
+@pytest.mark.parametrize("query", ["?profile=nope", "?sample_rate=0", "?sample_rate=8000", "?every=x"])
+def test_bad_queries_are_refused(server, query):
+    async def client(url):
+        async with connect(url + query) as websocket:
+            with pytest.raises(ConnectionClosedError):
+                await websocket.recv()
+            return websocket.close_code
+
+    assert run_with_server(server, client) == 1008
+
+
+def test_scoring_failure_closes_with_1011(server, monkeypatch):
+    def fail(session):
+        raise RuntimeError("scorer broke")
+
+    monkeypatch.setattr(StreamSession, 'process_pending', fail)
+    before = dict(server.counters)
+
+    async def client(url):
+        async with connect(url) as websocket:
+            await websocket.send(tone_bursts(1.0).tobytes())
+            with pytest.raises(ConnectionClosedError):
+                await asyncio.wait_for(websocket.recv(), timeout=5)
+            return websocket.close_code
+
+    assert run_with_server(server, client) == 1011
+    assert server.counters['errors'] - before['errors'] == 1
\ No newline at end of file
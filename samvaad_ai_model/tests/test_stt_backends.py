@@ -0,0 +1,63 @@
+import os
+import numpy as np
+import pytest
+import speech_recognition as sr
+from speech_to_text import SpeechToTextConverter
+from stt_backends import FakeSTTBackend, PooledSTTBackend, make_stt_backend
+
+SAMPLE_RATE = 16000
+
+
+def worker_text(audio, sample_rate):
+    # Module level so the worker processes can unpickle it.
+    if not np.any(audio):
+        return ""
+    return f"pid {os.getpid()} {len(audio) / sample_rate:.1f}s"
+
+
+@pytest.fixture(scope="module")
+def pooled():
+    backend = PooledSTTBackend(FakeSTTBackend, {'latency': 0.0, 'realtime_factor': 0.0, 'text_fn': worker_text},
+                               workers=2)
+    yield backend
+    backend.close()
+
+
+def test_pooled_backend_runs_in_worker_processes(pooled):
+    assert pooled.is_available()
+    assert pooled.name == "pooled-fake"
+
+    text = pooled.run(np.ones(SAMPLE_RATE, dtype=np.float32), SAMPLE_RATE)
+    pid, duration = text.split()[1:]
+    assert int(pid) != os.getpid()
+    assert duration == "1.0s"
+
+
+def test_pooled_backend_counts_requests_and_no_speech(pooled):
+    before = pooled.metrics()
+    with pytest.raises(sr.UnknownValueError):
+        pooled.run(np.zeros(SAMPLE_RATE // 2, dtype=np.float32), SAMPLE_RATE)
+    pooled.run(np.ones(SAMPLE_RATE // 2, dtype=np.float32), SAMPLE_RATE)
+
+    after = pooled.metrics()
+    assert after['requests'] - before['requests'] == 2
+    assert after['no_speech'] - before['no_speech'] == 1
+    assert after['audio_seconds'] - before['audio_seconds'] == pytest.approx(1.0)
+
+
+def test_converter_reports_worker_no_speech_as_unintelligible(pooled):
+    stt = SpeechToTextConverter(SAMPLE_RATE, backend=pooled)
+    result = stt.transcribe(np.zeros(SAMPLE_RATE, dtype=np.float32))
+    assert result == {'text': '', 'confidence': 0.0, 'error': 'Could not understand audio'}
+
+
+def test_make_stt_backend_pools_only_with_workers():
+    assert isinstance(make_stt_backend("fake"), FakeSTTBackend)
+    backend = make_stt_backend("fake", workers=1, latency=0.0)
+    try:
+        assert isinstance(backend, PooledSTTBackend)
+        assert backend.run(np.ones(8000, dtype=np.float32), SAMPLE_RATE) == "speech 0.5s"
+    finally:
+        backend.close()
+    with pytest.raises(ValueError):
+        make_stt_backend("nope")
\ No newline at end of file
@@ -0,0 +1,75 @@
+import os
+import numpy as np
+import pytest
+from custom_scorer import CustomConfidenceScorer
+from llm_evaluator import load_reference_answers
+from scoring_profiles import SCORING_PROFILES
+from transcript_analyzer import AhoCorasick, TranscriptAnalyzer, tokenize
+
+REFERENCES = load_reference_answers(
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "reference_answers.json")
+)
+
+
+@pytest.fixture(scope="module")
+def analyzer():
+    return TranscriptAnalyzer(REFERENCES)
+
+
+def test_automaton_reports_overlapping_matches():
+    matcher = AhoCorasick([('a', 'b'), ('b', 'c'), ('a', 'b', 'c', 'd'), ('c',)])
+    words = 'x a b c d b c'.split()
+    assert sorted(matcher.iter_matches(words)) == [(2, 0), (3, 1), (3, 3), (4, 2), (6, 1), (6, 3)]
+
+
+def test_fillers_match_whole_words_only(analyzer):
+    result = analyzer.analyze(1, "Unlike my likely peers, I summarized the uhm umbrella project")
+    assert result['fillers'] == {}
+    assert result['filler_rate'] == 0.0
+
+
+def test_filler_rate_counts_like_and_phrases(analyzer):
+    text = "Um, I was, like, leading the team, you know, and it was kind of hard"
+    result = analyzer.analyze(1, text)
+
+    assert result['fillers'] == {'um': 1, 'like': 1, 'you know': 1, 'kind of': 1}
+    assert result['filler_count'] == 4
+    # Phrases count every word they cover.
+    assert result['filler_rate'] == 6 / len(tokenize(text))
+
+
+def test_overlapping_fillers_are_counted_once():
+    analyzer = TranscriptAnalyzer({}, fillers=("you know", "know what"))
+    result = analyzer.analyze(1, "you know what I did")
+    assert result['fillers'] == {'you know': 1}
+    assert result['filler_rate'] == 2 / 5
+
+
+def test_keyword_coverage_against_reference_answers(analyzer):
+    reference = REFERENCES['1']['reference_answer']
+    assert analyzer.analyze(1, reference)['keyword_coverage'] == 1.0
+
+    result = analyzer.analyze(1, "My background is in computer science and I have work experience with APIs")
+    keywords = analyzer.keywords['1']
+    assert result['keywords_found'] == ['background', 'work', 'experienc']
+    assert result['keywords_missing'] == [term for term in keywords if term not in result['keywords_found']]
+    assert result['keyword_coverage'] == 3 / len(keywords)
+
+    assert analyzer.analyze(999, reference)['keyword_coverage'] == 0.0
+    assert analyzer.analyze(1, "")['word_count'] == 0
+
+
+def test_transcript_features_only_move_profiles_that_weigh_them():
+    features = np.array([4.0, 0.8, 0.3, 30.0, 20.0], dtype=np.float32)
+    good = {'filler_rate': 0.0, 'keyword_coverage': 1.0}
+    poor = {'filler_rate': 0.3, 'keyword_coverage': 0.0}
+
+    content = CustomConfidenceScorer(SCORING_PROFILES['content_focus'])
+    audio_only = content.score(features)
+    assert content.score(features, good) > audio_only > content.score(features, poor)
+
+    for name, profile in SCORING_PROFILES.items():
+        if profile.get('transcript_weights'):
+            continue
+        scorer = CustomConfidenceScorer(profile)
+        assert scorer.score(features, good) == scorer.score(features) == scorer.score(features, poor)
\ No newline at end of file
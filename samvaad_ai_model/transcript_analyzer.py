@@ -0,0 +1,141 @@
+import re
+from collections import deque
+from functools import lru_cache
+
+from prescreen import STOPWORDS, stem
+
+
+FILLER_PHRASES = (
+    "um", "umm", "uh", "uhh", "er", "erm", "ah", "hmm", "mm",
+    "like", "you know", "i mean", "kind of", "sort of", "you see",
+    "basically", "actually", "literally", "so yeah", "or something"
+)
+
+# Words that appear in the reference answers' instructions to the grader
+# rather than in what a candidate is expected to say.
+REFERENCE_STOPWORDS = frozenset(stem(w) for w in """
+should answer good include including mention mentioned show shows demonstrate demonstrates
+specific clear etc both well ability able use used through back led provide key related
+""".split())
+
+_WORD = re.compile(r"[a-z0-9]+")
+_cached_stem = lru_cache(maxsize=65536)(stem)
+
+
+def tokenize(text):
+    return [_cached_stem(w) for w in _WORD.findall((text or "").lower())]
+
+
+class AhoCorasick:
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]
+        self.lengths = []
+
+        for pattern_id, words in enumerate(patterns):
+            state = 0
+            for word in words:
+                next_state = self.goto[state].get(word)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][word] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                state = next_state
+            self.output[state].append(pattern_id)
+            self.lengths.append(len(words))
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and word not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(word, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    def iter_matches(self, words):
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        state = 0
+        for end, word in enumerate(words):
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            for pattern_id in output[state]:
+                yield end, pattern_id
+
+
+class TranscriptAnalyzer:
+
+    def __init__(self, reference_answers, fillers=FILLER_PHRASES, max_keywords=15):
+        self.fillers = list(fillers)
+        self.keywords = {}
+
+        patterns = [tuple(tokenize(phrase)) for phrase in self.fillers]
+        self.kinds = [('filler', phrase) for phrase in self.fillers]
+        # The automaton matches stems, so "likely" reaches the "like" state;
+        # a filler only counts if the spoken words are the phrase itself.
+        self.filler_words = [tuple(_WORD.findall(phrase.lower())) for phrase in self.fillers]
+
+        seen = {}
+        for question_id, entry in reference_answers.items():
+            terms = []
+            for word in _WORD.findall(entry.get('reference_answer', '').lower()):
+                term = stem(word)
+                if word in STOPWORDS or term in REFERENCE_STOPWORDS or term in terms or len(term) < 3:
+                    continue
+                terms.append(term)
+            terms = terms[:max_keywords]
+            self.keywords[str(question_id)] = terms
+
+            for term in terms:
+                if term not in seen:
+                    seen[term] = len(patterns)
+                    patterns.append((term,))
+                    self.kinds.append(('keyword', term))
+
+        # One automaton over fillers and every question's key terms, so an
+        # answer is scanned once regardless of how many patterns there are.
+        self.matcher = AhoCorasick(patterns)
+
+    def analyze(self, question_id, text):
+        spoken = _WORD.findall((text or "").lower())
+        words = [_cached_stem(w) for w in spoken]
+        keywords = self.keywords.get(str(question_id), [])
+
+        fillers = {}
+        found = set()
+        filler_words = 0
+        last_filler_end = -1
+        for end, pattern_id in self.matcher.iter_matches(words):
+            kind, value = self.kinds[pattern_id]
+            if kind == 'filler':
+                start = end - self.matcher.lengths[pattern_id] + 1
+                if start <= last_filler_end or tuple(spoken[start:end + 1]) != self.filler_words[pattern_id]:
+                    continue
+                fillers[value] = fillers.get(value, 0) + 1
+                filler_words += self.matcher.lengths[pattern_id]
+                last_filler_end = end
+            else:
+                found.add(value)
+
+        covered = [term for term in keywords if term in found]
+        filler_count = sum(fillers.values())
+
+        return {
+            'word_count': len(words),
+            'filler_count': filler_count,
+            'fillers': fillers,
+            'keywords_found': covered,
+            'keywords_missing': [term for term in keywords if term not in found],
+            'filler_rate': filler_words / len(words) if words else 0.0,
+            'keyword_coverage': len(covered) / len(keywords) if keywords else 0.0
+        }
\ No newline at end of file
@@ -0,0 +1,118 @@
+import numpy as np
+from energy import compute_energy
+from audioconfig import SAMPLE_RATE, CHUNK_DURATION
+
+
+class UtteranceSegmenter:
+
+    def __init__(self, sample_rate=SAMPLE_RATE, min_pause=0.5, pad=0.25):
+        self.sample_rate = sample_rate
+        self.chunk_size = int(sample_rate * CHUNK_DURATION)
+        self.pause_chunks = max(1, int(round(min_pause / CHUNK_DURATION)))
+        self.pad = int(pad * sample_rate)
+        self.reset()
+
+    def reset(self):
+        self.noise_floor = None
+        self._pending = np.empty(0, dtype=np.float32)
+        self._chunks = []
+        self._energies = []
+        self._base = 0
+        self._resolved = 0
+        self._segment_start = None
+        self._last_voiced = None
+        self._silent_run = 0
+        self.segments_emitted = 0
+
+    def _emit(self, start, end, tail_chunks=1):
+        # Segments are padded into the neighbouring silence so word onsets
+        # below the 0.5 s voicing resolution are not clipped.
+        first = max(start - 1, self._base)
+        last = min(end + tail_chunks, self._base + len(self._chunks))
+        audio = np.concatenate(self._chunks[first - self._base:last - self._base])
+
+        offset = first * self.chunk_size
+        lo = max(start * self.chunk_size - self.pad, offset)
+        hi = min(end * self.chunk_size + self.pad, offset + len(audio))
+
+        segment = {
+            'index': self.segments_emitted,
+            'start': lo / self.sample_rate,
+            'end': hi / self.sample_rate,
+            'audio': audio[lo - offset:hi - offset]
+        }
+        self.segments_emitted += 1
+
+        keep = max(end, self._base)
+        del self._chunks[:keep - self._base]
+        del self._energies[:keep - self._base]
+        self._base = keep
+        return segment
+
+    def is_voiced(self, energy):
+        # The voicing rule of ConfidenceFeatureEngine, without its pitch and
+        # pause tracking: the noise floor is the quietest of the first five
+        # chunks, and a chunk 2 dB above it is voiced.
+        return energy > self.noise_floor + 2
+
+    def _push_chunk(self, chunk):
+        self._chunks.append(chunk)
+        self._energies.append(compute_energy(chunk))
+
+        if self.noise_floor is None:
+            if len(self._energies) < 5:
+                return []
+            self.noise_floor = float(np.min(self._energies[:5]))
+
+        # Chunks seen before the noise floor settled are classified
+        # retroactively with the same rule the feature engine uses.
+        ready = []
+        while self._resolved < self._base + len(self._chunks):
+            i = self._resolved
+            self._resolved += 1
+            if self.is_voiced(self._energies[i - self._base]):
+                if self._segment_start is None:
+                    self._segment_start = i
+                self._last_voiced = i
+                self._silent_run = 0
+            elif self._segment_start is not None:
+                self._silent_run += 1
+                if self._silent_run >= self.pause_chunks:
+                    ready.append(self._emit(self._segment_start, self._last_voiced + 1))
+                    self._segment_start = None
+        return ready
+
+    def push(self, audio):
+        audio = np.asarray(audio, dtype=np.float32).reshape(-1)
+        if len(self._pending):
+            audio = np.concatenate((self._pending, audio))
+
+        ready = []
+        n_full = len(audio) // self.chunk_size
+        for i in range(n_full):
+            ready.extend(self._push_chunk(audio[i * self.chunk_size:(i + 1) * self.chunk_size].copy()))
+        self._pending = audio[n_full * self.chunk_size:].copy()
+        return ready
+
+    def flush(self):
+        ready = []
+        if len(self._pending):
+            self._chunks.append(self._pending)
+            self._energies.append(None)
+            self._pending = np.empty(0, dtype=np.float32)
+
+        if self.noise_floor is None:
+            # Too short to estimate a noise floor: hand over everything.
+            if self._chunks:
+                ready.append(self._emit(self._base, self._base + len(self._chunks), tail_chunks=0))
+        elif self._segment_start is not None:
+            ready.append(self._emit(self._segment_start, self._base + len(self._chunks), tail_chunks=0))
+
+        self._segment_start = None
+        return ready
+
+    def split(self, audio):
+        self.reset()
+        segments = self.push(audio)
+        segments.extend(self.flush())
+        return segments
\ No newline at end of file